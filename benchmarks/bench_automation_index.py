@@ -0,0 +1,118 @@
+"""Benchmark: duplicate automation-id checks against a large automations.yaml.
+
+Writes a synthetic automations.yaml (thousands of automations with triggers,
+conditions and actions - several MB), then times what a 30-room bulk setup
+does: one duplicate check per room, an append, and a re-check. First with
+the old full read + multiline regex per check, then with the config flow's
+(mtime, size)-keyed streaming id index. Both must agree on every id.
+
+    python benchmarks/bench_automation_index.py [--automations 8000] [--rooms 30]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.universal_lighting_setup_wizard.config_flow import (  # noqa: E402
+    _append_automations,
+    _automation_id_exists,
+    _automation_id_index,
+)
+
+
+def regex_id_exists(automations_path: str, automation_id: str) -> bool:
+    """The pre-index implementation: whole file + multiline regex per check."""
+    with open(automations_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    pattern = rf"(?m)^[-\s]*id\s*:\s*['\"]?{re.escape(automation_id)}['\"]?\s*$"
+    return re.search(pattern, text) is not None
+
+
+def build_file(path: str, count: int) -> None:
+    automations = [
+        {
+            "id": f"{1_700_000_000_000 + i}",
+            "alias": f"Automation {i}",
+            "description": "Synthetic automation " * 4,
+            "trigger": [
+                {"platform": "state", "entity_id": f"binary_sensor.motion_{i}", "to": "on", "id": "motion"},
+                {"platform": "time_pattern", "minutes": "/5", "id": "tick"},
+            ],
+            "condition": [{"condition": "state", "entity_id": f"input_boolean.flag_{i}", "state": "on"}],
+            "action": [
+                {"service": "light.turn_on", "target": {"entity_id": [f"light.room_{i}_{n}" for n in range(4)]},
+                 "data": {"brightness_pct": 80, "transition": 2}},
+                {"delay": {"minutes": 5}},
+                {"service": "light.turn_off", "target": {"entity_id": f"light.room_{i}_0"}},
+            ],
+            "mode": "restart",
+        }
+        for i in range(count)
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Hand-written comment that must survive\n")
+        f.write(yaml.safe_dump(automations, default_flow_style=False, sort_keys=False))
+
+
+def room_config(n: int) -> dict:
+    return {"id": f"universal_lighting_room_{n}", "alias": f"Room {n}", "use_blueprint": {"path": "x", "input": {}}}
+
+
+def setup_pass(path: str, rooms: int, exists) -> float:
+    start = time.perf_counter()
+    for n in range(rooms):
+        room_id = f"universal_lighting_room_{n}"
+        assert not exists(path, room_id)  # step "room"
+        assert not exists(path, room_id)  # belt-and-suspenders before append
+        _append_automations(path, [room_config(n)])
+        assert exists(path, room_id)
+    return time.perf_counter() - start
+
+
+def run(count: int, rooms: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "automations.yaml")
+        build_file(path, count)
+        size = os.path.getsize(path)
+
+        regex_time = setup_pass(path, rooms, regex_id_exists)
+
+        build_file(path, count)
+        _automation_id_index.clear()
+        start = time.perf_counter()
+        _automation_id_exists(path, "warm-up")
+        cold = time.perf_counter() - start
+        index_time = setup_pass(path, rooms, _automation_id_exists)
+
+        probes = [f"{1_700_000_000_000 + i}" for i in range(0, count, max(1, count // 200))]
+        probes += ["motion", "tick", "missing", "universal_lighting_room_0"]
+        mismatches = sum(
+            regex_id_exists(path, probe) != _automation_id_exists(path, probe) for probe in probes
+        )
+
+    print(f"automations.yaml size      : {size / 1e6:.1f} MB ({count} automations)")
+    print(f"rooms set up               : {rooms} (3 checks + 1 append each)")
+    print(f"regex, checks + appends    : {regex_time:.2f} s")
+    print(f"index, cold build          : {cold * 1000:.0f} ms")
+    print(f"index, checks + appends    : {index_time + cold:.2f} s (incl. cold build)")
+    print(f"mismatches vs regex        : {mismatches} / {len(probes)} probes")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--automations", type=int, default=8000)
+    parser.add_argument("--rooms", type=int, default=30)
+    args = parser.parse_args()
+    run(args.automations, args.rooms)
+
+
+if __name__ == "__main__":
+    main()
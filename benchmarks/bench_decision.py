@@ -0,0 +1,161 @@
+"""Benchmark: trigger-to-decision latency of the native engine's decision path.
+
+Replays a stream of PIR / illuminance / light triggers against one room and
+times what the engine does per trigger: invalidate the derived values that
+read the changed entity, refresh them, and run decision.evaluate(). The same
+stream is then replayed recomputing every derived value on every trigger -
+what the blueprint's `variables:` block does on each run - for comparison.
+
+State lookups are plain dicts standing in for hass.states and the entity
+registry, so the numbers are the decision logic alone.
+
+    python benchmarks/bench_decision.py [--triggers 100000] [--lights 6] [--seed 1]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.universal_lighting_setup_wizard.decision import (  # noqa: E402
+    RoomConfig,
+    RoomState,
+    effective_illuminance,
+    evaluate,
+    vacancy_timeout_minutes,
+)
+from custom_components.universal_lighting_setup_wizard.derived import (  # noqa: E402
+    DerivedGraph,
+    registry_source,
+)
+
+PIR = "binary_sensor.bench_pir"
+LUX = "sensor.bench_lux"
+TRACKERS = ("person.a", "person.b", "person.c")
+
+
+def build_room(lights: int) -> tuple[RoomConfig, dict[str, str], dict[str, dict]]:
+    light_ids = tuple(f"light.bench_{i}" for i in range(lights))
+    config = RoomConfig(
+        room_name="Bench",
+        sanitized_room_name="bench",
+        control_mode="lights_only",
+        light_entities=light_ids,
+        presence_pir_sensor=PIR,
+        illuminance_sensor=LUX,
+        presence_trackers=TRACKERS,
+    )
+    states = {PIR: "off", LUX: "10", **{e: "off" for e in light_ids}}
+    states.update({t: "home" for t in TRACKERS})
+    registry = {
+        e: {"supported_color_modes": ["color_temp", "xy"], "min_color_temp_kelvin": 2000}
+        for e in light_ids
+    }
+    return config, states, registry
+
+
+def build_graph(config: RoomConfig, room: RoomState, states: dict[str, str],
+                registry: dict[str, dict]) -> DerivedGraph:
+    def lights() -> None:
+        room.lights_on = any(states[e] == "on" for e in config.light_entities)
+
+    def capabilities() -> None:
+        caps = [registry[e] for e in config.light_entities]
+        room.light_is_dimmable = any(
+            mode != "onoff" for c in caps for mode in c["supported_color_modes"]
+        )
+        room.light_supports_color_temp = any(
+            c.get("min_color_temp_kelvin") is not None for c in caps
+        )
+
+    def someone_home() -> None:
+        room.someone_home = any(states[t] == "home" for t in config.presence_trackers)
+
+    def illuminance() -> None:
+        room.illuminance = effective_illuminance(config, room)
+
+    def vacancy_timeout() -> None:
+        room.vacancy_timeout_minutes = vacancy_timeout_minutes(config, room)
+
+    graph = DerivedGraph()
+    graph.add("lights", config.light_entities, lights)
+    graph.add("capabilities", [registry_source(e) for e in config.light_entities], capabilities)
+    graph.add("someone_home", config.presence_trackers, someone_home)
+    graph.add("illuminance", [LUX], illuminance)
+    graph.add("vacancy_timeout", [config.sensor_off_latency_entity], vacancy_timeout)
+    return graph
+
+
+def build_triggers(count: int, config: RoomConfig,
+                   rng: random.Random) -> list[tuple[str, str]]:
+    """Mostly presence, like a real room: 80% PIR, 15% lux, 5% light."""
+    triggers = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.80:
+            triggers.append((PIR, rng.choice(("on", "off"))))
+        elif roll < 0.95:
+            triggers.append((LUX, str(rng.randint(0, 400))))
+        else:
+            triggers.append((rng.choice(config.light_entities), rng.choice(("on", "off"))))
+    return triggers
+
+
+def replay(config: RoomConfig, triggers: list[tuple[str, str]], lights: int,
+           incremental: bool) -> tuple[float, int]:
+    _, states, registry = build_room(lights)
+    room = RoomState()
+    graph = build_graph(config, room, states, registry)
+    graph.refresh()
+    now = 1_700_000_000.0
+    start = time.perf_counter()
+    for entity_id, value in triggers:
+        now += 1
+        states[entity_id] = value
+        if entity_id == PIR:
+            room.pir_on = room.mmwave_on = value == "on"
+            room.vacant_since = None if room.pir_on else now
+        elif entity_id == LUX:
+            room.illuminance_raw = float(value)
+            room.illuminance_valid = True
+            room.illuminance_window.update(
+                room.illuminance_raw, config.dark_threshold, config.bright_threshold
+            )
+        if incremental:
+            graph.invalidate(entity_id)
+        else:
+            graph.invalidate_all()
+        graph.refresh()
+        evaluate(config, room, now, 20.0)
+    return time.perf_counter() - start, graph.recomputes
+
+
+def run(count: int, lights: int, seed: int) -> None:
+    config, _, _ = build_room(lights)
+    triggers = build_triggers(count, config, random.Random(seed))
+    full, full_recomputes = replay(config, triggers, lights, incremental=False)
+    incr, incr_recomputes = replay(config, triggers, lights, incremental=True)
+
+    print(f"triggers                   : {count}")
+    print(f"lights in room             : {lights}")
+    print(f"recomputes, every value    : {full_recomputes}")
+    print(f"recomputes, incremental    : {incr_recomputes}")
+    print(f"per trigger, every value   : {full / count * 1e6:.2f} us")
+    print(f"per trigger, incremental   : {incr / count * 1e6:.2f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--triggers", type=int, default=100_000)
+    parser.add_argument("--lights", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    run(args.triggers, args.lights, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Benchmark: motion -> light.turn_on latency of the native engine.
+
+Runs an in-process Home Assistant core (needs the `homeassistant` package)
+with one native room: real input_boolean / input_datetime helpers, a fake
+light.turn_on that timestamps its call and reports the light on, and the
+shared batcher. Each sample is one "someone walks into the dark room": the
+PIR goes on and the time until light.turn_on is entered is measured, with
+and without the presence fast path. Between samples the room is reset (PIR
+off, light reported off) and left idle for longer than the batcher's
+per-integration call interval; the 2 s primary-settle guard is zeroed.
+
+    python benchmarks/bench_presence_latency.py [--samples 200] [--busy 0]
+
+--busy N adds N unrelated state writes per loop iteration in the
+background, to show how the fast path fares on a loaded event loop.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from homeassistant.core import Context, HomeAssistant, ServiceCall  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.setup import async_setup_component  # noqa: E402
+
+from custom_components.universal_lighting_setup_wizard import decision  # noqa: E402
+from custom_components.universal_lighting_setup_wizard.batcher import (  # noqa: E402
+    MIN_CALL_INTERVAL,
+    LightCommandBatcher,
+)
+from custom_components.universal_lighting_setup_wizard.engine import RoomEngine  # noqa: E402
+from custom_components.universal_lighting_setup_wizard.scheduler import (  # noqa: E402
+    RoomScheduler,
+)
+
+ROOM = {
+    "room_name": "Office",
+    "sanitized_room_name": "office",
+    "control_mode": "lights_only",
+    "light_entities": ["light.office"],
+    "presence_pir_sensor": "binary_sensor.office_motion",
+    "illuminance_sensor": "sensor.office_lux",
+    "engine": "native",
+    "coalesce_window_ms": 0,
+    "enable_illuminance_averaging": False,
+}
+
+
+async def _make_hass(config_dir: str) -> HomeAssistant:
+    hass = HomeAssistant(config_dir)
+    hass.config.set_time_zone("UTC")
+    from homeassistant import config_entries, loader
+    from homeassistant.helpers import entity, restore_state, template
+
+    loader.async_setup(hass)
+    entity.async_setup(hass)
+    template.async_setup(hass)
+    await ar.async_load(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    await restore_state.async_load(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await hass.async_start()
+    await async_setup_component(hass, "input_boolean", {"input_boolean": {
+        f"office_{key}": {}
+        for key in ("automation_active", "manual_override", "light_auto_on", "occupancy_state")
+    }})
+    await async_setup_component(hass, "input_datetime", {"input_datetime": {
+        "office_last_automation_action": {"has_date": True, "has_time": True},
+    }})
+    return hass
+
+
+async def _measure(hass: HomeAssistant, engine: RoomEngine, samples: int) -> list[float]:
+    called: asyncio.Future[float] | None = None
+
+    async def turn_on(call: ServiceCall) -> None:
+        if called is not None and not called.done():
+            called.set_result(time.perf_counter())
+        hass.states.async_set("light.office", "on", context=call.context)
+
+    hass.services.async_register("light", "turn_on", turn_on)
+    echo = Context(parent_id="bench")
+    latencies = []
+    for _ in range(samples):
+        # Reset: nobody there, light reported off (not a manual change)
+        hass.states.async_set(ROOM["presence_pir_sensor"], "off")
+        hass.states.async_set("light.office", "off", context=echo)
+        await hass.async_block_till_done()
+        await asyncio.sleep(MIN_CALL_INTERVAL * 1.5)
+        called = hass.loop.create_future()
+        started = time.perf_counter()
+        hass.states.async_set(ROOM["presence_pir_sensor"], "on")
+        latencies.append((await called - started) * 1000)
+        await hass.async_block_till_done()
+    return latencies
+
+
+async def _busy(hass: HomeAssistant, writes: int) -> None:
+    tick = 0
+    while True:
+        for index in range(writes):
+            hass.states.async_set(f"sensor.noise_{index}", tick)
+        tick += 1
+        await asyncio.sleep(0)
+
+
+async def run(samples: int, busy: int) -> None:
+    logging.basicConfig(level=logging.WARNING)
+    decision.PRIMARY_SETTLE_SECONDS = 0
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _make_hass(config_dir)
+        hass.states.async_set(ROOM["illuminance_sensor"], "5")
+        hass.states.async_set("light.office", "off")
+        entry = types.SimpleNamespace(data=ROOM, entry_id="bench", options={})
+        noise = hass.async_create_background_task(_busy(hass, busy), "noise") if busy else None
+
+        for label, fast in (("regular path", False), ("fast path", True)):
+            engine = RoomEngine(
+                hass, entry, RoomScheduler(hass), batcher=LightCommandBatcher(hass)
+            )
+            engine.fast_path_enabled = fast
+            await engine.async_start()
+            latencies = await _measure(hass, engine, samples)
+            engine.async_stop()
+            latencies.sort()
+            print(
+                f"{label:13s} event -> light.turn_on  p50 {statistics.median(latencies):6.3f} ms"
+                f"  p95 {latencies[int(len(latencies) * 0.95) - 1]:6.3f} ms"
+                f"  max {latencies[-1]:6.3f} ms"
+                f"  (fast path runs: {engine.telemetry.fast_path_runs})"
+            )
+
+        if noise is not None:
+            noise.cancel()
+        await hass.async_stop(force=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--busy", type=int, default=0,
+                        help="background state writes per loop iteration")
+    args = parser.parse_args()
+    asyncio.run(run(args.samples, args.busy))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark: offline replay and parameter sweeps over months of history.
+
+Generates a synthetic recorder history for one room - PIR bursts through the
+day, indoor lux following a daylight curve with passing clouds, sun.sun
+transitions and a roof lux sensor reporting every 30 s - then times a
+baseline replay and a sweep over dark threshold, vacancy multiplier and the
+outdoor-lux band.
+
+    python benchmarks/bench_replay.py [--days 90] [--seed 1]
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.universal_lighting_setup_wizard.decision import (  # noqa: E402
+    RoomConfig,
+)
+from custom_components.universal_lighting_setup_wizard.replay import (  # noqa: E402
+    DaytimeParams,
+    Replayer,
+    Timeline,
+)
+
+START = 1_767_225_600.0  # 2026-01-01 00:00 UTC
+OUTDOOR = "sensor.roof_lux"
+
+
+def build_history(days: int, rng: random.Random) -> list[tuple[str, str, float]]:
+    rows = [("light.bench", "off", START)]
+    for day in range(days):
+        midnight = START + day * 86400
+        rows.append(("sun.sun", "above_horizon", midnight + 7 * 3600))
+        rows.append(("sun.sun", "below_horizon", midnight + 17 * 3600))
+        # Roof sensor: daylight bell curve, clouds knock it down for a while
+        cloud = 1.0
+        for step in range(0, 86400, 30):
+            hour = step / 3600
+            sky = max(0.0, math.sin((hour - 7) / 10 * math.pi)) * 40000
+            if rng.random() < 0.002:
+                cloud = rng.uniform(0.05, 0.6)
+            elif rng.random() < 0.01:
+                cloud = 1.0
+            rows.append((OUTDOOR, f"{sky * cloud:.0f}", midnight + step))
+            if step % 300 == 0:
+                indoor = sky * cloud / 200 + rng.uniform(0, 3)
+                rows.append(("sensor.bench_lux", f"{indoor:.1f}", midnight + step))
+        # Presence: a few dozen bursts, denser morning and evening
+        for _ in range(40):
+            at = midnight + rng.choice((rng.uniform(6, 9), rng.uniform(17, 23), rng.uniform(0, 24))) * 3600
+            rows.append(("binary_sensor.bench_pir", "on", at))
+            rows.append(("binary_sensor.bench_pir", "off", at + rng.uniform(30, 900)))
+    return rows
+
+
+def run(days: int, seed: int) -> None:
+    config = RoomConfig(
+        room_name="Bench",
+        sanitized_room_name="bench",
+        control_mode="lights_only",
+        light_entities=("light.bench",),
+        presence_pir_sensor="binary_sensor.bench_pir",
+        illuminance_sensor="sensor.bench_lux",
+        daytime_control_mode="always_block",
+    )
+    daytime = DaytimeParams(outdoor_lux_sensor=OUTDOOR)
+    rows = build_history(days, random.Random(seed))
+
+    start = time.perf_counter()
+    timeline = Timeline(rows)
+    replayer = Replayer(timeline)
+    loaded = time.perf_counter()
+    baseline = replayer.run(config, daytime)
+    first = time.perf_counter()
+    grid = {
+        "dark_threshold": [10, 20, 30, 40, 50],
+        "vacancy_timeout_multiplier": [2, 3, 5, 8],
+        "outdoor_dark_below_lux": [1500, 3000, 4500],
+        "outdoor_bright_above_lux": [4500, 6000],
+    }
+    results = replayer.sweep(config, daytime, **grid)
+    done = time.perf_counter()
+
+    print(f"days of history            : {days}")
+    print(f"recorder rows              : {len(rows)}")
+    print(f"grid steps                 : {len(replayer.t)}")
+    print(f"load + grid                : {(loaded - start) * 1000:.0f} ms")
+    print(f"baseline replay            : {(first - loaded) * 1000:.0f} ms")
+    print(f"  {baseline.summary()}")
+    print(f"sweep combinations         : {len(results)}")
+    print(f"sweep total                : {done - first:.2f} s")
+    print(f"per combination            : {(done - first) / len(results) * 1000:.1f} ms")
+    best = min(results, key=lambda r: (r.flaps, r.on_minutes))
+    print(f"fewest flaps, least on-time: {best.summary()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    run(args.days, args.seed)
+
+
+if __name__ == "__main__":
+    main()
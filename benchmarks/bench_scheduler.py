@@ -0,0 +1,89 @@
+"""Benchmark: shared deadline scheduler vs one timer per room.
+
+Simulates a house of N rooms (default 200) for one hour on a virtual clock.
+Every room sees random presence changes, each of which re-arms that room's
+next deadline (vacancy timeout, bed delay or override expiry), until at the
+half-hour mark everybody leaves at once. Reports how many event-loop
+wakeups each approach needs and what the queue operations cost.
+
+    python benchmarks/bench_scheduler.py [--rooms 200] [--seed 1]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.universal_lighting_setup_wizard.scheduler import (  # noqa: E402
+    DeadlineQueue,
+)
+
+MASS_EXIT_AT = 1800.0
+
+
+def build_events(rooms: int, rng: random.Random) -> list[tuple[float, int, float]]:
+    """(time, room, delay-until-deadline) for every re-arm in the hour."""
+    events = []
+    for room in range(rooms):
+        t = rng.uniform(0, 120)
+        while t < MASS_EXIT_AT:
+            delay = rng.choice((15, 15, 60, 300, 300, 900, 10800))
+            events.append((t, room, float(delay)))
+            t += rng.expovariate(1 / 120)
+        # Everyone leaves together: identical vacancy timeout from the same instant
+        events.append((MASS_EXIT_AT, room, 300.0))
+    events.sort()
+    return events
+
+
+def run(rooms: int, seed: int) -> None:
+    rng = random.Random(seed)
+    events = build_events(rooms, rng)
+    queue = DeadlineQueue()
+    fired = 0
+    wakeups = 0
+    biggest_batch = 0
+
+    def _noop(_now: float) -> None:
+        pass
+
+    def drain(until: float) -> None:
+        nonlocal fired, wakeups, biggest_batch
+        while (head := queue.next_deadline) is not None and head <= until:
+            due = queue.pop_due(head)
+            wakeups += 1
+            fired += len(due)
+            biggest_batch = max(biggest_batch, len(due))
+
+    start = time.perf_counter()
+    for t, room, delay in events:
+        drain(t)
+        queue.schedule(room, t + delay, _noop)
+    drain(float("inf"))
+    elapsed = time.perf_counter() - start
+
+    print(f"rooms                      : {rooms}")
+    print(f"re-arm operations          : {len(events)}")
+    print(f"deadlines fired            : {fired}")
+    print(f"wakeups, shared scheduler  : {wakeups}")
+    # With a timer per room every fired deadline is its own wakeup
+    print(f"wakeups, timer per room    : {fired}")
+    print(f"largest batch in one tick  : {biggest_batch}")
+    print(f"total queue time           : {elapsed * 1000:.1f} ms")
+    print(f"per re-arm                 : {elapsed / len(events) * 1e6:.2f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    run(args.rooms, args.seed)
+
+
+if __name__ == "__main__":
+    main()
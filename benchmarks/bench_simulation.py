@@ -0,0 +1,86 @@
+"""Benchmark: deterministic whole-house simulation on a frozen clock.
+
+Boots an in-process Home Assistant core (needs the `homeassistant` package)
+with N rooms set up the way the wizard sets them up - the YAML helpers plus
+either a native-engine config entry of this integration or the blueprint
+automation block from config_flow._automation_config() - and replays one
+scripted sensor timeline per room: PIR, mmWave, indoor lux, bed and wall
+switch presses, staggered so rooms interleave.
+
+The clock is frozen: simulated time only moves when the script advances it,
+and every timer that falls due on the way (coalescing and batching windows,
+bed delays, vacancy timeouts, the blueprint's delays and time triggers)
+fires in order at its simulated time. Two runs therefore issue the same
+commands at the same simulated instants; only the CPU timings vary. The
+simulation itself lives in tests/simulation.py, which the test suite runs
+with fixed budgets; this script only times it and prints the table.
+
+Reported per engine and house size:
+  cpu s        wall-clock time of the whole simulated evening (triggers,
+               timers, time-pattern runs)
+  cpu/trigger  wall-clock time to process one sensor event and everything
+               it set off on the event loop (p50 / p95)
+  renders      Template.async_render calls
+  light calls  light.turn_on / light.turn_off service calls
+  helper wr.   input_* service calls (helper writes)
+  motion->on   simulated time from "walks into the dark room" to the
+               light.turn_on call (p50 / max)
+
+    python benchmarks/bench_simulation.py [--rooms 1,25,200] [--engine native]
+
+--engine blueprint (or both) runs the blueprint automations too; they cost
+about 20 s of CPU per room for the simulated hour, so keep --rooms small.
+--engine compiled runs the same automations compiled per room (compiler.py).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from tests.simulation import WALK_INS, simulate  # noqa: E402
+
+
+def _pct(values: list[float], fraction: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[max(0, int(len(values) * fraction) - 1)]
+
+
+async def run(room_counts: list[int], engines: list[str]) -> None:
+    logging.basicConfig(level=logging.ERROR)
+    print(
+        f"{'engine':9s} {'rooms':>5s} {'triggers':>8s} {'cpu s':>7s} {'cpu/trigger p50/p95 ms':>23s}"
+        f" {'renders':>8s} {'light calls':>11s} {'helper wr.':>10s} {'motion->on p50/max ms':>22s}"
+    )
+    for engine in engines:
+        for rooms in room_counts:
+            counters = await simulate(rooms, engine)
+            on = counters.motion_to_on_ms
+            print(
+                f"{engine:9s} {rooms:5d} {len(counters.cpu_ms):8d} {counters.cpu_s:7.2f}"
+                f" {statistics.median(counters.cpu_ms):11.3f} / {_pct(counters.cpu_ms, 0.95):8.3f}"
+                f" {counters.renders:8d} {counters.light_calls:11d} {counters.helper_writes:10d}"
+                f" {statistics.median(on) if on else float('nan'):11.0f} / {max(on, default=float('nan')):8.0f}"
+                f"   ({len(on)} of {rooms * len(WALK_INS)} walk-ins lit)"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", default="1,25,200",
+                        help="comma-separated house sizes")
+    parser.add_argument("--engine", choices=("native", "blueprint", "compiled", "both"), default="native")
+    args = parser.parse_args()
+    engines = ["native", "blueprint"] if args.engine == "both" else [args.engine]
+    asyncio.run(run([int(n) for n in args.rooms.split(",")], engines))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,83 @@ from __future__ import annotations
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    CONF_COMPILE_AUTOMATION,
+    CONF_ENGINE,
+    CONF_ENTRY_TYPE,
+    CONF_HELPER_BACKEND,
+    DATA_BATCHER,
+    DATA_COMPILED_REFRESHER,
+    DATA_ENGINES,
+    DATA_HEALTH,
+    DATA_HOME_PRESENCE,
+    DATA_PROFILER,
+    DATA_RUN_OBSERVER,
+    DATA_SCHEDULER,
+    DATA_SNAPSHOTS,
+    DATA_TELEMETRY,
+    DATA_TRACES,
+    DATA_WINDOWS,
+    DOMAIN,
+    ENGINE_NATIVE,
+    ENTRY_TYPE_HOUSE,
+    HELPER_BACKEND_STORAGE,
+)
+from .batcher import LightCommandBatcher
+from .config_flow import CompiledAutomationRefresher
+from .daytime import STALE_SECONDS, DaytimeParams
+from .decision import RoomConfig
+from .decision_trace import DecisionTrace
+from .engine import RoomEngine
+from .health import SensorHealthMonitor
+from .illuminance import IlluminanceWindow
+from .presence import HomePresence
+from .profiler import TemplateProfiler
+from .run_observer import BlueprintRunObserver
+from .scheduler import RoomScheduler
+from .snapshot import RoomSnapshotStore
+from .telemetry import RoomTelemetry
+from .websocket_api import async_register_commands
 
 _LOGGER = logging.getLogger(__name__)
 
-DOMAIN = "universal_lighting_setup_wizard"
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.SWITCH]
+HOUSE_PLATFORMS = [Platform.BINARY_SENSOR]
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Create the domain-wide objects shared by every room."""
+    scheduler = RoomScheduler(hass)
+    hass.data[DATA_SCHEDULER] = scheduler
+    batcher = LightCommandBatcher(hass)
+    hass.data[DATA_BATCHER] = batcher
+    hass.data[DATA_RUN_OBSERVER] = BlueprintRunObserver(hass)
+    hass.data[DATA_HEALTH] = SensorHealthMonitor(hass, scheduler)
+    hass.data[DATA_PROFILER] = TemplateProfiler(hass)
+    hass.data[DATA_HOME_PRESENCE] = HomePresence(hass)
+    refresher = CompiledAutomationRefresher(hass)
+    hass.data[DATA_COMPILED_REFRESHER] = refresher
+    snapshots = RoomSnapshotStore(hass)
+    await snapshots.async_load()
+    hass.data[DATA_SNAPSHOTS] = snapshots
+    async_register_commands(hass)
+
+    @callback
+    def _async_shutdown(_event: Event) -> None:
+        scheduler.async_shutdown()
+        batcher.async_shutdown()
+        snapshots.async_shutdown()
+        refresher.async_shutdown()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -16,6 +88,66 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = entry.data
 
+    # The house entry only carries the shared outdoor daytime sensor
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_HOUSE:
+        params = DaytimeParams.from_entry_data(entry.data)
+        if params.outdoor_lux_sensor:
+            # A dark reading may legitimately sit unchanged all night, so the
+            # lux sensor only ages while it reads daylight
+            entry.async_on_unload(
+                hass.data[DATA_HEALTH].async_watch(
+                    entry.entry_id,
+                    "Outdoor daytime",
+                    [params.outdoor_lux_sensor],
+                    max_age=STALE_SECONDS,
+                    min_value=params.outdoor_dark_below_lux,
+                )
+            )
+        await hass.config_entries.async_forward_entry_setups(entry, HOUSE_PLATFORMS)
+        return True
+
+    # The illuminance ring buffer is shared by the filtered illuminance sensor
+    # (which restores it) and the native engine, so the platform is set up -
+    # and the samples restored - before the engine makes its first decision.
+    config = RoomConfig.from_entry_data(entry.data)
+    window = IlluminanceWindow(config.illuminance_window)
+    hass.data.setdefault(DATA_WINDOWS, {})[entry.entry_id] = window
+    telemetry = RoomTelemetry()
+    hass.data.setdefault(DATA_TELEMETRY, {})[entry.entry_id] = telemetry
+    trace = DecisionTrace()
+    hass.data.setdefault(DATA_TRACES, {})[entry.entry_id] = trace
+    entry.async_on_unload(
+        hass.data[DATA_HEALTH].async_watch(
+            entry.entry_id, config.room_name, config.health_entities
+        )
+    )
+    # Before the platforms: the "Someone Home" sensor only exists for
+    # watched rooms, and the engine reads the aggregate from its first decision
+    if config.blocks_when_away:
+        entry.async_on_unload(
+            hass.data[DATA_HOME_PRESENCE].async_watch(entry.entry_id, config.presence_trackers)
+        )
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Native engine rooms have no blueprint automation - the engine IS the
+    # room's logic, so it must be running before anything else happens.
+    if entry.data.get(CONF_ENGINE) == ENGINE_NATIVE:
+        engine = RoomEngine(
+            hass, entry, hass.data[DATA_SCHEDULER], window, telemetry, hass.data[DATA_BATCHER],
+            trace,
+        )
+        await engine.async_start()
+        hass.data.setdefault(DATA_ENGINES, {})[entry.entry_id] = engine
+    elif automation_id := entry.data.get("automation_id"):
+        if entry.data.get(CONF_COMPILE_AUTOMATION):
+            # Recompiled with every other stale room once setup settles
+            hass.data[DATA_COMPILED_REFRESHER].async_schedule(entry)
+        entry.async_on_unload(
+            hass.data[DATA_RUN_OBSERVER].async_add_room(
+                automation_id, config.blueprint_trigger_entities, telemetry, trace
+            )
+        )
+
     # Show the setup-complete notification ONCE (async_setup_entry runs on
     # every HA restart for every entry - without this flag the "Setup
     # Complete" notification re-appeared for every room at every boot).
@@ -23,6 +155,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         room_name = entry.data.get("room_name", "Unknown")
         sanitized_name = entry.data.get("sanitized_room_name", room_name)
         automation_id = entry.data.get("automation_id", "N/A")
+        if entry.data.get(CONF_ENGINE) == ENGINE_NATIVE:
+            logic_line = "- ✅ Native event-driven engine (no blueprint automation needed)"
+            next_steps = (
+                "1. Go to **Settings → Devices & Services**\n"
+                "2. Open **Universal Smart Lighting Setup Wizard** to review the room"
+            )
+        else:
+            logic_line = (
+                f"- ✅ Automation **Universal Smart Lighting - {room_name}** "
+                "in `/config/automations.yaml`"
+            )
+            next_steps = (
+                "1. Go to **Settings → Automations & Scenes**\n"
+                f"2. Open **Universal Smart Lighting - {room_name}** to fine-tune any settings"
+            )
+
+        if entry.data.get(CONF_HELPER_BACKEND) == HELPER_BACKEND_STORAGE:
+            helpers_line = "Helpers managed in **Settings → Devices & Services → Helpers**"
+        else:
+            helpers_line = f"Helper package file `/config/packages/lighting_{sanitized_name}.yaml`"
 
         notification_message = f"""
 ## ✅ Universal Smart Lighting Setup Complete!
@@ -31,12 +183,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 **What was created:**
 - ✅ 6 Helper entities (automation_active, manual_override, light_auto_on, occupancy_state, last_automation_action, illuminance_history)
-- ✅ Automation **Universal Smart Lighting - {room_name}** in `/config/automations.yaml`
-- ✅ Helper package file `/config/packages/lighting_{sanitized_name}.yaml`
+{logic_line}
+- ✅ {helpers_line}
 
 **Next Steps:**
-1. Go to **Settings → Automations & Scenes**
-2. Open **Universal Smart Lighting - {room_name}** to fine-tune any settings
+{next_steps}
 3. Test by walking into the room!
 
 **Automation ID:** `{automation_id}`
@@ -64,12 +215,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_HOUSE:
+        if not await hass.config_entries.async_unload_platforms(entry, HOUSE_PLATFORMS):
+            return False
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        return True
+
+    # Platforms first: if they fail to unload the room keeps running as is
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
+    engine = hass.data.get(DATA_ENGINES, {}).pop(entry.entry_id, None)
+    if engine is not None:
+        engine.async_stop()
+    hass.data.get(DATA_WINDOWS, {}).pop(entry.entry_id, None)
+    hass.data.get(DATA_TELEMETRY, {}).pop(entry.entry_id, None)
+    hass.data.get(DATA_TRACES, {}).pop(entry.entry_id, None)
     hass.data[DOMAIN].pop(entry.entry_id, None)
     return True
 
 
 async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle removal of an entry."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_HOUSE:
+        return
+    if (snapshots := hass.data.get(DATA_SNAPSHOTS)) is not None:
+        snapshots.async_forget(entry.entry_id)
     _LOGGER.info(
         "Removing Universal Lighting Setup Wizard entry for room: %s "
         "(the helpers, package file and automation are NOT deleted - remove "
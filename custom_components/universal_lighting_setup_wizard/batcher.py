@@ -0,0 +1,224 @@
+"""Shared light command batcher for all native-engine rooms.
+
+When a whole floor goes vacant or the outdoor daytime verdict flips at
+dusk, every room sends its own light.turn_on / turn_off with its own
+transition, brightness and colour temperature. On Zigbee and Z-Wave
+meshes that flood of separate calls lands as popcorn lighting and dropped
+messages. The engines hand their light commands to one LightCommandBatcher
+instead:
+
+- commands are collected for BATCH_WINDOW_SECONDS (urgent ones - someone
+  walking in - only until the current event-loop iteration is done);
+  commands with the same domain, service and payload (everything but
+  entity_id) are merged into one service call for all their entities,
+  whichever rooms they came from;
+- each merged call is split by the integration (entity registry platform)
+  that owns the entities, and calls to one integration go out one at a
+  time, at least MIN_CALL_INTERVAL apart, while different integrations
+  run side by side.
+
+A whole-house transition is thus one call per distinct payload and mesh.
+The presence fast path uses async_send_now() instead: when the command's
+integration is idle (nothing queued, its call interval passed) the call is
+made right away from the caller's task, still counting towards the pacing;
+otherwise it joins the batches as an urgent command.
+The merged call gets a context whose parent is the first room's context,
+so no room mistakes the state echoes for a manual change.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+from typing import Any, Hashable
+
+from homeassistant.core import Context, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long commands are gathered before they are merged and sent
+BATCH_WINDOW_SECONDS = 0.05
+# Minimum gap between two calls to the same integration (radio mesh)
+MIN_CALL_INTERVAL = 0.1
+
+
+@dataclass(slots=True)
+class _Batch:
+    """Commands with one payload, merged across rooms."""
+
+    domain: str
+    service: str
+    data: dict[str, Any]
+    entity_ids: dict[str, None] = field(default_factory=dict)
+    contexts: list[Context] = field(default_factory=list)
+    waiters: list[asyncio.Future[datetime]] = field(default_factory=list)
+    remaining: int = 0  # per-integration calls not made yet
+    dispatched: datetime | None = None  # when the first of them went out
+
+
+@dataclass(slots=True)
+class _Call:
+    """One service call to one integration's entities."""
+
+    batch: _Batch
+    entity_ids: list[str]
+    context: Context
+
+
+def _payload_key(domain: str, service: str, data: dict[str, Any]) -> Hashable:
+    return (domain, service, tuple(sorted((k, repr(v)) for k, v in data.items())))
+
+
+class LightCommandBatcher:
+    """Merges light commands from all rooms and paces them per integration."""
+
+    def __init__(self, hass: HomeAssistant, window: float = BATCH_WINDOW_SECONDS,
+                 min_interval: float = MIN_CALL_INTERVAL) -> None:
+        """Initialize an idle batcher."""
+        self.hass = hass
+        self.window = window
+        self.min_interval = min_interval
+        self._pending: dict[Hashable, _Batch] = {}
+        self._flush_handle: asyncio.Handle | None = None
+        self._queues: dict[str | None, deque[_Call]] = {}
+        self._next_slot: dict[str | None, float] = {}
+        # Service calls actually made / commands submitted (diagnostics)
+        self.calls = 0
+        self.commands = 0
+
+    def async_submit(self, domain: str, service: str, data: dict[str, Any],
+                     context: Context, urgent: bool = False) -> asyncio.Future[datetime]:
+        """Queue one command; the future resolves (with the time its first
+        call went out) once every entity in it has been commanded."""
+        entity_ids = data.get("entity_id") or []
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        payload = {k: v for k, v in data.items() if k != "entity_id"}
+        key = _payload_key(domain, service, payload)
+        if (batch := self._pending.get(key)) is None:
+            batch = self._pending[key] = _Batch(domain, service, payload)
+        batch.entity_ids.update(dict.fromkeys(entity_ids))
+        batch.contexts.append(context)
+        waiter: asyncio.Future[datetime] = self.hass.loop.create_future()
+        batch.waiters.append(waiter)
+        self.commands += 1
+        if urgent:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush_handle = self.hass.loop.call_soon(self._async_flush)
+        elif self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(self.window, self._async_flush)
+        return waiter
+
+    async def async_send_now(self, domain: str, service: str, data: dict[str, Any],
+                             context: Context) -> datetime:
+        """Send one command immediately if its integration is idle.
+
+        Returns when the call went out. Commands spanning integrations, or
+        for an integration that is busy, go through async_submit(urgent=True).
+        """
+        entity_ids = data.get("entity_id") or []
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        registry = er.async_get(self.hass)
+        platforms = {
+            entry.platform if (entry := registry.async_get(entity_id)) else None
+            for entity_id in entity_ids
+        }
+        if len(platforms) != 1:
+            return await self.async_submit(domain, service, data, context, urgent=True)
+        platform = platforms.pop()
+        if platform in self._queues or self._next_slot.get(platform, 0) > self.hass.loop.time():
+            return await self.async_submit(domain, service, data, context, urgent=True)
+        payload = {k: v for k, v in data.items() if k != "entity_id"}
+        batch = _Batch(domain, service, payload, dict.fromkeys(entity_ids), [context], remaining=1)
+        self.commands += 1
+        # Drained here, in the caller's task; commands for the integration
+        # flushed meanwhile queue up behind it as usual
+        queue = self._queues[platform] = deque([_Call(batch, list(entity_ids), context)])
+        await self._async_drain(platform, queue)
+        return batch.dispatched
+
+    @callback
+    def _async_flush(self) -> None:
+        """Split the merged batches per integration and start sending."""
+        self._flush_handle = None
+        batches, self._pending = self._pending, {}
+        registry = er.async_get(self.hass)
+        for batch in batches.values():
+            by_platform: dict[str | None, list[str]] = {}
+            for entity_id in batch.entity_ids:
+                entry = registry.async_get(entity_id)
+                by_platform.setdefault(entry.platform if entry else None, []).append(entity_id)
+            if not by_platform:
+                batch.dispatched = dt_util.utcnow()
+                self._async_resolve(batch)
+                continue
+            batch.remaining = len(by_platform)
+            context = Context(parent_id=batch.contexts[0].id)
+            for platform, entity_ids in by_platform.items():
+                queue = self._queues.get(platform)
+                if queue is None:
+                    queue = self._queues[platform] = deque()
+                    self.hass.async_create_task(self._async_drain(platform, queue))
+                queue.append(_Call(batch, entity_ids, context))
+
+    async def _async_drain(self, platform: str | None, queue: deque[_Call]) -> None:
+        """Send one integration's calls in order, MIN_CALL_INTERVAL apart."""
+        loop = self.hass.loop
+        try:
+            while queue:
+                call = queue.popleft()
+                if (wait := self._next_slot.get(platform, 0) - loop.time()) > 0:
+                    await asyncio.sleep(wait)
+                batch = call.batch
+                if batch.dispatched is None:
+                    batch.dispatched = dt_util.utcnow()
+                await self._async_call(call)
+                self._next_slot[platform] = loop.time() + self.min_interval
+                batch.remaining -= 1
+                if not batch.remaining:
+                    self._async_resolve(batch)
+        finally:
+            del self._queues[platform]
+
+    async def _async_call(self, call: _Call) -> None:
+        batch = call.batch
+        self.calls += 1
+        try:
+            await self.hass.services.async_call(
+                batch.domain,
+                batch.service,
+                {"entity_id": call.entity_ids, **batch.data},
+                blocking=True,
+                context=call.context,
+            )
+        except Exception:  # noqa: BLE001 - one bad entity must not stop the rest
+            _LOGGER.exception(
+                "%s.%s for %s failed", batch.domain, batch.service, ", ".join(call.entity_ids)
+            )
+
+    @callback
+    def _async_resolve(self, batch: _Batch) -> None:
+        for waiter in batch.waiters:
+            if not waiter.done():
+                waiter.set_result(batch.dispatched)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop everything not sent yet (Home Assistant is stopping)."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batches = list(self._pending.values())
+        self._pending.clear()
+        for queue in self._queues.values():
+            batches.extend(call.batch for call in queue)
+            queue.clear()
+        for batch in batches:
+            for waiter in batch.waiters:
+                waiter.cancel()
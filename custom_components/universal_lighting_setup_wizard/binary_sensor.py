@@ -0,0 +1,266 @@
+"""Binary sensor platform for Universal Smart Lighting Setup Wizard.
+
+Each room gets a "Sensor Health" problem sensor, on while any of its
+sensors is stale (see health.py); it is only written when the monitor
+signals a change for the room. Rooms whose daytime control blocks
+auto-on while nobody is home also get a "Someone Home" presence sensor fed
+by the shared HomePresence aggregate (see presence.py) - the blueprint
+reads it instead of expanding its device trackers on every run.
+
+The house entry's "Outdoor Daytime" sensor: the one house-wide outdoor-lux
+daytime source every room reads (see daytime.py). It follows the outdoor
+lux sensor and owns the single hysteresis latch, restored across restarts.
+Its HA state is only written when the verdict, its source or the latch
+change - not on every weather-station update - and native rooms are told
+through a dispatcher signal, so a lux update costs O(1) however many rooms
+there are.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN, EntityCategory
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_ENTRY_TYPE,
+    DATA_DAYTIME,
+    DATA_HEALTH,
+    DATA_HOME_PRESENCE,
+    DAYTIME_SENSOR_UNIQUE_ID,
+    ENTRY_TYPE_HOUSE,
+    SIGNAL_DAYTIME_UPDATED,
+    SIGNAL_HEALTH_UPDATED,
+    SIGNAL_HOME_PRESENCE_UPDATED,
+)
+from .daytime import STALE_SECONDS, DaytimeParams, OutdoorDaytime
+from .decision import RoomConfig
+from .health import SensorHealthMonitor
+from .presence import HomePresence, someone_home_entity_id
+
+SUN_ENTITY = "sun.sun"
+ATTR_SOURCE = "source"
+ATTR_OUTDOOR_DARK = "outdoor_dark"
+ATTR_STALE = "stale"
+ATTR_DARK_BELOW = "dark_below_lux"
+ATTR_BRIGHT_ABOVE = "bright_above_lux"
+ATTR_STALE_SENSORS = "stale_sensors"
+ATTR_HOME_TRACKERS = "home_trackers"
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Add the house-wide outdoor daytime sensor, or a room's health / presence sensors."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_HOUSE:
+        async_add_entities([OutdoorDaytimeSensor(DaytimeParams.from_entry_data(entry.data))])
+        return
+    config = RoomConfig.from_entry_data(entry.data)
+    entities: list[BinarySensorEntity] = [
+        RoomHealthSensor(entry, config, hass.data[DATA_HEALTH])
+    ]
+    presence: HomePresence = hass.data[DATA_HOME_PRESENCE]
+    if presence.is_watched(entry.entry_id):
+        entities.append(SomeoneHomeSensor(entry, config, presence))
+    async_add_entities(entities)
+
+
+class RoomHealthSensor(BinarySensorEntity):
+    """On (problem) while any of the room's sensors is stale."""
+
+    _attr_should_poll = False
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, entry: ConfigEntry, config: RoomConfig,
+                 monitor: SensorHealthMonitor) -> None:
+        """Initialize from the room's settings and the shared monitor."""
+        self._entry_id = entry.entry_id
+        self._monitor = monitor
+        self._attr_unique_id = f"{entry.entry_id}_sensor_health"
+        self._attr_name = f"{config.room_name} Sensor Health"
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the monitor's verdicts for this room."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, f"{SIGNAL_HEALTH_UPDATED}_{self._entry_id}", self.async_write_ha_state
+            )
+        )
+
+    @property
+    def is_on(self) -> bool:
+        return bool(self._monitor.stale_sensors(self._entry_id))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {ATTR_STALE_SENSORS: self._monitor.stale_sensors(self._entry_id)}
+
+
+class SomeoneHomeSensor(BinarySensorEntity):
+    """On while any of the room's device trackers is home."""
+
+    _attr_should_poll = False
+    _attr_device_class = BinarySensorDeviceClass.PRESENCE
+
+    def __init__(self, entry: ConfigEntry, config: RoomConfig,
+                 presence: HomePresence) -> None:
+        """Initialize from the room's settings and the shared aggregate."""
+        self._entry_id = entry.entry_id
+        self._presence = presence
+        self._attr_unique_id = f"{entry.entry_id}_someone_home"
+        self._attr_name = f"{config.room_name} Someone Home"
+        # The room's automation was written with this entity id
+        self.entity_id = someone_home_entity_id(config.sanitized_room_name)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the aggregate's changes for this room."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, f"{SIGNAL_HOME_PRESENCE_UPDATED}_{self._entry_id}",
+                self.async_write_ha_state,
+            )
+        )
+
+    @property
+    def is_on(self) -> bool:
+        return self._presence.someone_home(self._entry_id)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {ATTR_HOME_TRACKERS: self._presence.home_names(self._entry_id)}
+
+
+def _lux_reading(state: State | None, now: float) -> tuple[float | None, float | None]:
+    """(lux, age in seconds) of the outdoor sensor, (None, None) if unusable."""
+    if state is None or state.state in ("", STATE_UNKNOWN, STATE_UNAVAILABLE):
+        return None, None
+    try:
+        lux = float(state.state)
+    except ValueError:
+        return None, None
+    return lux, now - state.last_updated.timestamp()
+
+
+class OutdoorDaytimeSensor(RestoreEntity, BinarySensorEntity):
+    """On while it is daytime outside (lux verdict, else the sun)."""
+
+    _attr_should_poll = False
+    _attr_name = "Outdoor Daytime"
+    _attr_unique_id = DAYTIME_SENSOR_UNIQUE_ID
+    _unrecorded_attributes = frozenset({ATTR_DARK_BELOW, ATTR_BRIGHT_ABOVE})
+
+    def __init__(self, params: DaytimeParams) -> None:
+        """Initialize from the house entry's settings."""
+        self._params = params
+        self.daytime = OutdoorDaytime(params)
+        self._sun_up = False
+        self._cancel_stale_check: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the latch, then follow the outdoor sensor and the sun."""
+        await super().async_added_to_hass()
+        if (last := await self.async_get_last_state()) is not None:
+            outdoor_dark = last.attributes.get(ATTR_OUTDOOR_DARK)
+            if isinstance(outdoor_dark, bool):
+                self.daytime.outdoor_dark = outdoor_dark
+
+        entities = [SUN_ENTITY]
+        if self._params.outdoor_lux_sensor:
+            entities.append(self._params.outdoor_lux_sensor)
+        self.async_on_remove(
+            async_track_state_change_event(self.hass, entities, self._async_source_changed)
+        )
+        self.async_on_remove(self._async_cancel_stale_check)
+        self._refresh()
+        self.hass.data[DATA_DAYTIME] = self.daytime
+        async_dispatcher_send(self.hass, SIGNAL_DAYTIME_UPDATED)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Rooms fall back to their own sun windows."""
+        if self.hass.data.get(DATA_DAYTIME) is self.daytime:
+            del self.hass.data[DATA_DAYTIME]
+            async_dispatcher_send(self.hass, SIGNAL_DAYTIME_UPDATED)
+
+    @callback
+    def _async_source_changed(self, event: Event) -> None:
+        old_state: State | None = event.data.get("old_state")
+        new_state: State | None = event.data.get("new_state")
+        if old_state is not None and new_state is not None and old_state.state == new_state.state:
+            return
+        self._async_update_and_write()
+
+    @callback
+    def _async_stale_check(self, _now: datetime) -> None:
+        self._cancel_stale_check = None
+        self._async_update_and_write()
+
+    @callback
+    def _async_update_and_write(self) -> None:
+        before = (self.is_on, self.daytime.source, self.daytime.outdoor_dark)
+        verdict = self.daytime.verdict
+        self._refresh()
+        if (self.is_on, self.daytime.source, self.daytime.outdoor_dark) != before:
+            self.async_write_ha_state()
+        if self.daytime.verdict != verdict:
+            async_dispatcher_send(self.hass, SIGNAL_DAYTIME_UPDATED)
+
+    def _refresh(self) -> None:
+        """Fold the current readings into the latch; arm the staleness check."""
+        now = dt_util.utcnow().timestamp()
+        sun = self.hass.states.get(SUN_ENTITY)
+        self._sun_up = sun is not None and sun.state == "above_horizon"
+        lux_state = (
+            self.hass.states.get(self._params.outdoor_lux_sensor)
+            if self._params.outdoor_lux_sensor
+            else None
+        )
+        lux, age = _lux_reading(lux_state, now)
+        self.daytime.update(lux, age)
+        # One pending check at a time: when it fires on a reading that has
+        # been refreshed meanwhile, it simply re-arms for the new one
+        if self.daytime.valid and self._cancel_stale_check is None:
+            self._cancel_stale_check = async_track_point_in_utc_time(
+                self.hass,
+                self._async_stale_check,
+                dt_util.utc_from_timestamp(now - age + STALE_SECONDS + 1),
+            )
+
+    @callback
+    def _async_cancel_stale_check(self) -> None:
+        if self._cancel_stale_check is not None:
+            self._cancel_stale_check()
+            self._cancel_stale_check = None
+
+    @property
+    def is_on(self) -> bool:
+        verdict = self.daytime.verdict
+        return self._sun_up if verdict is None else verdict
+
+    @property
+    def icon(self) -> str:
+        return "mdi:weather-sunny" if self.is_on else "mdi:weather-night"
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            ATTR_SOURCE: self.daytime.source,
+            ATTR_OUTDOOR_DARK: self.daytime.outdoor_dark,
+            ATTR_STALE: not self.daytime.valid,
+            ATTR_DARK_BELOW: self._params.outdoor_dark_below_lux,
+            ATTR_BRIGHT_ABOVE: self._params.outdoor_bright_above_lux,
+        }
@@ -0,0 +1,116 @@
+"""Coalesces a room's bursty triggers into one decision.
+
+Someone walking in produces a PIR change, an mmWave change, a lux change
+(the lights raise it) and the lights' own state echoes within a few hundred
+milliseconds. Under the blueprint's `mode: restart` each of them starts a
+full run that the next one kills. The native engine instead folds every
+state change into its RoomState straight away and hands the trigger to a
+TriggerCoalescer: triggers arriving within the room's coalescing window are
+merged and decide once, on the merged snapshot.
+
+The window is fixed from the first trigger of a batch (never extended), so
+a steady stream of lux reports can delay a decision by at most one window.
+Immediate triggers - presence turning on, scheduler deadlines - are never
+held back: they flush the pending batch together with themselves.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+# Trigger types and whether they may wait for the window
+TRIGGER_PRESENCE_ON = "presence_on"
+TRIGGER_PRESENCE = "presence"
+TRIGGER_ILLUMINANCE = "illuminance"
+TRIGGER_LIGHT = "light"
+TRIGGER_BED = "bed"
+TRIGGER_OVERRIDE = "override"
+TRIGGER_TRACKER = "tracker"
+TRIGGER_LATENCY = "latency"
+TRIGGER_SUN = "sun_change"
+TRIGGER_OUTDOOR_DAYTIME = "outdoor_daytime"
+TRIGGER_TIMER = "timer"
+
+PRIORITY_IMMEDIATE = 0
+PRIORITY_COALESCED = 1
+
+TRIGGER_PRIORITIES: dict[str, int] = {
+    TRIGGER_PRESENCE_ON: PRIORITY_IMMEDIATE,
+    TRIGGER_TIMER: PRIORITY_IMMEDIATE,
+    TRIGGER_PRESENCE: PRIORITY_COALESCED,  # going vacant: the timeout is minutes anyway
+    TRIGGER_ILLUMINANCE: PRIORITY_COALESCED,
+    TRIGGER_LIGHT: PRIORITY_COALESCED,
+    TRIGGER_BED: PRIORITY_COALESCED,  # bed entry/exit already wait for their delay
+    TRIGGER_OVERRIDE: PRIORITY_COALESCED,
+    TRIGGER_TRACKER: PRIORITY_COALESCED,
+    TRIGGER_LATENCY: PRIORITY_COALESCED,
+    TRIGGER_SUN: PRIORITY_COALESCED,
+    TRIGGER_OUTDOOR_DAYTIME: PRIORITY_COALESCED,
+}
+
+# flush(triggers, fired): the merged trigger types in arrival order (repeats
+# included) and when the earliest of them happened
+FlushCallback = Callable[[list[str], datetime | None], None]
+
+
+class TriggerCoalescer:
+    """Merges one room's triggers that arrive within a short window."""
+
+    def __init__(self, hass: HomeAssistant, window_ms: float, flush: FlushCallback) -> None:
+        """Initialize; a window of 0 passes every trigger straight through."""
+        self.hass = hass
+        self.window = max(0.0, window_ms) / 1000
+        self._flush = flush
+        self._pending: list[str] = []
+        self._first_fired: datetime | None = None
+        self._cancel_timer: CALLBACK_TYPE | None = None
+
+    @property
+    def pending(self) -> list[str]:
+        return list(self._pending)
+
+    @callback
+    def async_add(self, trigger: str, fired: datetime | None = None) -> None:
+        """Queue a trigger; decide now if it is immediate or the window is 0."""
+        self._pending.append(trigger)
+        if fired is not None and (self._first_fired is None or fired < self._first_fired):
+            self._first_fired = fired
+        if (
+            not self.window
+            or TRIGGER_PRIORITIES.get(trigger, PRIORITY_COALESCED) == PRIORITY_IMMEDIATE
+        ):
+            self.async_flush()
+        elif self._cancel_timer is None:
+            self._cancel_timer = async_call_later(self.hass, self.window, self._async_timer)
+
+    @callback
+    def async_flush(self) -> None:
+        """Decide on everything pending right now."""
+        self._async_cancel_timer()
+        if not self._pending:
+            return
+        triggers, fired = self._pending, self._first_fired
+        self._pending = []
+        self._first_fired = None
+        self._flush(triggers, fired)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop everything pending without deciding (engine stopping)."""
+        self._async_cancel_timer()
+        self._pending.clear()
+        self._first_fired = None
+
+    @callback
+    def _async_timer(self, _now: datetime) -> None:
+        self._cancel_timer = None
+        self.async_flush()
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
@@ -0,0 +1,106 @@
+"""Per-entity cache of what each light was told and what it reports.
+
+The blueprint sends light.turn_on / turn_off to every light in the room
+whenever its decision says so, including lights already off, or already on
+at (almost) the adaptive brightness and colour temperature. Each of those
+calls is mesh traffic, a state write and a recorder row for nothing. The
+native engine keeps a CommandCache per room instead: the last observed
+on/off, brightness and kelvin of every light (fed from the state events it
+already receives) and the last command it sent. A command is only sent to
+the entities whose expected state differs from the target: on/off, or
+brightness / kelvin by more than the room's deltas.
+
+"Expected" is the last command while it is in flight (sent after the last
+observation and younger than its settle time - transition plus
+COMMAND_SETTLE_SECONDS), otherwise the last observation. A command that
+was lost therefore stops suppressing the next one once it has settled.
+
+Pure Python, no Home Assistant imports.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+# How long after a command (beyond its transition) it still counts as the
+# expected state when no state report has arrived yet
+COMMAND_SETTLE_SECONDS = 5.0
+
+
+@dataclass(slots=True)
+class LightSnapshot:
+    """On/off, brightness (%) and colour temperature (K) of one light.
+
+    None means unknown (observed) or "not part of the command" (commanded).
+    """
+
+    on: bool | None = None
+    brightness_pct: float | None = None
+    kelvin: float | None = None
+    at: float = 0.0
+    # Commands only: until when they stand in for a missing state report
+    expires: float = 0.0
+
+
+class CommandCache:
+    """Last commanded and last observed state of a room's lights."""
+
+    def __init__(self, brightness_delta: float, kelvin_delta: float) -> None:
+        """Initialize; changes smaller than the deltas are not worth a command."""
+        self.brightness_delta = brightness_delta
+        self.kelvin_delta = kelvin_delta
+        self.observed: dict[str, LightSnapshot] = {}
+        self.commanded: dict[str, LightSnapshot] = {}
+
+    def observe(self, entity_id: str, on: bool | None, brightness_pct: float | None,
+                kelvin: float | None, now: float) -> None:
+        """Record a state report; None for `on` when the light is unavailable."""
+        self.observed[entity_id] = LightSnapshot(on, brightness_pct, kelvin, now)
+
+    def expected(self, entity_id: str, now: float) -> LightSnapshot | None:
+        """What the light should be in right now, None if nothing is known."""
+        observed = self.observed.get(entity_id)
+        commanded = self.commanded.get(entity_id)
+        if (
+            commanded is not None
+            and now < commanded.expires
+            and (observed is None or commanded.at > observed.at)
+        ):
+            return commanded
+        return observed
+
+    def needs_command(self, entity_id: str, target: LightSnapshot, now: float) -> bool:
+        """Whether the light is off-target by more than the configured deltas."""
+        current = self.expected(entity_id, now)
+        if current is None or current.on is None or current.on != target.on:
+            return True
+        if not target.on:
+            return False
+        if target.brightness_pct is not None and (
+            current.brightness_pct is None
+            or abs(current.brightness_pct - target.brightness_pct) > self.brightness_delta
+        ):
+            return True
+        return target.kelvin is not None and (
+            current.kelvin is None
+            or abs(current.kelvin - target.kelvin) > self.kelvin_delta
+        )
+
+    def filter(self, entity_ids: list[str], target: LightSnapshot, now: float,
+               transition: float | None = None) -> list[str]:
+        """The entities that need the command; records it as sent for them."""
+        needed = [e for e in entity_ids if self.needs_command(e, target, now)]
+        if needed:
+            expires = now + (transition or 0) + COMMAND_SETTLE_SECONDS
+            for entity_id in needed:
+                self.commanded[entity_id] = LightSnapshot(
+                    target.on, target.brightness_pct, target.kelvin, now, expires
+                )
+        return needed
+
+    def lights_on(self, entity_ids: tuple[str, ...], now: float) -> int:
+        """How many of the entities are (expected to be) on."""
+        return sum(
+            1
+            for entity_id in entity_ids
+            if (current := self.expected(entity_id, now)) is not None and current.on
+        )
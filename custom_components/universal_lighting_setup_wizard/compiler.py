@@ -0,0 +1,527 @@
+"""Compiles the wizard's blueprint into a room-specialised plain automation.
+
+A blueprint automation renders the blueprint's whole `variables:` block -
+~160 templates - on every run, whatever the room uses: a bathroom without a
+bed sensor, trackers or an outdoor lux sensor still renders the bed logic,
+the tracker expansion, the outdoor hysteresis and the update check. The
+inputs never change between runs, so most of that work can be done once:
+
+- the room's inputs (blueprint defaults for the rest) are substituted for
+  every `!input`;
+- every variable that only depends on inputs and earlier such variables is
+  rendered once and written as a literal value;
+- template conditions that fold to a constant are dropped (true) or drop
+  their choose option / if branch with them (false);
+- state triggers on an empty input and the update-check triggers of a room
+  with the update check off are removed;
+- variables no remaining template reads are removed altogether.
+
+Folding renders in a hass-less template environment in which everything
+only known at run time (trigger, this, states(), now(), variables that are
+not constant) is a _RunTimeValue that aborts the render the moment a
+template looks at it - so a template folds only when its result cannot
+depend on anything but the inputs, and short-circuits (`enable_x and ...`)
+still fold. Anything that cannot be decided is left exactly as it was.
+
+The result is a self-contained automation (no `use_blueprint`) with the
+room's usual id and alias, tagged with the SHA-256 of the blueprint file it
+was compiled from, so it can be regenerated when the blueprint changes.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+import functools
+import hashlib
+import logging
+from typing import Any
+
+from jinja2 import meta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import template
+from homeassistant.util.yaml import parse_yaml
+from homeassistant.util.yaml.input import UndefinedSubstitution, substitute
+
+_LOGGER = logging.getLogger(__name__)
+
+TRIGGER_KEYS = ("trigger", "triggers")
+CONDITION_KEYS = ("condition", "conditions")
+ACTION_KEYS = ("action", "actions")
+# Triggers whose every run does nothing unless a (constant) switch is on:
+# the blueprint's update-check branch is gated by enable_update_check and
+# the run is stopped right after it
+GATED_TRIGGERS = {
+    "update_check": "enable_update_check",
+    "update_sensor_changed": "enable_update_check",
+}
+# Never constant even without hass
+_IMPURE_FILTERS = ("random",)
+_IMPURE_GLOBALS = ("lipsum",)
+_SPLICEABLE_KEYS = {"choose": {"choose", "default", "alias"}, "if": {"if", "then", "else", "alias"}}
+
+
+class CompileError(Exception):
+    """The blueprint cannot be compiled for this room."""
+
+
+@dataclass
+class CompiledAutomation:
+    """A compiled room automation and what compiling it removed."""
+
+    config: dict[str, Any]
+    blueprint_hash: str
+    variables: int = 0
+    variables_rendered: int = 0
+    triggers_removed: int = 0
+    branches_removed: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.variables_rendered} of {self.variables} variables rendered per run, "
+            f"{self.triggers_removed} triggers and {self.branches_removed} branches removed"
+        )
+
+
+class _Dynamic(BaseException):
+    """A template touched a value that is only known at run time.
+
+    A BaseException so that no template filter's `except Exception` (the
+    forgiving float/int filters return their default) can swallow it.
+    """
+
+
+def _run_time(*_args: Any, **_kwargs: Any) -> Any:
+    raise _Dynamic
+
+
+class _RunTimeValue:
+    """Stands in for anything only known at run time; every use aborts the render."""
+
+    __slots__ = ()
+
+    __getattr__ = __getitem__ = __call__ = __iter__ = __len__ = __contains__ = _run_time
+    __bool__ = __str__ = __int__ = __float__ = __index__ = __format__ = _run_time
+    __eq__ = __ne__ = __lt__ = __le__ = __gt__ = __ge__ = __hash__ = _run_time  # type: ignore[assignment]
+    __add__ = __radd__ = __sub__ = __rsub__ = __mul__ = __rmul__ = _run_time
+    __truediv__ = __rtruediv__ = __floordiv__ = __rfloordiv__ = _run_time
+    __mod__ = __rmod__ = __pow__ = __rpow__ = __neg__ = __pos__ = __abs__ = _run_time
+
+
+RUN_TIME = _RunTimeValue()
+
+
+def _guarded(func: Callable[..., Any]) -> Callable[..., Any]:
+    """A filter / test that aborts instead of inspecting a run-time value.
+
+    `x is none`, `x is defined` or `x | default(1)` would otherwise answer
+    for the stand-in without ever touching it.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if any(arg is RUN_TIME for arg in args) or any(
+            value is RUN_TIME for value in kwargs.values()
+        ):
+            raise _Dynamic
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+class _FoldingEnvironment(template.TemplateEnvironment):
+    """Home Assistant's template environment without hass (and without randomness)."""
+
+    def __init__(self) -> None:
+        super().__init__(None)
+        for name in _IMPURE_FILTERS:
+            self.filters.pop(name, None)
+        for name in _IMPURE_GLOBALS:
+            self.globals.pop(name, None)
+        self.filters = {name: _guarded(func) for name, func in self.filters.items()}
+        self.tests = {name: _guarded(func) for name, func in self.tests.items()}
+
+    def call(self, __context: Any, __obj: Any, *args: Any, **kwargs: Any) -> Any:
+        """Globals such as iif() or is_number() get the same guard as filters."""
+        if any(arg is RUN_TIME for arg in args) or any(
+            value is RUN_TIME for value in kwargs.values()
+        ):
+            raise _Dynamic
+        return super().call(__context, __obj, *args, **kwargs)
+
+
+class _Folder:
+    """Constant-folds one blueprint's templates against one room's inputs."""
+
+    def __init__(self, hass: HomeAssistant | None) -> None:
+        self.hass = hass
+        self.env = _FoldingEnvironment()
+        self.constants: dict[str, Any] = {}
+        self.run_time_names: set[str] = set()
+        self._names: dict[str, frozenset[str]] = {}
+
+    def names(self, source: str) -> frozenset[str]:
+        """Variables a template reads (cached per source)."""
+        if (names := self._names.get(source)) is None:
+            try:
+                names = frozenset(meta.find_undeclared_variables(self.env.parse(source)))
+            except Exception:  # noqa: BLE001 - an unparsable template reads "anything"
+                names = frozenset({"*"})
+            self._names[source] = names
+        return names
+
+    def fold(self, value: Any) -> Any:
+        """The value a (complex) template always renders to; raises _Dynamic if none."""
+        if isinstance(value, list):
+            return [self.fold(item) for item in value]
+        if isinstance(value, dict):
+            return {self.fold(key): self.fold(item) for key, item in value.items()}
+        if not isinstance(value, str) or not template.is_template_string(value):
+            return value
+
+        variables: dict[str, Any] = {}
+        for name in self.names(value):
+            if name == "*":
+                raise _Dynamic
+            if name in self.constants and name not in self.run_time_names:
+                variables[name] = self.constants[name]
+            elif name in self.run_time_names or name not in self.env.globals:
+                variables[name] = RUN_TIME
+        try:
+            rendered = self.env.from_string(value).render(variables).strip()
+        except _Dynamic:
+            raise
+        except Exception as err:  # noqa: BLE001 - fails at run time too; leave it there
+            raise _Dynamic from err
+        if template.is_template_string(rendered):
+            raise _Dynamic
+        # A static template is only parsed - exactly what the render at run time returns
+        return template.Template(rendered, self.hass).async_render()
+
+    def condition(self, condition: Any) -> bool | None:
+        """A template condition's constant verdict, or None if it depends on the run."""
+        if isinstance(condition, str):
+            value_template = condition
+        elif (
+            isinstance(condition, dict)
+            and condition.get("condition") == "template"
+            and condition.get("enabled", True) is True
+            and isinstance(condition.get("value_template"), str)
+        ):
+            value_template = condition["value_template"]
+        else:
+            return None
+        try:
+            return template.result_as_boolean(self.fold(value_template))
+        except _Dynamic:
+            return None
+
+    def conditions(self, conditions: Any) -> tuple[bool | None, list[Any]]:
+        """Fold an AND-list: (False, original) / (True, []) / (None, the rest)."""
+        conditions = conditions if isinstance(conditions, list) else [conditions]
+        remaining = []
+        for condition in conditions:
+            verdict = self.condition(condition)
+            if verdict is False:
+                return False, conditions
+            if verdict is None:
+                remaining.append(condition)
+        return (True if not remaining else None), remaining
+
+
+def _literal(value: Any) -> bool:
+    """Whether a rendered value survives being written back as plain YAML."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return True
+    if isinstance(value, str):
+        return not template.is_template_string(value)
+    if isinstance(value, list):
+        return all(_literal(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _literal(item) for key, item in value.items())
+    return False
+
+
+def _plain(value: Any) -> Any:
+    """Plain Python containers and scalars (the YAML loader returns subclasses)."""
+    if isinstance(value, dict):
+        return {_plain(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    return value
+
+
+def _template_strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        if template.is_template_string(value):
+            yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _template_strings(item)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _template_strings(key)
+            yield from _template_strings(item)
+
+
+def _assigned_names(steps: Any) -> Iterator[str]:
+    """Names set by `variables:` actions anywhere in a sequence."""
+    if isinstance(steps, list):
+        for step in steps:
+            yield from _assigned_names(step)
+    elif isinstance(steps, dict):
+        for key, value in steps.items():
+            if key == "variables" and isinstance(value, dict):
+                yield from value
+            else:
+                yield from _assigned_names(value)
+
+
+def input_defaults(blueprint_inputs: dict[str, Any]) -> dict[str, Any]:
+    """Default of every input, input sections (HA 2024.6+) included."""
+    defaults: dict[str, Any] = {}
+    for key, spec in (blueprint_inputs or {}).items():
+        if isinstance(spec, dict) and isinstance(spec.get("input"), dict):
+            defaults.update(input_defaults(spec["input"]))
+        elif isinstance(spec, dict) and "default" in spec:
+            defaults[key] = spec["default"]
+    return defaults
+
+
+def blueprint_hash(content: str) -> str:
+    """The blueprint version a compiled automation was built from."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class _Compiler:
+    def __init__(self, blueprint: dict[str, Any], inputs: dict[str, Any],
+                 hass: HomeAssistant | None) -> None:
+        try:
+            self.body = substitute(
+                {key: value for key, value in blueprint.items() if key != "blueprint"},
+                {**input_defaults(blueprint["blueprint"].get("input")), **inputs},
+            )
+        except UndefinedSubstitution as err:
+            raise CompileError(f"no value for blueprint input {err.input}") from err
+        self.folder = _Folder(hass)
+        self.branches_removed = 0
+
+    def variables(self, variables: dict[str, Any]) -> dict[str, Any]:
+        """Fold the variables in render order; constants become literals."""
+        folder = self.folder
+        compiled: dict[str, Any] = {}
+        for name, value in variables.items():
+            try:
+                folder.constants[name] = constant = folder.fold(value)
+            except _Dynamic:
+                folder.run_time_names.add(name)
+                compiled[name] = value
+                continue
+            compiled[name] = _plain(constant) if _literal(constant) else value
+        return compiled
+
+    def triggers(self, triggers: list[Any]) -> list[Any]:
+        kept = []
+        for trigger in triggers:
+            if isinstance(trigger, dict):
+                platform = trigger.get("platform", trigger.get("trigger"))
+                if platform in ("state", "numeric_state") and trigger.get("entity_id") in (
+                    None, "", [],
+                ):
+                    continue
+                if (switch := GATED_TRIGGERS.get(trigger.get("id"))) is not None and (
+                    self.folder.constants.get(switch, True) is False
+                ):
+                    continue
+            kept.append(trigger)
+        return kept
+
+    def sequence(self, steps: Any) -> list[Any]:
+        """Fold the conditions of a sequence and of everything nested in it."""
+        folded: list[Any] = []
+        for step in steps if isinstance(steps, list) else [steps]:
+            if not isinstance(step, dict):
+                folded.append(step)
+            elif "choose" in step:
+                folded.extend(self._choose(step))
+            elif "if" in step:
+                folded.extend(self._if(step))
+            elif "condition" in step:
+                verdict = self.folder.condition(step)
+                if verdict is True:
+                    continue
+                folded.append(step)
+                if verdict is False:
+                    # A failing condition ends the sequence - the rest is dead
+                    self.branches_removed += 1
+                    break
+            elif isinstance(step.get("repeat"), dict) and "sequence" in step["repeat"]:
+                folded.append(
+                    {**step, "repeat": {
+                        **step["repeat"], "sequence": self.sequence(step["repeat"]["sequence"])
+                    }}
+                )
+            elif isinstance(step.get("parallel"), list):
+                folded.append({**step, "parallel": [
+                    {**branch, "sequence": self.sequence(branch["sequence"])}
+                    if isinstance(branch, dict) and "sequence" in branch else branch
+                    for branch in step["parallel"]
+                ]})
+            else:
+                folded.append(step)
+        return folded
+
+    @staticmethod
+    def _spliceable(step: dict[str, Any], kind: str, sequence: list[Any]) -> bool:
+        """A branch can replace its step unless that would change variable scope."""
+        return set(step) <= _SPLICEABLE_KEYS[kind] and not any(
+            isinstance(inner, dict) and "variables" in inner for inner in sequence
+        )
+
+    def _choose(self, step: dict[str, Any]) -> list[Any]:
+        options = step["choose"] if isinstance(step["choose"], list) else [step["choose"]]
+        kept: list[dict[str, Any]] = []
+        default = step.get("default")
+        for index, option in enumerate(options):
+            verdict, conditions = self.folder.conditions(option.get("conditions", []))
+            if verdict is False:
+                self.branches_removed += 1
+                continue
+            kept.append({**option, "conditions": conditions,
+                         "sequence": self.sequence(option["sequence"])})
+            if verdict is True:
+                # Always taken: later options and the default can never run
+                self.branches_removed += len(options) - index - 1
+                self.branches_removed += default is not None
+                default = None
+                break
+        if default is not None:
+            default = self.sequence(default)
+
+        if not kept:
+            if default is not None and self._spliceable(step, "choose", default):
+                return default
+            if default is None:
+                return []
+            return [{**step, "choose": [], "default": default}]
+        if not kept[0]["conditions"] and self._spliceable(step, "choose", kept[0]["sequence"]):
+            return kept[0]["sequence"]
+        compiled = {**step, "choose": kept}
+        if default is None:
+            compiled.pop("default", None)
+        else:
+            compiled["default"] = default
+        return [compiled]
+
+    def _if(self, step: dict[str, Any]) -> list[Any]:
+        verdict, conditions = self.folder.conditions(step["if"])
+        then = self.sequence(step["then"])
+        otherwise = self.sequence(step["else"]) if "else" in step else None
+        if verdict is True and self._spliceable(step, "if", then):
+            self.branches_removed += otherwise is not None
+            return then
+        if verdict is False and self._spliceable(step, "if", otherwise or []):
+            self.branches_removed += 1
+            return otherwise or []
+        compiled = {**step, "if": conditions if verdict is None else step["if"], "then": then}
+        if otherwise is not None:
+            compiled["else"] = otherwise
+        return [compiled]
+
+
+def compile_automation(
+    blueprint_content: str,
+    automation_config: dict[str, Any],
+    hass: HomeAssistant | None = None,
+) -> CompiledAutomation:
+    """Compile a `use_blueprint` automation block into a plain automation.
+
+    Safe to run in the executor: hass is only used to parse rendered results
+    the way its templates do. Raises CompileError if the blueprint is not an
+    automation blueprint or an input without a default has no value.
+    """
+    try:
+        blueprint = parse_yaml(blueprint_content)
+    except Exception as err:  # noqa: BLE001 - HomeAssistantError / YAML errors
+        raise CompileError(f"blueprint does not parse: {err}") from err
+    if not isinstance(blueprint, dict) or not isinstance(blueprint.get("blueprint"), dict):
+        raise CompileError("not a blueprint")
+
+    compiler = _Compiler(blueprint, automation_config["use_blueprint"].get("input", {}), hass)
+    body = compiler.body
+    trigger_key = next((key for key in TRIGGER_KEYS if key in body), None)
+    condition_key = next((key for key in CONDITION_KEYS if key in body), None)
+    action_key = next((key for key in ACTION_KEYS if key in body), None)
+    if trigger_key is None or action_key is None:
+        raise CompileError("blueprint has no triggers or no actions")
+
+    variables = compiler.variables(body.get("variables") or {})
+    # Run-time `variables:` actions may shadow a constant after the fact
+    compiler.folder.run_time_names.update(_assigned_names(body[action_key]))
+    triggers = body[trigger_key] if isinstance(body[trigger_key], list) else [body[trigger_key]]
+    triggers_kept = compiler.triggers(triggers)
+    conditions: list[Any] | None = None
+    if condition_key is not None:
+        verdict, conditions = compiler.folder.conditions(body[condition_key])
+        if verdict is False:
+            # Never passes - keep it as written rather than hide that
+            conditions = body[condition_key]
+    actions = compiler.sequence(body[action_key])
+
+    # Drop the variables nothing reads: walk them in reverse render order, a
+    # variable can only read the ones before it
+    needed: set[str] = set()
+    for part in (triggers_kept, conditions, actions, body.get("trigger_variables")):
+        for source in _template_strings(part):
+            needed |= compiler.folder.names(source)
+    kept_variables: dict[str, Any] = {}
+    for name in reversed(variables):
+        if name in needed or "*" in needed:
+            kept_variables[name] = variables[name]
+            for source in _template_strings(variables[name]):
+                needed |= compiler.folder.names(source)
+    kept_variables = dict(reversed(kept_variables.items()))
+
+    config: dict[str, Any] = {
+        "id": automation_config["id"],
+        "alias": automation_config["alias"],
+        "description": (
+            "Compiled by the Universal Smart Lighting Setup Wizard from "
+            f"{automation_config['use_blueprint']['path']} - regenerated when the "
+            "blueprint changes, so edit the room in the wizard rather than here"
+        ),
+    }
+    for key, value in body.items():
+        if key == "variables":
+            if kept_variables:
+                config[key] = kept_variables
+        elif key == trigger_key:
+            config[key] = triggers_kept
+        elif key == condition_key:
+            if conditions:
+                config[key] = conditions
+        elif key == action_key:
+            config[key] = actions
+        else:
+            config[key] = value
+
+    result = CompiledAutomation(
+        config=_plain(config),
+        blueprint_hash=blueprint_hash(blueprint_content),
+        variables=len(variables),
+        variables_rendered=sum(
+            1 for value in kept_variables.values() if any(_template_strings(value))
+        ),
+        triggers_removed=len(triggers) - len(triggers_kept),
+        branches_removed=compiler.branches_removed,
+    )
+    _LOGGER.debug("Compiled %s: %s", automation_config["id"], result.summary())
+    return result
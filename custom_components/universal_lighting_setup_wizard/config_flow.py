@@ -6,7 +6,8 @@ v2.0.0 (2026-07) - full rewrite after audit:
   would have destroyed comments and emitted the packages directive as a quoted
   string). Packages detection/insertion is now text-based and surgical.
 - automations.yaml is APPEND-ONLY: existing content (comments, formatting) is
-  preserved byte-for-byte; only the new automation block is added.
+  preserved byte-for-byte; only the new automation block is added. (The one
+  exception is a compiled room's own block, see below.)
 - All file writes are atomic (temp + os.replace) with a .wizard-backup copy,
   and all file I/O runs in the executor (no event-loop blocking).
 - The blueprint's existence is verified before anything is written, and the
@@ -21,9 +22,43 @@ v2.0.0 (2026-07) - full rewrite after audit:
 - Failed runs are safely retryable: existing orphaned helpers are reused, the
   automation append is the last write, and every step aborts with a specific
   reason.
+
+Bulk import: many rooms (from a YAML/CSV file or an area selection) are
+validated up front against the same step schemas, then written as one batch -
+all package files, one automations.yaml append - followed by exactly one
+reload per helper domain and one automation reload. Each room still gets its
+own config entry, created through an `import` flow.
+
+House: one optional house-wide entry holds the outdoor-lux daytime source
+(binary_sensor "Outdoor Daytime"). Blueprint rooms created afterwards get it
+as their `house_daytime_sensor` input; native rooms read it directly.
+Likewise blueprint rooms that block daytime auto-on while away get their own
+"Someone Home" sensor (presence.py) as `someone_home_sensor`.
+
+Suggestions: the room's area (chosen, or the area named like the room) picks
+its lights when none are given and pre-fills the sensor steps, from the
+shared area-keyed entity index (discovery.py) - so are bulk rooms that name
+an `area`.
+
+Compiled rooms: a blueprint room with `compile_automation` gets a plain
+automation specialised to its settings (compiler.py) instead of a
+use_blueprint reference. The entry keeps the hash of the blueprint it was
+compiled from; when the blueprint file changes, the rooms set up with a
+stale hash are recompiled together (CompiledAutomationRefresher): their
+blocks are replaced in one automations.yaml write, then one reload.
+
+Options: an existing room is reconfigured through the same steps, pre-filled
+with its settings (name, engine and helper backend stay fixed). A blueprint
+room's block is replaced in place like a recompile, then one automation
+reload restarts only that room's automation - the others are unchanged and
+Home Assistant keeps them running.
 """
 from __future__ import annotations
 
+import asyncio
+import csv
+from datetime import datetime
+import io
 import logging
 import os
 import re
@@ -34,14 +69,62 @@ import voluptuous as vol
 import yaml
 
 from homeassistant import config_entries
-from homeassistant.helpers import selector
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import CALLBACK_TYPE, CoreState, Event, HomeAssistant, callback
+from homeassistant.helpers import (
+    area_registry as ar,
+    entity_registry as er,
+    selector,
+)
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_call_later
+
+from .compiler import CompileError, blueprint_hash, compile_automation
+from .const import (
+    COMPILED_BLUEPRINT_HASH,
+    CONF_BRIGHTNESS_DELTA,
+    CONF_COALESCE_WINDOW,
+    CONF_COMPILE_AUTOMATION,
+    CONF_ENGINE,
+    CONF_ENTRY_TYPE,
+    CONF_HELPER_BACKEND,
+    CONF_KELVIN_DELTA,
+    CONF_RECORDER_EXCLUDE,
+    DATA_AUTOMATIONS_LOCK,
+    DAYTIME_SENSOR_UNIQUE_ID,
+    DEFAULT_BRIGHTNESS_DELTA_PCT,
+    DEFAULT_COALESCE_WINDOW_MS,
+    DEFAULT_KELVIN_DELTA,
+    DOMAIN,
+    ENGINE_BLUEPRINT,
+    ENGINE_NATIVE,
+    ENTRY_TYPE_HOUSE,
+    HELPER_BACKEND_STORAGE,
+    HELPER_BACKEND_YAML,
+    HOUSE_UNIQUE_ID,
+)
+from .daytime import (
+    DAYTIME_SOURCE_LUX,
+    DAYTIME_SOURCE_LUX_WITH_SUN,
+    MIN_BAND_LUX,
+)
+from .discovery import EntityIndex, async_area_for_room, async_get_entity_index
+from .helper_storage import async_create_helpers
+from .illuminance import (
+    DEFAULT_WINDOW,
+    MAX_WINDOW,
+    MIN_WINDOW,
+    filtered_illuminance_entity_id,
+)
+from .presence import someone_home_entity_id
+from .run_observer import EVENT_DECISION
 
 _LOGGER = logging.getLogger(__name__)
 
-DOMAIN = "universal_lighting_setup_wizard"
-
 BLUEPRINT_PATH = "Chris971991/Universal-Smart-Light-Automation.yaml"
+# Seconds without another compiled room being set up before the stale ones
+# are recompiled together (see CompiledAutomationRefresher)
+COMPILED_REFRESH_DELAY = 2
 
 # Helper definitions for Universal Smart Lighting.
 # NOTE: deliberately no `initial:` values - input_boolean/input_text `initial`
@@ -58,15 +141,20 @@ HELPER_DEFINITIONS = {
         "name": "{room} Manual Override",
         "icon": "mdi:hand-back-right",
     },
+    # "high_churn": written on (almost) every decision - kept out of the
+    # recorder unless the user opts out (the Lighting Summary sensor keeps
+    # the long-term picture instead)
     "light_auto_on": {
         "domain": "input_boolean",
         "name": "{room} Light Auto On",
         "icon": "mdi:lightbulb-auto",
+        "high_churn": True,
     },
     "occupancy_state": {
         "domain": "input_boolean",
         "name": "{room} Occupancy State",
         "icon": "mdi:account-check",
+        "high_churn": True,
     },
     "last_automation_action": {
         "domain": "input_datetime",
@@ -74,12 +162,14 @@ HELPER_DEFINITIONS = {
         "icon": "mdi:clock-outline",
         "has_date": True,
         "has_time": True,
+        "high_churn": True,
     },
     "illuminance_history": {
         "domain": "input_text",
         "name": "{room} Illuminance History",
         "icon": "mdi:brightness-6",
         "max_length": 255,
+        "high_churn": True,
     },
     # v2.1.0: hysteresis latch for blueprint v3.13.0's outdoor lux thresholds.
     # Maintained by the blueprint itself; harmless (unused) when no outdoor
@@ -91,6 +181,226 @@ HELPER_DEFINITIONS = {
     },
 }
 
+HELPER_DOMAINS = ("input_boolean", "input_datetime", "input_text")
+
+PRESENCE_DEVICE_CLASSES = ["motion", "occupancy", "presence"]
+
+ENGINE_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=[
+            {"label": "Blueprint Automation - Classic YAML automation", "value": ENGINE_BLUEPRINT},
+            {"label": "Native Engine - Event-driven, no polling", "value": ENGINE_NATIVE},
+        ],
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    ),
+)
+
+HELPER_BACKEND_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=[
+            {"label": "YAML Package - Reloads all helpers of each type", "value": HELPER_BACKEND_YAML},
+            {"label": "UI Helpers - Adds only this room's helpers, no reload", "value": HELPER_BACKEND_STORAGE},
+        ],
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    ),
+)
+
+# ---------------------------------------------------------------------------
+# Step schemas (module level so bulk import validates with the exact same rules)
+# ---------------------------------------------------------------------------
+
+STEP_ROOM_SCHEMA = vol.Schema({
+    vol.Required("room_name"): cv.string,
+    vol.Optional("area"): selector.AreaSelector(),
+    vol.Required("control_mode", default="switch_only"): selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[
+                {"label": "Smart Switch + Smart Lights", "value": "switch_and_lights"},
+                {"label": "Smart Lights Only", "value": "lights_only"},
+                {"label": "Smart Switch Only", "value": "switch_only"},
+            ],
+            mode=selector.SelectSelectorMode.DROPDOWN,
+        ),
+    ),
+    vol.Optional("light_switch"): selector.EntitySelector(
+        selector.EntitySelectorConfig(domain=["switch", "light"]),
+    ),
+    vol.Optional("light_entities"): selector.EntitySelector(
+        selector.EntitySelectorConfig(domain="light", multiple=True),
+    ),
+})
+
+STEP_PRESENCE_SCHEMA = vol.Schema({
+    vol.Required("presence_pir_sensor"): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain="binary_sensor",
+            device_class=PRESENCE_DEVICE_CLASSES,
+        ),
+    ),
+    vol.Optional("presence_mmwave_sensor"): selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain="binary_sensor",
+            device_class=PRESENCE_DEVICE_CLASSES,
+        ),
+    ),
+    vol.Optional("sensor_off_latency_entity"): selector.EntitySelector(
+        selector.EntitySelectorConfig(domain="number"),
+    ),
+    vol.Required("fixed_latency_seconds", default=60): vol.All(
+        vol.Coerce(int), vol.Range(min=10, max=300)
+    ),
+    vol.Required("vacancy_timeout_multiplier", default=5): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=30)
+    ),
+})
+
+STEP_LIGHT_LEVELS_SCHEMA = vol.Schema({
+    vol.Required("illuminance_sensor"): selector.EntitySelector(
+        selector.EntitySelectorConfig(domain=["sensor", "input_number"]),
+    ),
+    vol.Required("dark_threshold", default=30): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=499)
+    ),
+    vol.Required("bright_threshold", default=200): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=500)
+    ),
+    vol.Required("extremely_dark_threshold", default=3): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=20)
+    ),
+    vol.Required("enable_illuminance_averaging", default=True): cv.boolean,
+    vol.Required("illuminance_window", default=DEFAULT_WINDOW): vol.All(
+        vol.Coerce(int), vol.Range(min=MIN_WINDOW, max=MAX_WINDOW)
+    ),
+})
+
+STEP_MANUAL_OVERRIDE_SCHEMA = vol.Schema({
+    vol.Required("override_behavior", default="timeout_only"): selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[
+                {"label": "Timeout Only - Full manual control", "value": "timeout_only"},
+                {"label": "Vacancy Can Clear - Smarter but less control", "value": "vacancy_clear"},
+            ],
+            mode=selector.SelectSelectorMode.DROPDOWN,
+        ),
+    ),
+    vol.Required("override_timeout_hours", default=3): vol.All(
+        vol.Coerce(float), vol.Range(min=1, max=24)
+    ),
+    vol.Required("override_respect_presence", default=True): cv.boolean,
+    vol.Required("vacancy_clear_minutes", default=45): vol.All(
+        vol.Coerce(int), vol.Range(min=10, max=120)
+    ),
+})
+
+STEP_OPTIONAL_FEATURES_SCHEMA = vol.Schema({
+    vol.Required("enable_daytime_control", default=False): cv.boolean,
+    vol.Optional("daytime_control_mode", default="always_allow"): selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[
+                {"label": "Always Allow - Normal operation", "value": "always_allow"},
+                {"label": "Block When Away - Save energy when gone", "value": "block_when_away"},
+                {"label": "Always Block - No daytime auto-on", "value": "always_block"},
+            ],
+            mode=selector.SelectSelectorMode.DROPDOWN,
+        ),
+    ),
+    vol.Optional("presence_trackers"): selector.EntitySelector(
+        selector.EntitySelectorConfig(domain="device_tracker", multiple=True),
+    ),
+    vol.Required("enable_bed_sensor", default=False): cv.boolean,
+    vol.Optional("bed_occupied_helper"): selector.EntitySelector(
+        selector.EntitySelectorConfig(domain=["binary_sensor", "input_boolean"]),
+    ),
+    vol.Required("turn_off_when_bed_occupied", default=True): cv.boolean,
+    vol.Required("bed_exit_delay_seconds", default=15): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=120)
+    ),
+    vol.Required("bed_entry_delay_seconds", default=15): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=120)
+    ),
+    vol.Required("enable_guest_mode", default=False): cv.boolean,
+    vol.Required("enable_debug_logs", default=False): cv.boolean,
+    vol.Required("enable_update_check", default=True): cv.boolean,
+    vol.Required(CONF_ENGINE, default=ENGINE_BLUEPRINT): ENGINE_SELECTOR,
+    vol.Required(CONF_COMPILE_AUTOMATION, default=False): cv.boolean,
+    vol.Required(CONF_COALESCE_WINDOW, default=DEFAULT_COALESCE_WINDOW_MS): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=500)
+    ),
+    vol.Required(CONF_BRIGHTNESS_DELTA, default=DEFAULT_BRIGHTNESS_DELTA_PCT): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=20)
+    ),
+    vol.Required(CONF_KELVIN_DELTA, default=DEFAULT_KELVIN_DELTA): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=1000)
+    ),
+    vol.Required(CONF_HELPER_BACKEND, default=HELPER_BACKEND_YAML): HELPER_BACKEND_SELECTOR,
+    vol.Required(CONF_RECORDER_EXCLUDE, default=True): cv.boolean,
+})
+
+STEP_HOUSE_SCHEMA = vol.Schema({
+    vol.Required("outdoor_lux_sensor"): selector.EntitySelector(
+        selector.EntitySelectorConfig(domain="sensor", device_class="illuminance"),
+    ),
+    vol.Required("daytime_source", default=DAYTIME_SOURCE_LUX_WITH_SUN): selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[
+                {"label": "Outdoor Lux with Sunrise/Sunset fallback", "value": DAYTIME_SOURCE_LUX_WITH_SUN},
+                {"label": "Outdoor Lux only (hold last state if sensor dies)", "value": DAYTIME_SOURCE_LUX},
+            ],
+            mode=selector.SelectSelectorMode.DROPDOWN,
+        ),
+    ),
+    vol.Required("outdoor_dark_below_lux", default=3000): vol.All(
+        vol.Coerce(int), vol.Range(min=100, max=20000)
+    ),
+    vol.Required("outdoor_bright_above_lux", default=4500): vol.All(
+        vol.Coerce(int), vol.Range(min=200, max=30000)
+    ),
+})
+
+STEP_ADAPTIVE_LIGHTING_SCHEMA = vol.Schema({
+    vol.Required("enable_adaptive_brightness", default=True): cv.boolean,
+    vol.Required("enable_color_temperature", default=True): cv.boolean,
+    vol.Required("day_color_temp", default=5000): vol.All(
+        vol.Coerce(int), vol.Range(min=2700, max=6500)
+    ),
+    vol.Required("night_color_temp", default=3000): vol.All(
+        vol.Coerce(int), vol.Range(min=2700, max=6500)
+    ),
+    vol.Required("enable_fade_on", default=True): cv.boolean,
+    vol.Required("fade_on_time", default=1.5): vol.All(
+        vol.Coerce(float), vol.Range(min=0.5, max=10)
+    ),
+    vol.Required("enable_fade_off", default=True): cv.boolean,
+    vol.Required("fade_off_time", default=2.0): vol.All(
+        vol.Coerce(float), vol.Range(min=0.5, max=10)
+    ),
+    vol.Required("guest_vacancy_multiplier", default=2.5): vol.All(
+        vol.Coerce(float), vol.Range(min=1.5, max=5.0)
+    ),
+    vol.Required("guest_override_multiplier", default=2.0): vol.All(
+        vol.Coerce(float), vol.Range(min=1.5, max=5.0)
+    ),
+    vol.Required("guest_ignore_bed", default=True): cv.boolean,
+})
+
+# Every wizard step at once: one room definition in a bulk-import file.
+# Unknown keys are rejected so typos don't silently fall back to defaults.
+ROOM_SCHEMA = vol.Schema({
+    key: validator
+    for step_schema in (
+        STEP_ROOM_SCHEMA,
+        STEP_PRESENCE_SCHEMA,
+        STEP_LIGHT_LEVELS_SCHEMA,
+        STEP_MANUAL_OVERRIDE_SCHEMA,
+        STEP_OPTIONAL_FEATURES_SCHEMA,
+        STEP_ADAPTIVE_LIGHTING_SCHEMA,
+    )
+    for key, validator in step_schema.schema.items()
+})
+
+# Multi-entity fields; files may give them as "a, b" / "a;b" strings
+ROOM_LIST_KEYS = ("light_entities", "presence_trackers")
+
 
 def sanitize_room_name(room_name: str) -> str:
     """Convert room name to valid entity ID format (matches the blueprint)."""
@@ -101,6 +411,204 @@ def sanitize_room_name(room_name: str) -> str:
     return sanitized
 
 
+# ---------------------------------------------------------------------------
+# Cross-field validation - each returns (field, error key) or None
+# ---------------------------------------------------------------------------
+
+def _room_error(data: dict[str, Any]) -> tuple[str, str] | None:
+    """Room name and control mode vs. the entities given."""
+    sanitized_name = sanitize_room_name(data["room_name"])
+    control_mode = data.get("control_mode", "switch_only")
+    light_switch = data.get("light_switch")
+    light_entities = data.get("light_entities")
+
+    if not sanitized_name:
+        return "room_name", "invalid_room_name"
+    if len(sanitized_name) < 2:
+        return "room_name", "room_name_too_short"
+    if control_mode == "switch_only" and not light_switch:
+        return "light_switch", "switch_required"
+    if control_mode == "lights_only" and not light_entities:
+        return "light_entities", "lights_required"
+    if control_mode == "switch_and_lights" and not light_switch and not light_entities:
+        return "base", "entities_required"
+    return None
+
+
+def _light_levels_error(data: dict[str, Any]) -> tuple[str, str] | None:
+    """Threshold ordering: extremely dark < dark < bright - 10."""
+    dark = data.get("dark_threshold", 30)
+    bright = data.get("bright_threshold", 200)
+    extremely_dark = data.get("extremely_dark_threshold", 3)
+
+    if bright - dark < 10:
+        return "bright_threshold", "bright_must_exceed_dark"
+    if extremely_dark >= dark:
+        return "extremely_dark_threshold", "extreme_must_be_below_dark"
+    return None
+
+
+def _optional_features_error(data: dict[str, Any]) -> tuple[str, str] | None:
+    """Bed sensor and block-when-away need their entities."""
+    if data.get("enable_bed_sensor") and not data.get("bed_occupied_helper"):
+        return "bed_occupied_helper", "bed_helper_required"
+    if (
+        data.get("enable_daytime_control")
+        and data.get("daytime_control_mode") == "block_when_away"
+        and not data.get("presence_trackers")
+    ):
+        return "presence_trackers", "trackers_required"
+    return None
+
+
+def _house_error(data: dict[str, Any]) -> tuple[str, str] | None:
+    """The outdoor hysteresis band must be at least MIN_BAND_LUX wide."""
+    if data["outdoor_bright_above_lux"] - data["outdoor_dark_below_lux"] < MIN_BAND_LUX:
+        return "outdoor_bright_above_lux", "outdoor_bright_must_exceed_dark"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Pure builders (one room's package / automation content)
+# ---------------------------------------------------------------------------
+
+def _helpers_config(room_name: str, sanitized_name: str) -> dict[str, dict]:
+    """Package-file content (domain -> object_id -> config) for one room."""
+    helpers_config: dict[str, dict] = {}
+    for helper_key, helper_def in HELPER_DEFINITIONS.items():
+        domain = helper_def["domain"]
+        object_id = f"{sanitized_name}_{helper_key}"
+        helpers_config.setdefault(domain, {})
+
+        helper_config: dict[str, Any] = {"name": helper_def["name"].format(room=room_name)}
+        if helper_def.get("icon"):
+            helper_config["icon"] = helper_def["icon"]
+        if domain == "input_datetime":
+            helper_config["has_date"] = helper_def.get("has_date", True)
+            helper_config["has_time"] = helper_def.get("has_time", True)
+        elif domain == "input_text":
+            helper_config["max"] = helper_def.get("max_length", 255)
+
+        helpers_config[domain][object_id] = helper_config
+    return helpers_config
+
+
+def _recorder_config(data: dict[str, Any]) -> dict[str, dict]:
+    """Package-file content keeping the room's high-churn helpers out of the recorder.
+
+    Also excludes the blueprint's decision events (decision trace), which
+    the integration keeps in memory. Empty if the room opted out. Home
+    Assistant concatenates the entity and event type lists of every package
+    (and configuration.yaml's own `recorder: exclude:`).
+    """
+    if not data.get(CONF_RECORDER_EXCLUDE, True):
+        return {}
+    sanitized_name = data["sanitized_room_name"]
+    return {
+        "recorder": {
+            "exclude": {
+                "entities": [
+                    f"{helper_def['domain']}.{sanitized_name}_{helper_key}"
+                    for helper_key, helper_def in HELPER_DEFINITIONS.items()
+                    if helper_def.get("high_churn")
+                ],
+                "event_types": [EVENT_DECISION],
+            },
+        },
+    }
+
+
+def _automation_config(data: dict[str, Any],
+                       house_daytime_sensor: str | None = None) -> dict[str, Any]:
+    """The blueprint automation block for one room."""
+    sanitized_name = data["sanitized_room_name"]
+    room_name = data["room_name"]
+
+    inputs: dict[str, Any] = {
+        # The blueprint sanitizes internally; passing the original name
+        # keeps notifications and logs human-readable.
+        "room_name": room_name,
+        "control_mode": data.get("control_mode", "switch_only"),
+    }
+    if data.get("light_switch"):
+        inputs["light_switch"] = data["light_switch"]
+    if data.get("light_entities"):
+        inputs["light_entities"] = data["light_entities"]
+
+    inputs["presence_pir_sensor"] = data["presence_pir_sensor"]
+    if data.get("presence_mmwave_sensor"):
+        inputs["presence_mmwave_sensor"] = data["presence_mmwave_sensor"]
+    if data.get("sensor_off_latency_entity"):
+        inputs["sensor_off_latency_entity"] = data["sensor_off_latency_entity"]
+    inputs["fixed_latency_seconds"] = data.get("fixed_latency_seconds", 60)
+    inputs["vacancy_timeout_multiplier"] = data.get("vacancy_timeout_multiplier", 5)
+
+    inputs["illuminance_sensor"] = data["illuminance_sensor"]
+    inputs["dark_threshold"] = data.get("dark_threshold", 30)
+    inputs["bright_threshold"] = data.get("bright_threshold", 200)
+    inputs["extremely_dark_threshold"] = data.get("extremely_dark_threshold", 3)
+    inputs["enable_illuminance_averaging"] = data.get("enable_illuminance_averaging", True)
+    if inputs["enable_illuminance_averaging"]:
+        # The room's Filtered Illuminance sensor (sensor.py) keeps the
+        # averaging window, so the blueprint skips its history helper
+        inputs["filtered_illuminance_sensor"] = filtered_illuminance_entity_id(sanitized_name)
+
+    inputs["override_behavior"] = data.get("override_behavior", "timeout_only")
+    inputs["override_timeout_hours"] = data.get("override_timeout_hours", 3)
+    inputs["override_respect_presence"] = data.get("override_respect_presence", True)
+    inputs["vacancy_clear_minutes"] = data.get("vacancy_clear_minutes", 45)
+
+    if data.get("enable_daytime_control"):
+        inputs["daytime_control_mode"] = data.get("daytime_control_mode", "always_allow")
+        if data.get("presence_trackers"):
+            inputs["presence_trackers"] = data["presence_trackers"]
+            if inputs["daytime_control_mode"] == "block_when_away":
+                # The room's "Someone Home" sensor (presence.py), created
+                # when the entry is set up
+                inputs["someone_home_sensor"] = someone_home_entity_id(sanitized_name)
+    if house_daytime_sensor:
+        inputs["house_daytime_sensor"] = house_daytime_sensor
+
+    if data.get("enable_bed_sensor") and data.get("bed_occupied_helper"):
+        inputs["bed_occupied_helper"] = data["bed_occupied_helper"]
+        inputs["turn_off_when_bed_occupied"] = data.get("turn_off_when_bed_occupied", True)
+        inputs["bed_exit_delay_seconds"] = data.get("bed_exit_delay_seconds", 15)
+        inputs["bed_entry_delay_seconds"] = data.get("bed_entry_delay_seconds", 15)
+
+    inputs["enable_adaptive_brightness"] = data.get("enable_adaptive_brightness", True)
+    inputs["enable_color_temperature"] = data.get("enable_color_temperature", True)
+    inputs["day_color_temp"] = data.get("day_color_temp", 5000)
+    inputs["night_color_temp"] = data.get("night_color_temp", 3000)
+    inputs["enable_fade_on"] = data.get("enable_fade_on", True)
+    inputs["fade_on_time"] = data.get("fade_on_time", 1.5)
+    inputs["enable_fade_off"] = data.get("enable_fade_off", True)
+    inputs["fade_off_time"] = data.get("fade_off_time", 2.0)
+
+    if data.get("enable_guest_mode"):
+        inputs["enable_guest_mode"] = True
+        inputs["guest_vacancy_multiplier"] = data.get("guest_vacancy_multiplier", 2.5)
+        inputs["guest_override_multiplier"] = data.get("guest_override_multiplier", 2.0)
+        inputs["guest_ignore_bed"] = data.get("guest_ignore_bed", True)
+
+    inputs["enable_debug_logs"] = data.get("enable_debug_logs", False)
+    # Structured per-run records for the room's decision trace (decision_trace.py)
+    inputs["enable_decision_trace"] = True
+    inputs["enable_update_check"] = data.get("enable_update_check", True)
+    # The integration's health monitor watches the room's sensors (Sensor
+    # Health binary sensor + one repair issue), not the hourly notification
+    inputs["enable_sensor_watchdog"] = False
+
+    return {
+        "id": f"universal_lighting_{sanitized_name}",
+        "alias": f"Universal Smart Lighting - {room_name}",
+        "description": "Created by the Universal Smart Lighting Setup Wizard",
+        "use_blueprint": {
+            "path": BLUEPRINT_PATH,
+            "input": inputs,
+        },
+    }
+
+
 # ---------------------------------------------------------------------------
 # Synchronous file helpers (always called via hass.async_add_executor_job)
 # ---------------------------------------------------------------------------
@@ -181,28 +689,86 @@ def _add_packages_to_config(config_path: str) -> None:
     _LOGGER.info("Enabled packages in configuration.yaml (text-preserving edit)")
 
 
-def _write_package_file(packages_dir: str, package_path: str, helpers_config: dict) -> None:
-    """Write the (wizard-owned) helper package file."""
+def _write_package_files(packages_dir: str, package_files: dict[str, dict]) -> None:
+    """Write (wizard-owned) helper package files as one batch.
+
+    Every file is staged as a temp file before any is renamed into place, so
+    a failure part-way (disk full, permissions) leaves packages/ untouched.
+    """
     os.makedirs(packages_dir, exist_ok=True)
-    content = yaml.safe_dump(
-        helpers_config, default_flow_style=False, allow_unicode=True, sort_keys=False
-    )
-    _atomic_write(package_path, content, backup=False)
+    staged: list[tuple[str, str]] = []
+    try:
+        for package_path, helpers_config in package_files.items():
+            content = yaml.safe_dump(
+                helpers_config, default_flow_style=False, allow_unicode=True, sort_keys=False
+            )
+            tmp_path = package_path + ".wizard-tmp"
+            staged.append((tmp_path, package_path))
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+    except Exception:
+        for tmp_path, _ in staged:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+    for tmp_path, package_path in staged:
+        os.replace(tmp_path, package_path)
+
+
+# automations.yaml id index: path -> ((mtime_ns, size), ids). Installs with a
+# multi-MB automations.yaml used to pay a full read + multiline regex per
+# duplicate check; now the file is streamed once and every later check is a
+# stat() and a set lookup until something else touches the file.
+_AUTOMATION_ID_LINE = re.compile(r"^[-\s]*id\s*:\s*['\"]?(.*?)['\"]?\s*$")
+_automation_id_index: dict[str, tuple[tuple[int, int], frozenset[str]]] = {}
+
+
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _automation_ids(automations_path: str) -> frozenset[str]:
+    """All automation ids in automations.yaml (indexed, rebuilt when the file changes)."""
+    stamp = _file_stamp(automations_path)
+    if stamp is None:
+        _automation_id_index.pop(automations_path, None)
+        return frozenset()
+    cached = _automation_id_index.get(automations_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    ids = set()
+    with open(automations_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if "id" in line and (match := _AUTOMATION_ID_LINE.match(line)):
+                ids.add(match.group(1))
+    index = frozenset(ids)
+    _automation_id_index[automations_path] = (stamp, index)
+    return index
 
 
 def _automation_id_exists(automations_path: str, automation_id: str) -> bool:
-    """Check automations.yaml text for an existing automation id."""
-    text = _read_text(automations_path)
-    if text is None:
-        return False
-    pattern = rf"(?m)^[-\s]*id\s*:\s*['\"]?{re.escape(automation_id)}['\"]?\s*$"
-    return re.search(pattern, text) is not None
+    """Check automations.yaml for an existing automation id."""
+    return automation_id in _automation_ids(automations_path)
+
 
+def _append_automations(automations_path: str, automation_configs: list[dict]) -> None:
+    """Append automations to automations.yaml in ONE write, preserving existing content.
 
-def _append_automation(automations_path: str, automation_config: dict) -> None:
-    """Append ONE automation to automations.yaml, preserving existing content."""
+    An up-to-date id index is carried over to the new file instead of being
+    rebuilt by the next duplicate check.
+    """
+    stamp = _file_stamp(automations_path)
+    cached = _automation_id_index.get(automations_path)
     block = yaml.safe_dump(
-        [automation_config], default_flow_style=False, allow_unicode=True, sort_keys=False
+        automation_configs, default_flow_style=False, allow_unicode=True, sort_keys=False
     )
     existing = _read_text(automations_path)
     if existing is None or existing.strip() in ("", "[]"):
@@ -213,6 +779,226 @@ def _append_automation(automations_path: str, automation_config: dict) -> None:
         content = existing + block
     _atomic_write(automations_path, content)
 
+    if stamp is None:
+        known: frozenset[str] = frozenset()
+    elif cached is not None and cached[0] == stamp:
+        known = cached[1]
+    else:
+        return  # index was stale anyway - the next check rebuilds it
+    _automation_id_index[automations_path] = (
+        _file_stamp(automations_path),
+        known | {config["id"] for config in automation_configs},
+    )
+
+
+# The id key of a top-level automations.yaml item: first key ("- id: x") or
+# one of its keys ("  id: x")
+_ITEM_ID_LINE = re.compile(r"^(?:- |  )id\s*:\s*['\"]?(.*?)['\"]?\s*$")
+
+
+def _replace_automations(automations_path: str, automation_configs: list[dict]) -> set[str]:
+    """Replace the automations.yaml items with the configs' ids, in ONE atomic write.
+
+    Only those items' lines are rewritten - every other line, comments
+    included, is preserved byte-for-byte. Returns the ids that were found
+    and replaced (nothing is written if none was).
+    """
+    stamp = _file_stamp(automations_path)
+    cached = _automation_id_index.get(automations_path)
+    text = _read_text(automations_path)
+    if text is None:
+        return set()
+    by_id = {automation_config["id"]: automation_config for automation_config in automation_configs}
+    lines = text.splitlines(keepends=True)
+    starts = [index for index, line in enumerate(lines) if line.startswith("- ")]
+    parts: list[str] = []
+    replaced: set[str] = set()
+    kept_from = 0
+    for position, start in enumerate(starts):
+        end = starts[position + 1] if position + 1 < len(starts) else len(lines)
+        automation_id = next(
+            (match.group(1) for line in lines[start:end] if (match := _ITEM_ID_LINE.match(line))),
+            None,
+        )
+        if automation_id not in by_id or automation_id in replaced:
+            continue
+        # Blank lines and comments after the item belong to what follows it
+        while end > start + 1 and (not lines[end - 1].strip() or lines[end - 1].startswith("#")):
+            end -= 1
+        parts.append("".join(lines[kept_from:start]))
+        parts.append(yaml.safe_dump(
+            [by_id[automation_id]], default_flow_style=False, allow_unicode=True, sort_keys=False
+        ))
+        kept_from = end
+        replaced.add(automation_id)
+    if not replaced:
+        return replaced
+    parts.append("".join(lines[kept_from:]))
+    _atomic_write(automations_path, "".join(parts))
+    if cached is not None and cached[0] == stamp:
+        # Same ids as before - keep the index valid
+        _automation_id_index[automations_path] = (_file_stamp(automations_path), cached[1])
+    return replaced
+
+
+def _replace_automation(automations_path: str, automation_config: dict) -> bool:
+    """Replace the one item with the config's id; False (nothing written) if it is gone."""
+    return bool(_replace_automations(automations_path, [automation_config]))
+
+
+def _load_room_definitions(path: str) -> list[dict[str, Any]]:
+    """Parse a bulk-import file into raw (unvalidated) room definitions.
+
+    `.csv`: one room per row, header row = option keys, empty cells skipped.
+    Anything else is YAML: a list of room mappings, or a mapping with a
+    `rooms:` list.
+    """
+    text = _read_text(path)
+    if text is None:
+        raise FileNotFoundError(path)
+    if path.lower().endswith(".csv"):
+        return [
+            {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and isinstance(value, str) and value.strip()
+            }
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+    loaded = yaml.safe_load(text)
+    if isinstance(loaded, dict):
+        loaded = loaded.get("rooms")
+    if not isinstance(loaded, list) or not all(isinstance(room, dict) for room in loaded):
+        raise ValueError("expected a list of room mappings")
+    return loaded
+
+
+def _blueprint_file(hass: HomeAssistant) -> str:
+    return hass.config.path("blueprints", "automation", *BLUEPRINT_PATH.split("/"))
+
+
+def _automations_lock(hass: HomeAssistant) -> asyncio.Lock:
+    """The lock every read-modify-write of automations.yaml holds."""
+    return hass.data.setdefault(DATA_AUTOMATIONS_LOCK, asyncio.Lock())
+
+
+class CompiledAutomationRefresher:
+    """Recompiles the compiled rooms whose blueprint changed - all at once.
+
+    Every compiled room's setup queues its entry. Once Home Assistant has
+    started and no room was queued for COMPILED_REFRESH_DELAY seconds, the
+    blueprint is read and hashed once, every stale room is recompiled, their
+    blocks are replaced in ONE automations.yaml write and automations are
+    reloaded ONCE - however many rooms the blueprint update touched.
+    A room that fails to compile keeps its current automation.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize a refresher with nothing queued."""
+        self.hass = hass
+        self._pending: dict[str, None] = {}
+        self._unsub_started: CALLBACK_TYPE | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_schedule(self, entry: config_entries.ConfigEntry) -> None:
+        """Queue a compiled room for the next refresh."""
+        self._pending[entry.entry_id] = None
+        if self.hass.state is CoreState.running:
+            self._async_arm()
+        elif self._unsub_started is None:
+            self._unsub_started = self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STARTED, self._async_started
+            )
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop the queued rooms (they are checked again at the next setup)."""
+        for unsub in (self._unsub_started, self._unsub_timer):
+            if unsub is not None:
+                unsub()
+        self._unsub_started = self._unsub_timer = None
+        self._pending.clear()
+
+    @callback
+    def _async_started(self, _event: Event) -> None:
+        self._unsub_started = None
+        self._async_arm()
+
+    @callback
+    def _async_arm(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+        self._unsub_timer = async_call_later(
+            self.hass, COMPILED_REFRESH_DELAY, self._async_timer_fired
+        )
+
+    @callback
+    def _async_timer_fired(self, _now: datetime) -> None:
+        self._unsub_timer = None
+        self.hass.async_create_task(self._async_refresh())
+
+    async def _async_refresh(self) -> None:
+        hass = self.hass
+        entries = [
+            entry
+            for entry_id in self._pending
+            if (entry := hass.config_entries.async_get_entry(entry_id)) is not None
+            and entry.data.get(CONF_COMPILE_AUTOMATION)
+        ]
+        self._pending.clear()
+        if not entries:
+            return
+        content = await hass.async_add_executor_job(_read_text, _blueprint_file(hass))
+        if content is None:
+            _LOGGER.warning("Blueprint %s is missing - %s not recompiled", BLUEPRINT_PATH,
+                            ", ".join(entry.data["automation_id"] for entry in entries))
+            return
+        digest = blueprint_hash(content)
+        stale = [entry for entry in entries if entry.data.get(COMPILED_BLUEPRINT_HASH) != digest]
+        if not stale:
+            return
+
+        house_daytime_sensor = er.async_get(hass).async_get_entity_id(
+            "binary_sensor", DOMAIN, DAYTIME_SENSOR_UNIQUE_ID
+        )
+        compiled_rooms = []
+        for entry in stale:
+            try:
+                compiled = await hass.async_add_executor_job(
+                    compile_automation,
+                    content,
+                    _automation_config(dict(entry.data), house_daytime_sensor),
+                    hass,
+                )
+            except CompileError as err:
+                _LOGGER.error("Could not recompile %s for the changed blueprint: %s",
+                              entry.data["automation_id"], err)
+                continue
+            compiled_rooms.append((entry, compiled))
+        if not compiled_rooms:
+            return
+
+        async with _automations_lock(hass):
+            replaced = await hass.async_add_executor_job(
+                _replace_automations,
+                hass.config.path("automations.yaml"),
+                [compiled.config for _, compiled in compiled_rooms],
+            )
+        for entry, compiled in compiled_rooms:
+            automation_id = entry.data["automation_id"]
+            if automation_id not in replaced:
+                _LOGGER.warning("Automation %s is no longer in automations.yaml - not recompiled",
+                                automation_id)
+                continue
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, COMPILED_BLUEPRINT_HASH: compiled.blueprint_hash}
+            )
+            _LOGGER.info("Recompiled %s for the changed blueprint: %s",
+                         automation_id, compiled.summary())
+        if replaced and "automation" in hass.config.components:
+            await hass.services.async_call("automation", "reload", blocking=True)
+
 
 class UniversalLightingSetupWizardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Universal Lighting Setup Wizard."""
@@ -222,28 +1008,46 @@ class UniversalLightingSetupWizardConfigFlow(config_entries.ConfigFlow, domain=D
     def __init__(self) -> None:
         """Initialize the config flow."""
         self.config_data: dict[str, Any] = {}
+        self.bulk_rooms: list[dict[str, Any]] = []
+        # Entities guessed from the room's area, pre-filled into later steps
+        self.suggested: dict[str, Any] = {}
+        self._entity_index: EntityIndex | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> UniversalLightingOptionsFlow:
+        """Reconfigure an existing room (or the house) in place."""
+        return UniversalLightingOptionsFlow(config_entry)
+
+    @property
+    def entity_index(self) -> EntityIndex:
+        """The shared area-keyed entity index (see discovery.py)."""
+        if self._entity_index is None:
+            self._entity_index = async_get_entity_index(self.hass)
+        return self._entity_index
 
     async def async_step_user(self, user_input=None):
-        """Handle the initial step - Room Setup."""
+        """Handle the initial step - one room or a bulk import."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["room", "bulk_import", "house"]
+        )
+
+    async def async_step_room(self, user_input=None):
+        """Handle Room Setup."""
         errors = {}
 
         if user_input is not None:
-            room_name = user_input["room_name"]
-            sanitized_name = sanitize_room_name(room_name)
-            control_mode = user_input.get("control_mode", "switch_only")
-            light_switch = user_input.get("light_switch")
-            light_entities = user_input.get("light_entities")
-
-            if not sanitized_name:
-                errors["room_name"] = "invalid_room_name"
-            elif len(sanitized_name) < 2:
-                errors["room_name"] = "room_name_too_short"
-            elif control_mode == "switch_only" and not light_switch:
-                errors["light_switch"] = "switch_required"
-            elif control_mode == "lights_only" and not light_entities:
-                errors["light_entities"] = "lights_required"
-            elif control_mode == "switch_and_lights" and not light_switch and not light_entities:
-                errors["base"] = "entities_required"
+            sanitized_name = sanitize_room_name(user_input["room_name"])
+            area_id = async_area_for_room(
+                self.hass, user_input["room_name"], user_input.get("area")
+            )
+            self.suggested = self.entity_index.suggestions(area_id)
+            user_input = self._with_area_lights(user_input, area_id)
+
+            if (error := _room_error(user_input)) is not None:
+                errors[error[0]] = error[1]
             else:
                 # One config entry per room
                 await self.async_set_unique_id(f"universal_lighting_{sanitized_name}")
@@ -262,29 +1066,13 @@ class UniversalLightingSetupWizardConfigFlow(config_entries.ConfigFlow, domain=D
                 else:
                     self.config_data.update(user_input)
                     self.config_data["sanitized_room_name"] = sanitized_name
+                    if area_id is not None:
+                        self.config_data["area"] = area_id
                     return await self.async_step_presence_detection()
 
         return self.async_show_form(
-            step_id="user",
-            data_schema=vol.Schema({
-                vol.Required("room_name"): cv.string,
-                vol.Required("control_mode", default="switch_only"): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[
-                            {"label": "Smart Switch + Smart Lights", "value": "switch_and_lights"},
-                            {"label": "Smart Lights Only", "value": "lights_only"},
-                            {"label": "Smart Switch Only", "value": "switch_only"},
-                        ],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    ),
-                ),
-                vol.Optional("light_switch"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["switch", "light"]),
-                ),
-                vol.Optional("light_entities"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain="light", multiple=True),
-                ),
-            }),
+            step_id="room",
+            data_schema=STEP_ROOM_SCHEMA,
             errors=errors,
             description_placeholders={
                 "room_example": "Bedroom, Living Room, Home Office",
@@ -301,29 +1089,7 @@ class UniversalLightingSetupWizardConfigFlow(config_entries.ConfigFlow, domain=D
 
         return self.async_show_form(
             step_id="presence_detection",
-            data_schema=vol.Schema({
-                vol.Required("presence_pir_sensor"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="binary_sensor",
-                        device_class=["motion", "occupancy", "presence"],
-                    ),
-                ),
-                vol.Optional("presence_mmwave_sensor"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="binary_sensor",
-                        device_class=["motion", "occupancy", "presence"],
-                    ),
-                ),
-                vol.Optional("sensor_off_latency_entity"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain="number"),
-                ),
-                vol.Required("fixed_latency_seconds", default=60): vol.All(
-                    vol.Coerce(int), vol.Range(min=10, max=300)
-                ),
-                vol.Required("vacancy_timeout_multiplier", default=5): vol.All(
-                    vol.Coerce(int), vol.Range(min=1, max=30)
-                ),
-            }),
+            data_schema=self.add_suggested_values_to_schema(STEP_PRESENCE_SCHEMA, self.suggested),
             errors=errors,
         )
 
@@ -332,35 +1098,17 @@ class UniversalLightingSetupWizardConfigFlow(config_entries.ConfigFlow, domain=D
         errors = {}
 
         if user_input is not None:
-            dark = user_input.get("dark_threshold", 30)
-            bright = user_input.get("bright_threshold", 200)
-            extremely_dark = user_input.get("extremely_dark_threshold", 3)
-
-            if bright - dark < 10:
-                errors["bright_threshold"] = "bright_must_exceed_dark"
-            elif extremely_dark >= dark:
-                errors["extremely_dark_threshold"] = "extreme_must_be_below_dark"
+            if (error := _light_levels_error(user_input)) is not None:
+                errors[error[0]] = error[1]
             else:
                 self.config_data.update(user_input)
                 return await self.async_step_manual_override()
 
         return self.async_show_form(
             step_id="light_levels",
-            data_schema=vol.Schema({
-                vol.Required("illuminance_sensor"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["sensor", "input_number"]),
-                ),
-                vol.Required("dark_threshold", default=30): vol.All(
-                    vol.Coerce(int), vol.Range(min=0, max=499)
-                ),
-                vol.Required("bright_threshold", default=200): vol.All(
-                    vol.Coerce(int), vol.Range(min=1, max=500)
-                ),
-                vol.Required("extremely_dark_threshold", default=3): vol.All(
-                    vol.Coerce(float), vol.Range(min=0, max=20)
-                ),
-                vol.Required("enable_illuminance_averaging", default=True): cv.boolean,
-            }),
+            data_schema=self.add_suggested_values_to_schema(
+                STEP_LIGHT_LEVELS_SCHEMA, self.suggested
+            ),
             errors=errors,
         )
 
@@ -372,24 +1120,7 @@ class UniversalLightingSetupWizardConfigFlow(config_entries.ConfigFlow, domain=D
 
         return self.async_show_form(
             step_id="manual_override",
-            data_schema=vol.Schema({
-                vol.Required("override_behavior", default="timeout_only"): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[
-                            {"label": "Timeout Only - Full manual control", "value": "timeout_only"},
-                            {"label": "Vacancy Can Clear - Smarter but less control", "value": "vacancy_clear"},
-                        ],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    ),
-                ),
-                vol.Required("override_timeout_hours", default=3): vol.All(
-                    vol.Coerce(float), vol.Range(min=1, max=24)
-                ),
-                vol.Required("override_respect_presence", default=True): cv.boolean,
-                vol.Required("vacancy_clear_minutes", default=45): vol.All(
-                    vol.Coerce(int), vol.Range(min=10, max=120)
-                ),
-            }),
+            data_schema=STEP_MANUAL_OVERRIDE_SCHEMA,
         )
 
     async def async_step_optional_features(self, user_input=None):
@@ -397,50 +1128,17 @@ class UniversalLightingSetupWizardConfigFlow(config_entries.ConfigFlow, domain=D
         errors = {}
 
         if user_input is not None:
-            if user_input.get("enable_bed_sensor") and not user_input.get("bed_occupied_helper"):
-                errors["bed_occupied_helper"] = "bed_helper_required"
-            elif (
-                user_input.get("enable_daytime_control")
-                and user_input.get("daytime_control_mode") == "block_when_away"
-                and not user_input.get("presence_trackers")
-            ):
-                errors["presence_trackers"] = "trackers_required"
+            if (error := _optional_features_error(user_input)) is not None:
+                errors[error[0]] = error[1]
             else:
                 self.config_data.update(user_input)
                 return await self.async_step_adaptive_lighting()
 
         return self.async_show_form(
             step_id="optional_features",
-            data_schema=vol.Schema({
-                vol.Required("enable_daytime_control", default=False): cv.boolean,
-                vol.Optional("daytime_control_mode", default="always_allow"): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[
-                            {"label": "Always Allow - Normal operation", "value": "always_allow"},
-                            {"label": "Block When Away - Save energy when gone", "value": "block_when_away"},
-                            {"label": "Always Block - No daytime auto-on", "value": "always_block"},
-                        ],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    ),
-                ),
-                vol.Optional("presence_trackers"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain="device_tracker", multiple=True),
-                ),
-                vol.Required("enable_bed_sensor", default=False): cv.boolean,
-                vol.Optional("bed_occupied_helper"): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["binary_sensor", "input_boolean"]),
-                ),
-                vol.Required("turn_off_when_bed_occupied", default=True): cv.boolean,
-                vol.Required("bed_exit_delay_seconds", default=15): vol.All(
-                    vol.Coerce(int), vol.Range(min=0, max=120)
-                ),
-                vol.Required("bed_entry_delay_seconds", default=15): vol.All(
-                    vol.Coerce(int), vol.Range(min=0, max=120)
-                ),
-                vol.Required("enable_guest_mode", default=False): cv.boolean,
-                vol.Required("enable_debug_logs", default=False): cv.boolean,
-                vol.Required("enable_update_check", default=True): cv.boolean,
-            }),
+            data_schema=self.add_suggested_values_to_schema(
+                STEP_OPTIONAL_FEATURES_SCHEMA, self.suggested
+            ),
             errors=errors,
         )
 
@@ -452,31 +1150,267 @@ class UniversalLightingSetupWizardConfigFlow(config_entries.ConfigFlow, domain=D
 
         return self.async_show_form(
             step_id="adaptive_lighting",
+            data_schema=STEP_ADAPTIVE_LIGHTING_SCHEMA,
+        )
+
+    def _with_area_lights(self, room: dict[str, Any], area_id: str | None) -> dict[str, Any]:
+        """Fill the lights / switch the control mode needs from the area, if left empty."""
+        candidates = self.entity_index.candidates(area_id)
+        mode = room.get("control_mode", "switch_only")
+        room = dict(room)
+        if mode in ("switch_and_lights", "lights_only") and not room.get("light_entities"):
+            if candidates.lights:
+                room["light_entities"] = list(candidates.lights)
+        if mode in ("switch_and_lights", "switch_only") and not room.get("light_switch"):
+            if candidates.switches:
+                room["light_switch"] = candidates.switches[0]
+        return room
+
+    # ------------------------------------------------------------------
+    # House-wide settings
+    # ------------------------------------------------------------------
+
+    async def async_step_house(self, user_input=None):
+        """Set up the house-wide outdoor daytime sensor (one per install)."""
+        if await self.async_set_unique_id(HOUSE_UNIQUE_ID) is not None:
+            return self.async_abort(reason="house_already_configured")
+        errors = {}
+
+        if user_input is not None:
+            if (error := _house_error(user_input)) is not None:
+                errors[error[0]] = error[1]
+            else:
+                return self.async_create_entry(
+                    title="Universal Lighting - House",
+                    data={CONF_ENTRY_TYPE: ENTRY_TYPE_HOUSE, **user_input},
+                )
+
+        return self.async_show_form(
+            step_id="house",
+            data_schema=STEP_HOUSE_SCHEMA,
+            errors=errors,
+        )
+
+    # ------------------------------------------------------------------
+    # Bulk import
+    # ------------------------------------------------------------------
+
+    async def async_step_bulk_import(self, user_input=None):
+        """Collect room definitions from a file and/or an area selection."""
+        errors = {}
+        details = ""
+
+        if user_input is not None:
+            rooms: list[dict[str, Any]] = []
+            if rooms_file := user_input.get("rooms_file", "").strip():
+                path = self.hass.config.path(rooms_file)
+                config_dir = os.path.realpath(self.hass.config.config_dir)
+                if not os.path.realpath(path).startswith(config_dir + os.sep):
+                    errors["rooms_file"] = "bulk_file_not_found"
+                else:
+                    try:
+                        rooms += await self.hass.async_add_executor_job(
+                            _load_room_definitions, path
+                        )
+                    except FileNotFoundError:
+                        errors["rooms_file"] = "bulk_file_not_found"
+                    except (ValueError, yaml.YAMLError, csv.Error) as err:
+                        _LOGGER.error("Could not parse %s: %s", path, err)
+                        errors["rooms_file"] = "bulk_file_invalid"
+            rooms += self._rooms_from_areas(user_input.get("areas") or [])
+
+            if not errors and not rooms:
+                errors["base"] = "bulk_nothing_selected"
+            elif not errors:
+                problems = await self._validate_bulk_rooms(
+                    rooms,
+                    {
+                        CONF_ENGINE: user_input[CONF_ENGINE],
+                        CONF_COMPILE_AUTOMATION: user_input[CONF_COMPILE_AUTOMATION],
+                        CONF_HELPER_BACKEND: user_input[CONF_HELPER_BACKEND],
+                    },
+                )
+                if problems:
+                    errors["base"] = "bulk_rooms_invalid"
+                    details = "\n".join(f"- {problem}" for problem in problems)
+                else:
+                    return await self.async_step_bulk_confirm()
+
+        return self.async_show_form(
+            step_id="bulk_import",
             data_schema=vol.Schema({
-                vol.Required("enable_adaptive_brightness", default=True): cv.boolean,
-                vol.Required("enable_color_temperature", default=True): cv.boolean,
-                vol.Required("day_color_temp", default=5000): vol.All(
-                    vol.Coerce(int), vol.Range(min=2700, max=6500)
-                ),
-                vol.Required("night_color_temp", default=3000): vol.All(
-                    vol.Coerce(int), vol.Range(min=2700, max=6500)
-                ),
-                vol.Required("enable_fade_on", default=True): cv.boolean,
-                vol.Required("fade_on_time", default=1.5): vol.All(
-                    vol.Coerce(float), vol.Range(min=0.5, max=10)
-                ),
-                vol.Required("enable_fade_off", default=True): cv.boolean,
-                vol.Required("fade_off_time", default=2.0): vol.All(
-                    vol.Coerce(float), vol.Range(min=0.5, max=10)
+                vol.Optional("rooms_file"): selector.TextSelector(),
+                vol.Optional("areas"): selector.AreaSelector(
+                    selector.AreaSelectorConfig(multiple=True),
                 ),
-                vol.Required("guest_vacancy_multiplier", default=2.5): vol.All(
-                    vol.Coerce(float), vol.Range(min=1.5, max=5.0)
+                vol.Required(CONF_ENGINE, default=ENGINE_BLUEPRINT): ENGINE_SELECTOR,
+                vol.Required(CONF_COMPILE_AUTOMATION, default=False): cv.boolean,
+                vol.Required(
+                    CONF_HELPER_BACKEND, default=HELPER_BACKEND_YAML
+                ): HELPER_BACKEND_SELECTOR,
+            }),
+            errors=errors,
+            description_placeholders={"details": details},
+        )
+
+    async def async_step_bulk_confirm(self, user_input=None):
+        """Show what will be created, then write everything in one batch."""
+        if user_input is not None:
+            return await self._create_bulk_setup()
+
+        return self.async_show_form(
+            step_id="bulk_confirm",
+            data_schema=vol.Schema({}),
+            description_placeholders={
+                "count": str(len(self.bulk_rooms)),
+                "rooms": "\n".join(
+                    f"- {room['room_name']} ({room[CONF_ENGINE]})" for room in self.bulk_rooms
                 ),
-                vol.Required("guest_override_multiplier", default=2.0): vol.All(
-                    vol.Coerce(float), vol.Range(min=1.5, max=5.0)
+            },
+        )
+
+    def _rooms_from_areas(self, area_ids: list[str]) -> list[dict[str, Any]]:
+        """One room per area; validation fills in the area's entities."""
+        area_reg = ar.async_get(self.hass)
+        return [
+            {
+                "room_name": area.name if (area := area_reg.async_get_area(area_id)) else area_id,
+                "area": area_id,
+            }
+            for area_id in area_ids
+        ]
+
+    async def _validate_bulk_rooms(
+        self, rooms: list[dict[str, Any]], defaults: dict[str, Any]
+    ) -> list[str]:
+        """Validate every room before anything is written; fills self.bulk_rooms.
+
+        `defaults` (engine, compile, helper backend) apply to rooms that
+        don't set them; compiling only ever applies to blueprint rooms.
+        Returns one human-readable problem per bad room (empty when all
+        pass).
+        """
+        configured = {entry.unique_id for entry in self._async_current_entries()}
+        automation_ids = await self.hass.async_add_executor_job(
+            _automation_ids, self.hass.config.path("automations.yaml")
+        )
+        validated: list[dict[str, Any]] = []
+        problems: list[str] = []
+        seen: set[str] = set()
+
+        for index, raw in enumerate(rooms, 1):
+            label = str(raw.get("room_name") or f"Room #{index}")
+            room = {**defaults, **raw}
+            if area_id := room.get("area"):
+                # Whatever the room leaves out comes from its area: lights
+                # (or a switch), motion / occupancy and illuminance sensors.
+                # Not the bed sensor - bulk rooms don't enable the bed feature.
+                suggested = self.entity_index.suggestions(area_id)
+                suggested.pop("bed_occupied_helper", None)
+                room = {**suggested, **room}
+            for key in ROOM_LIST_KEYS:
+                if isinstance(room.get(key), str):
+                    room[key] = [e for e in re.split(r"[,;\s]+", room[key]) if e]
+            try:
+                room = ROOM_SCHEMA(room)
+            except vol.Invalid as err:
+                problems.append(f"{label}: {err}")
+                continue
+            if room[CONF_ENGINE] != ENGINE_BLUEPRINT:
+                room[CONF_COMPILE_AUTOMATION] = False
+
+            error = (
+                _room_error(room) or _light_levels_error(room) or _optional_features_error(room)
+            )
+            sanitized_name = sanitize_room_name(room["room_name"])
+            if error is not None:
+                problems.append(f"{label}: {error[1]} ({error[0]})")
+            elif sanitized_name in seen:
+                problems.append(f"{label}: appears more than once")
+            elif f"universal_lighting_{sanitized_name}" in configured:
+                problems.append(f"{label}: already set up by the wizard")
+            elif f"universal_lighting_{sanitized_name}" in automation_ids:
+                problems.append(f"{label}: automation_exists")
+            else:
+                room["sanitized_room_name"] = sanitized_name
+                validated.append(room)
+            seen.add(sanitized_name)
+
+        self.bulk_rooms = validated
+        return problems
+
+    async def _create_bulk_setup(self):
+        """Create helpers and automations for every bulk room in one batch.
+
+        Same safest-first order as _create_setup, but each step covers all
+        rooms: one package-file batch and one reload per helper domain (YAML
+        backend rooms), one automations.yaml write, one automation reload.
+        The config entries are then created through import flows (a flow
+        can only create one).
+        """
+        rooms = self.bulk_rooms
+        blueprint_rooms = [room for room in rooms if room[CONF_ENGINE] != ENGINE_NATIVE]
+
+        if blueprint_rooms and not await self._blueprint_exists():
+            return self.async_abort(reason="blueprint_missing")
+
+        if (reason := await self._setup_helpers(rooms)) is not None:
+            return self.async_abort(reason=reason)
+
+        if blueprint_rooms:
+            try:
+                await self._create_automations(blueprint_rooms)
+            except Exception:
+                _LOGGER.exception("Failed to append the automations to automations.yaml")
+                return self.async_abort(reason="automation_failed")
+            try:
+                await self.hass.services.async_call("automation", "reload", blocking=True)
+            except Exception:
+                _LOGGER.exception("Automation reload failed (automations were written)")
+
+        # One summary notification instead of one per room
+        for room in rooms:
+            room["setup_notified"] = True
+            await self.hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": config_entries.SOURCE_IMPORT}, data=room
+            )
+
+        await self.hass.services.async_call(
+            "persistent_notification",
+            "create",
+            {
+                "title": f"🎉 Lighting Setup Complete - {len(rooms)} rooms",
+                "message": "\n".join(
+                    f"- **{room['room_name']}** - "
+                    + (
+                        "native engine"
+                        if room[CONF_ENGINE] == ENGINE_NATIVE
+                        else f"automation `{room['automation_id']}`"
+                    )
+                    + (
+                        ", helpers in Settings → Helpers"
+                        if room[CONF_HELPER_BACKEND] == HELPER_BACKEND_STORAGE
+                        else f", helpers in `/config/packages/lighting_{room['sanitized_room_name']}.yaml`"
+                    )
+                    for room in rooms
                 ),
-                vol.Required("guest_ignore_bed", default=True): cv.boolean,
-            }),
+                "notification_id": "lighting_wizard_bulk_import",
+            },
+        )
+        _LOGGER.info("Bulk import completed for %d rooms", len(rooms))
+        return self.async_abort(
+            reason="bulk_import_complete", description_placeholders={"count": str(len(rooms))}
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]):
+        """Create the entry for one bulk-imported room (files already written)."""
+        await self.async_set_unique_id(
+            f"universal_lighting_{import_data['sanitized_room_name']}"
+        )
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=f"Universal Lighting - {import_data['room_name']}",
+            data=import_data,
         )
 
     # ------------------------------------------------------------------
@@ -490,44 +1424,33 @@ class UniversalLightingSetupWizardConfigFlow(config_entries.ConfigFlow, domain=D
         blueprint check (read-only) -> packages config (usually a no-op) ->
         package file (new, wizard-owned) -> helper reload + verification ->
         automation append (atomic, last) -> automation reload.
+
+        With the storage helper backend the three helper steps are replaced
+        by adding the helpers to the UI collections (no file, no reload).
+
+        Native-engine rooms skip the blueprint check and both automation
+        steps - the engine started by async_setup_entry replaces them.
         """
+        native = self.config_data.get(CONF_ENGINE) == ENGINE_NATIVE
+
         # Step 0: The blueprint must exist BEFORE anything is written -
         # otherwise the created automation would be permanently 'unavailable'.
-        blueprint_file = self.hass.config.path(
-            "blueprints", "automation", *BLUEPRINT_PATH.split("/")
-        )
-        if not await self.hass.async_add_executor_job(_file_exists, blueprint_file):
-            _LOGGER.error(
-                "Blueprint not found at %s - import it before running the wizard",
-                blueprint_file,
-            )
+        if not native and not await self._blueprint_exists():
             return self.async_abort(reason="blueprint_missing")
 
-        # Step 1: Ensure packages are enabled (text-preserving, atomic)
-        try:
-            await self.hass.async_add_executor_job(
-                _add_packages_to_config, self.hass.config.path("configuration.yaml")
-            )
-        except RuntimeError:
-            return self.async_abort(reason="packages_manual")
-        except Exception:
-            _LOGGER.exception("Failed to enable packages in configuration.yaml")
-            return self.async_abort(reason="packages_failed")
-
-        # Step 2: Write the helper package file (wizard-owned, safe to overwrite)
-        try:
-            await self._create_helpers()
-        except Exception:
-            _LOGGER.exception("Failed to write the helper package file")
-            return self.async_abort(reason="helpers_failed")
+        # Steps 1-3: Create the helpers and verify they came up
+        if (reason := await self._setup_helpers([self.config_data])) is not None:
+            return self.async_abort(reason=reason)
 
-        # Step 3: Reload helper domains and verify the helpers came up
-        if not await self._reload_and_verify_helpers():
-            return self.async_abort(reason="helpers_failed")
+        if native:
+            return self.async_create_entry(
+                title=f"Universal Lighting - {self.config_data['room_name']}",
+                data=self.config_data,
+            )
 
         # Step 4: Append the automation (atomic, preserves existing content)
         try:
-            await self._create_automation()
+            await self._create_automations([self.config_data])
         except Exception:
             _LOGGER.exception("Failed to append the automation to automations.yaml")
             return self.async_abort(reason="automation_failed")
@@ -543,142 +1466,345 @@ class UniversalLightingSetupWizardConfigFlow(config_entries.ConfigFlow, domain=D
             data=self.config_data,
         )
 
-    async def _create_helpers(self):
-        """Create all required helper entities via a YAML package file."""
-        sanitized_name = self.config_data["sanitized_room_name"]
-        room_name = self.config_data["room_name"]
+    async def _blueprint_exists(self) -> bool:
+        """Check the blueprint file is present (logs where it was expected)."""
+        blueprint_file = _blueprint_file(self.hass)
+        if await self.hass.async_add_executor_job(_file_exists, blueprint_file):
+            return True
+        _LOGGER.error(
+            "Blueprint not found at %s - import it before running the wizard",
+            blueprint_file,
+        )
+        return False
 
-        helpers_config: dict[str, dict] = {}
-        for helper_key, helper_def in HELPER_DEFINITIONS.items():
-            domain = helper_def["domain"]
-            object_id = f"{sanitized_name}_{helper_key}"
-            helpers_config.setdefault(domain, {})
+    async def _enable_packages(self) -> str | None:
+        """Enable packages in configuration.yaml; returns an abort reason on failure."""
+        try:
+            await self.hass.async_add_executor_job(
+                _add_packages_to_config, self.hass.config.path("configuration.yaml")
+            )
+        except RuntimeError:
+            return "packages_manual"
+        except Exception:
+            _LOGGER.exception("Failed to enable packages in configuration.yaml")
+            return "packages_failed"
+        return None
 
-            helper_config: dict[str, Any] = {"name": helper_def["name"].format(room=room_name)}
-            if helper_def.get("icon"):
-                helper_config["icon"] = helper_def["icon"]
-            if domain == "input_datetime":
-                helper_config["has_date"] = helper_def.get("has_date", True)
-                helper_config["has_time"] = helper_def.get("has_time", True)
-            elif domain == "input_text":
-                helper_config["max"] = helper_def.get("max_length", 255)
+    async def _setup_helpers(self, rooms: list[dict[str, Any]]) -> str | None:
+        """Create and verify the rooms' helpers; returns an abort reason on failure."""
+        yaml_rooms = [
+            room for room in rooms
+            if room.get(CONF_HELPER_BACKEND, HELPER_BACKEND_YAML) == HELPER_BACKEND_YAML
+        ]
+        storage_rooms = [
+            room for room in rooms
+            if room.get(CONF_HELPER_BACKEND) == HELPER_BACKEND_STORAGE
+        ]
+        # UI-helper rooms still need a (recorder-only) package file for the
+        # recorder exclusion - there is no other way to configure it
+        recorder_rooms = [room for room in storage_rooms if _recorder_config(room)]
+
+        if yaml_rooms or recorder_rooms:
+            # Ensure packages are enabled (text-preserving, atomic)
+            if (reason := await self._enable_packages()) is not None:
+                return reason
+            # Write the package files (wizard-owned, safe to overwrite)
+            try:
+                await self._create_helpers(yaml_rooms, recorder_rooms)
+            except Exception:
+                _LOGGER.exception("Failed to write the helper package files")
+                return "helpers_failed"
+            if yaml_rooms and not await self._reload_helper_domains():
+                return "helpers_failed"
+
+        for room in storage_rooms:
+            try:
+                await async_create_helpers(
+                    self.hass, _helpers_config(room["room_name"], room["sanitized_room_name"])
+                )
+            except Exception:
+                _LOGGER.exception("Failed to create the UI helpers for %s", room["room_name"])
+                return "helpers_failed"
+
+        if not self._verify_helpers(rooms):
+            return "helpers_failed"
+        return None
 
-            helpers_config[domain][object_id] = helper_config
+    async def _create_helpers(self, rooms: list[dict[str, Any]],
+                              recorder_rooms: list[dict[str, Any]]):
+        """Create the rooms' helper entities via YAML package files (one batch).
 
+        `recorder_rooms` (UI-helper rooms) get a package file holding only
+        their recorder exclusion.
+        """
         packages_dir = self.hass.config.path("packages")
-        package_file = os.path.join(packages_dir, f"lighting_{sanitized_name}.yaml")
+        package_files = {
+            os.path.join(packages_dir, f"lighting_{room['sanitized_room_name']}.yaml"): {
+                **_helpers_config(room["room_name"], room["sanitized_room_name"]),
+                **_recorder_config(room),
+            }
+            for room in rooms
+        }
+        package_files.update(
+            (
+                os.path.join(packages_dir, f"lighting_{room['sanitized_room_name']}.yaml"),
+                _recorder_config(room),
+            )
+            for room in recorder_rooms
+        )
         await self.hass.async_add_executor_job(
-            _write_package_file, packages_dir, package_file, helpers_config
+            _write_package_files, packages_dir, package_files
         )
-        _LOGGER.info("Created helper package file: %s", package_file)
+        _LOGGER.info("Created helper package files: %s", ", ".join(package_files))
 
-    async def _reload_and_verify_helpers(self) -> bool:
-        """Reload helper domains (blocking) and verify all helpers exist."""
-        for domain in ("input_boolean", "input_datetime", "input_text"):
+    async def _reload_helper_domains(self) -> bool:
+        """Reload each helper domain once (blocking)."""
+        for domain in HELPER_DOMAINS:
             try:
                 await self.hass.services.async_call(domain, "reload", blocking=True)
             except Exception:
                 _LOGGER.exception("Failed to reload domain %s", domain)
                 return False
+        return True
 
-        sanitized_name = self.config_data["sanitized_room_name"]
+    def _verify_helpers(self, rooms: list[dict[str, Any]]) -> bool:
+        """Check every helper of every room has a state."""
         missing = [
-            f"{helper_def['domain']}.{sanitized_name}_{helper_key}"
+            f"{helper_def['domain']}.{room['sanitized_room_name']}_{helper_key}"
+            for room in rooms
             for helper_key, helper_def in HELPER_DEFINITIONS.items()
             if self.hass.states.get(
-                f"{helper_def['domain']}.{sanitized_name}_{helper_key}"
+                f"{helper_def['domain']}.{room['sanitized_room_name']}_{helper_key}"
             ) is None
         ]
         if missing:
-            _LOGGER.error("Helpers missing after reload: %s", ", ".join(missing))
+            _LOGGER.error("Helpers missing after setup: %s", ", ".join(missing))
             return False
         return True
 
-    async def _create_automation(self):
-        """Append the blueprint automation to automations.yaml."""
-        sanitized_name = self.config_data["sanitized_room_name"]
-        room_name = self.config_data["room_name"]
-        data = self.config_data
-
-        inputs: dict[str, Any] = {
-            # The blueprint sanitizes internally; passing the original name
-            # keeps notifications and logs human-readable.
-            "room_name": room_name,
-            "control_mode": data.get("control_mode", "switch_only"),
-        }
-        if data.get("light_switch"):
-            inputs["light_switch"] = data["light_switch"]
-        if data.get("light_entities"):
-            inputs["light_entities"] = data["light_entities"]
-
-        inputs["presence_pir_sensor"] = data["presence_pir_sensor"]
-        if data.get("presence_mmwave_sensor"):
-            inputs["presence_mmwave_sensor"] = data["presence_mmwave_sensor"]
-        if data.get("sensor_off_latency_entity"):
-            inputs["sensor_off_latency_entity"] = data["sensor_off_latency_entity"]
-        inputs["fixed_latency_seconds"] = data.get("fixed_latency_seconds", 60)
-        inputs["vacancy_timeout_multiplier"] = data.get("vacancy_timeout_multiplier", 5)
-
-        inputs["illuminance_sensor"] = data["illuminance_sensor"]
-        inputs["dark_threshold"] = data.get("dark_threshold", 30)
-        inputs["bright_threshold"] = data.get("bright_threshold", 200)
-        inputs["extremely_dark_threshold"] = data.get("extremely_dark_threshold", 3)
-        inputs["enable_illuminance_averaging"] = data.get("enable_illuminance_averaging", True)
-
-        inputs["override_behavior"] = data.get("override_behavior", "timeout_only")
-        inputs["override_timeout_hours"] = data.get("override_timeout_hours", 3)
-        inputs["override_respect_presence"] = data.get("override_respect_presence", True)
-        inputs["vacancy_clear_minutes"] = data.get("vacancy_clear_minutes", 45)
-
-        if data.get("enable_daytime_control"):
-            inputs["daytime_control_mode"] = data.get("daytime_control_mode", "always_allow")
-            if data.get("presence_trackers"):
-                inputs["presence_trackers"] = data["presence_trackers"]
-
-        if data.get("enable_bed_sensor") and data.get("bed_occupied_helper"):
-            inputs["bed_occupied_helper"] = data["bed_occupied_helper"]
-            inputs["turn_off_when_bed_occupied"] = data.get("turn_off_when_bed_occupied", True)
-            inputs["bed_exit_delay_seconds"] = data.get("bed_exit_delay_seconds", 15)
-            inputs["bed_entry_delay_seconds"] = data.get("bed_entry_delay_seconds", 15)
-
-        inputs["enable_adaptive_brightness"] = data.get("enable_adaptive_brightness", True)
-        inputs["enable_color_temperature"] = data.get("enable_color_temperature", True)
-        inputs["day_color_temp"] = data.get("day_color_temp", 5000)
-        inputs["night_color_temp"] = data.get("night_color_temp", 3000)
-        inputs["enable_fade_on"] = data.get("enable_fade_on", True)
-        inputs["fade_on_time"] = data.get("fade_on_time", 1.5)
-        inputs["enable_fade_off"] = data.get("enable_fade_off", True)
-        inputs["fade_off_time"] = data.get("fade_off_time", 2.0)
-
-        if data.get("enable_guest_mode"):
-            inputs["enable_guest_mode"] = True
-            inputs["guest_vacancy_multiplier"] = data.get("guest_vacancy_multiplier", 2.5)
-            inputs["guest_override_multiplier"] = data.get("guest_override_multiplier", 2.0)
-            inputs["guest_ignore_bed"] = data.get("guest_ignore_bed", True)
-
-        inputs["enable_debug_logs"] = data.get("enable_debug_logs", False)
-        inputs["enable_update_check"] = data.get("enable_update_check", True)
-
-        automation_config = {
-            "id": f"universal_lighting_{sanitized_name}",
-            "alias": f"Universal Smart Lighting - {room_name}",
-            "description": "Created by the Universal Smart Lighting Setup Wizard",
-            "use_blueprint": {
-                "path": BLUEPRINT_PATH,
-                "input": inputs,
-            },
-        }
+    async def _compile_automations(
+        self, rooms: list[dict[str, Any]], automation_configs: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Swap in the compiled automation of every room that asked for one.
 
+        A room whose compile fails keeps its use_blueprint block (and loses
+        the option) - a working automation beats a specialised one.
+        """
+        content = await self.hass.async_add_executor_job(_read_text, _blueprint_file(self.hass))
+        compiled_configs = []
+        for room, automation_config in zip(rooms, automation_configs):
+            if room.get(CONF_COMPILE_AUTOMATION) and content is not None:
+                try:
+                    compiled = await self.hass.async_add_executor_job(
+                        compile_automation, content, automation_config, self.hass
+                    )
+                except CompileError as err:
+                    _LOGGER.warning("Could not compile %s, using the blueprint: %s",
+                                    automation_config["id"], err)
+                else:
+                    room[COMPILED_BLUEPRINT_HASH] = compiled.blueprint_hash
+                    _LOGGER.info("Compiled %s: %s", automation_config["id"], compiled.summary())
+                    compiled_configs.append(compiled.config)
+                    continue
+            room[CONF_COMPILE_AUTOMATION] = False
+            compiled_configs.append(automation_config)
+        return compiled_configs
+
+    async def _create_automations(self, rooms: list[dict[str, Any]]):
+        """Append the rooms' blueprint automations to automations.yaml (one write)."""
+        # Rooms read the house-wide daytime sensor if there is one
+        house_daytime_sensor = er.async_get(self.hass).async_get_entity_id(
+            "binary_sensor", DOMAIN, DAYTIME_SENSOR_UNIQUE_ID
+        )
+        automation_configs = [
+            _automation_config(room, house_daytime_sensor) for room in rooms
+        ]
+        if any(room.get(CONF_COMPILE_AUTOMATION) for room in rooms):
+            automation_configs = await self._compile_automations(rooms, automation_configs)
         automations_path = self.hass.config.path("automations.yaml")
 
-        # Belt-and-suspenders: never append a duplicate id
-        if await self.hass.async_add_executor_job(
-            _automation_id_exists, automations_path, automation_config["id"]
+        async with _automations_lock(self.hass):
+            # Belt-and-suspenders: never append a duplicate id
+            existing = await self.hass.async_add_executor_job(_automation_ids, automations_path)
+            for automation_config in automation_configs:
+                if automation_config["id"] in existing:
+                    raise RuntimeError(f"Automation id {automation_config['id']} already exists")
+
+            await self.hass.async_add_executor_job(
+                _append_automations, automations_path, automation_configs
+            )
+        for room, automation_config in zip(rooms, automation_configs):
+            _LOGGER.info("Appended automation: %s", automation_config["id"])
+            room["automation_id"] = automation_config["id"]
+
+
+# ---------------------------------------------------------------------------
+# Options: reconfigure a room (or the house) in place
+# ---------------------------------------------------------------------------
+
+# Chosen once at creation: the name keys the helpers and the automation id,
+# and switching engine / helper backend means creating or removing files
+OPTIONS_FIXED_KEYS = frozenset(
+    {"room_name", CONF_ENGINE, CONF_HELPER_BACKEND, CONF_RECORDER_EXCLUDE}
+)
+
+
+def _options_schema(step_schema: vol.Schema, fixed: frozenset[str]) -> vol.Schema:
+    """A wizard step schema without the keys an existing room cannot change."""
+    return vol.Schema({
+        key: validator
+        for key, validator in step_schema.schema.items()
+        if key.schema not in fixed
+    })
+
+
+class UniversalLightingOptionsFlow(config_entries.OptionsFlow):
+    """Reconfigure an existing room through the wizard's own steps.
+
+    Every step is pre-filled with the room's current settings and validated
+    like the wizard does. On finish a blueprint room's block in
+    automations.yaml is replaced (the same in-place rewrite as a recompile)
+    and automations are reloaded - Home Assistant keeps every automation
+    whose config did not change, so only this room's restarts. The entry
+    data is then updated and the entry reloaded, which restarts the native
+    engine and the room's sensors with the new settings.
+    """
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow from the entry's current settings."""
+        self._entry = config_entry
+        self.data: dict[str, Any] = dict(config_entry.data)
+        fixed = set(OPTIONS_FIXED_KEYS)
+        if self.data.get(CONF_ENGINE) == ENGINE_NATIVE:
+            fixed.add(CONF_COMPILE_AUTOMATION)
+        self._fixed = frozenset(fixed)
+
+    async def async_step_init(self, user_input=None):
+        """Start with the house settings or the room's first step."""
+        if self.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_HOUSE:
+            return await self.async_step_house()
+        return await self.async_step_room()
+
+    async def async_step_room(self, user_input=None):
+        """Handle Room Setup (the name is fixed)."""
+        return await self._async_step(
+            "room", STEP_ROOM_SCHEMA, user_input, _room_error, self.async_step_presence_detection
+        )
+
+    async def async_step_presence_detection(self, user_input=None):
+        """Handle presence detection configuration."""
+        return await self._async_step(
+            "presence_detection", STEP_PRESENCE_SCHEMA, user_input, None,
+            self.async_step_light_levels,
+        )
+
+    async def async_step_light_levels(self, user_input=None):
+        """Handle light level configuration."""
+        return await self._async_step(
+            "light_levels", STEP_LIGHT_LEVELS_SCHEMA, user_input, _light_levels_error,
+            self.async_step_manual_override,
+        )
+
+    async def async_step_manual_override(self, user_input=None):
+        """Handle manual override configuration."""
+        return await self._async_step(
+            "manual_override", STEP_MANUAL_OVERRIDE_SCHEMA, user_input, None,
+            self.async_step_optional_features,
+        )
+
+    async def async_step_optional_features(self, user_input=None):
+        """Handle optional features selection."""
+        return await self._async_step(
+            "optional_features", STEP_OPTIONAL_FEATURES_SCHEMA, user_input,
+            _optional_features_error, self.async_step_adaptive_lighting,
+        )
+
+    async def async_step_adaptive_lighting(self, user_input=None):
+        """Handle adaptive lighting configuration."""
+        return await self._async_step(
+            "adaptive_lighting", STEP_ADAPTIVE_LIGHTING_SCHEMA, user_input, None,
+            self._async_apply,
+        )
+
+    async def async_step_house(self, user_input=None):
+        """Change the house-wide outdoor daytime settings."""
+        return await self._async_step(
+            "house", STEP_HOUSE_SCHEMA, user_input, _house_error, self._async_apply
+        )
+
+    async def _async_step(self, step_id, step_schema, user_input, validate, next_step):
+        """Show a pre-filled wizard step, or validate and merge its answer."""
+        schema = _options_schema(step_schema, self._fixed)
+        errors = {}
+
+        if user_input is not None:
+            # Optional fields left empty drop their old value
+            data = {
+                key: value for key, value in self.data.items()
+                if key not in {marker.schema for marker in schema.schema}
+            }
+            data.update(user_input)
+            if validate is not None and (error := validate(data)) is not None:
+                errors[error[0]] = error[1]
+            else:
+                self.data = data
+                return await next_step()
+
+        return self.async_show_form(
+            step_id=step_id,
+            data_schema=self.add_suggested_values_to_schema(schema, user_input or self.data),
+            errors=errors,
+        )
+
+    async def _async_apply(self):
+        """Rewrite the room's automation if it has one, then store and reload."""
+        hass = self.hass
+        if self.data.get(CONF_ENGINE) != ENGINE_NATIVE and (
+            automation_id := self.data.get("automation_id")
         ):
-            raise RuntimeError(f"Automation id {automation_config['id']} already exists")
+            if not await self._async_replace_automation(automation_id):
+                return self.async_abort(reason="automation_missing")
+            try:
+                await hass.services.async_call("automation", "reload", blocking=True)
+            except Exception:
+                _LOGGER.exception("Automation reload failed (automation was written)")
 
-        await self.hass.async_add_executor_job(
-            _append_automation, automations_path, automation_config
+        hass.config_entries.async_update_entry(self._entry, data=self.data)
+        await hass.config_entries.async_reload(self._entry.entry_id)
+        return self.async_create_entry(title="", data=dict(self._entry.options))
+
+    async def _async_replace_automation(self, automation_id: str) -> bool:
+        """Replace the room's block in automations.yaml; False if it is gone."""
+        hass = self.hass
+        house_daytime_sensor = er.async_get(hass).async_get_entity_id(
+            "binary_sensor", DOMAIN, DAYTIME_SENSOR_UNIQUE_ID
         )
-        _LOGGER.info("Appended automation: %s", automation_config["id"])
-        self.config_data["automation_id"] = automation_config["id"]
+        automation_config = _automation_config(self.data, house_daytime_sensor)
+        if self.data.get(CONF_COMPILE_AUTOMATION):
+            content = await hass.async_add_executor_job(_read_text, _blueprint_file(hass))
+            try:
+                if content is None:
+                    raise CompileError(f"blueprint {BLUEPRINT_PATH} is missing")
+                compiled = await hass.async_add_executor_job(
+                    compile_automation, content, automation_config, hass
+                )
+            except CompileError as err:
+                _LOGGER.warning("Could not compile %s, using the blueprint: %s",
+                                automation_id, err)
+                self.data[CONF_COMPILE_AUTOMATION] = False
+            else:
+                self.data[COMPILED_BLUEPRINT_HASH] = compiled.blueprint_hash
+                automation_config = compiled.config
+        if not self.data.get(CONF_COMPILE_AUTOMATION):
+            self.data.pop(COMPILED_BLUEPRINT_HASH, None)
+
+        async with _automations_lock(hass):
+            replaced = await hass.async_add_executor_job(
+                _replace_automation, hass.config.path("automations.yaml"), automation_config
+            )
+        if not replaced:
+            _LOGGER.warning("Automation %s is no longer in automations.yaml - not updated",
+                            automation_id)
+            return False
+        _LOGGER.info("Updated automation: %s", automation_id)
+        return True
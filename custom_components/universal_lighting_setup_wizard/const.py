@@ -0,0 +1,65 @@
+"""Constants for Universal Smart Lighting Setup Wizard."""
+from __future__ import annotations
+
+DOMAIN = "universal_lighting_setup_wizard"
+
+# Which engine drives a room: the YAML blueprint automation (default, the
+# historic behaviour) or the event-driven native engine in engine.py.
+CONF_ENGINE = "engine"
+ENGINE_BLUEPRINT = "blueprint"
+ENGINE_NATIVE = "native"
+# Native engine: triggers within this window (ms) decide once, together
+CONF_COALESCE_WINDOW = "coalesce_window_ms"
+DEFAULT_COALESCE_WINDOW_MS = 100
+# Native engine: lights already within these of the target are not re-commanded
+CONF_BRIGHTNESS_DELTA = "command_brightness_delta"
+DEFAULT_BRIGHTNESS_DELTA_PCT = 2
+CONF_KELVIN_DELTA = "command_kelvin_delta"
+DEFAULT_KELVIN_DELTA = 100
+# Blueprint engine: write the room's automation compiled (compiler.py) rather
+# than as a use_blueprint reference; the entry keeps the blueprint hash it
+# was compiled from so a changed blueprint triggers a recompile
+CONF_COMPILE_AUTOMATION = "compile_automation"
+COMPILED_BLUEPRINT_HASH = "compiled_blueprint_hash"
+
+# Where the room's helpers live: a YAML package (default, reloads the helper
+# domains) or the helpers' UI storage collections (no reload at all).
+CONF_HELPER_BACKEND = "helper_backend"
+HELPER_BACKEND_YAML = "yaml"
+HELPER_BACKEND_STORAGE = "storage"
+# Keep the helpers written on (almost) every decision out of the recorder
+CONF_RECORDER_EXCLUDE = "exclude_helpers_from_recorder"
+
+# Room entries carry no entry_type; at most one house-wide entry (the shared
+# outdoor-lux daytime source) has entry_type: house
+CONF_ENTRY_TYPE = "entry_type"
+ENTRY_TYPE_HOUSE = "house"
+HOUSE_UNIQUE_ID = "universal_lighting_house"
+DAYTIME_SENSOR_UNIQUE_ID = f"{HOUSE_UNIQUE_ID}_outdoor_daytime"
+
+# Dispatcher signal: the house-wide daytime verdict changed
+SIGNAL_DAYTIME_UPDATED = f"{DOMAIN}_daytime_updated"
+# Dispatcher signal (suffixed with the entry_id): a watched sensor's health changed
+SIGNAL_HEALTH_UPDATED = f"{DOMAIN}_health_updated"
+# Dispatcher signal (suffixed with the entry_id): the room's home trackers changed
+SIGNAL_HOME_PRESENCE_UPDATED = f"{DOMAIN}_home_presence_updated"
+# Dispatcher signal (suffixed with the automation id): profiling stopped on its own
+SIGNAL_PROFILING_STOPPED = f"{DOMAIN}_profiling_stopped"
+
+# hass.data keys (hass.data[DOMAIN][entry_id] keeps holding entry.data)
+DATA_ENGINES = f"{DOMAIN}_engines"
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+DATA_WINDOWS = f"{DOMAIN}_illuminance_windows"
+DATA_TELEMETRY = f"{DOMAIN}_telemetry"
+DATA_RUN_OBSERVER = f"{DOMAIN}_run_observer"
+DATA_DAYTIME = f"{DOMAIN}_daytime"
+DATA_BATCHER = f"{DOMAIN}_light_batcher"
+DATA_HEALTH = f"{DOMAIN}_sensor_health"
+DATA_ENTITY_INDEX = f"{DOMAIN}_entity_index"
+DATA_PROFILER = f"{DOMAIN}_template_profiler"
+DATA_HOME_PRESENCE = f"{DOMAIN}_home_presence"
+DATA_SNAPSHOTS = f"{DOMAIN}_room_snapshots"
+DATA_TRACES = f"{DOMAIN}_decision_traces"
+DATA_COMPILED_REFRESHER = f"{DOMAIN}_compiled_refresher"
+# asyncio.Lock serialising read-modify-write cycles of automations.yaml
+DATA_AUTOMATIONS_LOCK = f"{DOMAIN}_automations_lock"
@@ -0,0 +1,110 @@
+"""Precomputed adaptive brightness / colour-temperature curves.
+
+The blueprint renders adaptive_brightness and adaptive_color_temp (the
+hour-of-day brightness steps and the night -> day -> night kelvin ramp) on
+every run of every room. The curves only depend on a handful of settings,
+so AdaptiveCurves evaluates them once per minute of the day into flat
+arrays - 1440 bytes per darkness level, 2880 for the kelvin ramp - and a
+decision reads one element. Rooms with the same settings share one set of
+tables (curves_for() is cached).
+
+The values come from decision.adaptive_brightness / adaptive_color_temp
+themselves, so the tables cannot drift from the blueprint port. Light
+capabilities are not baked in: the lookup still returns 100 % for lights
+that cannot dim and 0 K (don't send) for lights without colour
+temperature, exactly like the functions.
+
+Pure Python, no Home Assistant imports.
+"""
+from __future__ import annotations
+
+from array import array
+from functools import lru_cache
+from typing import Any
+
+from .decision import RoomConfig, RoomState, adaptive_brightness, adaptive_color_temp
+
+MINUTES_PER_DAY = 1440
+
+# Brightness table rows, by how dark the room is (blueprint: is_dark /
+# is_extremely_dark - extremely dark wins)
+LEVELS = ("bright", "dark", "extremely_dark")
+
+# A state that can do everything, so the tables hold the curve itself
+_CAPABLE = RoomState(light_is_dimmable=True, light_supports_color_temp=True)
+
+
+def minute_of_day(local_hour: float) -> int:
+    """Table index for a fractional local hour (07:30 -> 7.5 -> 450)."""
+    minute = int(local_hour * 60 + 1e-6)
+    return minute if 0 <= minute < MINUTES_PER_DAY else minute % MINUTES_PER_DAY
+
+
+class AdaptiveCurves:
+    """One room's adaptive curves, one entry per minute of the day."""
+
+    __slots__ = ("brightness", "color_temp")
+
+    def __init__(self, config: RoomConfig) -> None:
+        """Evaluate the curves for every minute of the day."""
+        # One flat array, a row of MINUTES_PER_DAY per entry of LEVELS
+        self.brightness = array("B", (
+            adaptive_brightness(config, _CAPABLE, minute // 60, is_dark, is_extremely_dark)
+            for is_dark, is_extremely_dark in ((False, False), (True, False), (True, True))
+            for minute in range(MINUTES_PER_DAY)
+        ))
+        self.color_temp = array("H", (
+            adaptive_color_temp(config, _CAPABLE, minute / 60)
+            for minute in range(MINUTES_PER_DAY)
+        ))
+
+    def brightness_pct(self, state: RoomState, local_hour: float, is_dark: bool,
+                       is_extremely_dark: bool) -> int:
+        """adaptive_brightness() for the minute, by table lookup."""
+        if not state.light_is_dimmable:
+            return 100
+        row = 2 if is_extremely_dark else 1 if is_dark else 0
+        return self.brightness[row * MINUTES_PER_DAY + minute_of_day(local_hour)]
+
+    def color_temp_kelvin(self, state: RoomState, local_hour: float) -> int:
+        """adaptive_color_temp() for the minute, by table lookup (0 = none)."""
+        if not state.light_supports_color_temp:
+            return 0
+        return self.color_temp[minute_of_day(local_hour)]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Plain lists (index = minute of the day) for diagnostics."""
+        rows = self.brightness.tolist()
+        return {
+            "brightness_pct": {
+                level: rows[row * MINUTES_PER_DAY:(row + 1) * MINUTES_PER_DAY]
+                for row, level in enumerate(LEVELS)
+            },
+            "color_temp_kelvin": self.color_temp.tolist(),
+        }
+
+
+@lru_cache(maxsize=32)
+def _curves(enable_adaptive_brightness: bool, enable_guest_mode: bool,
+            enable_color_temperature: bool, day_color_temp: int,
+            night_color_temp: int) -> AdaptiveCurves:
+    return AdaptiveCurves(RoomConfig(
+        room_name="",
+        sanitized_room_name="",
+        enable_adaptive_brightness=enable_adaptive_brightness,
+        enable_guest_mode=enable_guest_mode,
+        enable_color_temperature=enable_color_temperature,
+        day_color_temp=day_color_temp,
+        night_color_temp=night_color_temp,
+    ))
+
+
+def curves_for(config: RoomConfig) -> AdaptiveCurves:
+    """The (shared) tables for a room's curve settings."""
+    return _curves(
+        config.enable_adaptive_brightness,
+        config.enable_guest_mode,
+        config.enable_color_temperature,
+        config.day_color_temp,
+        config.night_color_temp,
+    )
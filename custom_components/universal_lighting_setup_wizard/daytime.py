@@ -0,0 +1,106 @@
+"""House-wide outdoor-lux daytime verdict.
+
+The blueprint decides "daytime vs dark" from an outdoor lux sensor in every
+room separately (outdoor_lux_valid / outdoor_lux / is_daytime_final), each
+room with its own input_boolean.<room>_outdoor_dark hysteresis latch. One
+weather-station update is therefore N template evaluations and up to N
+helper writes, and rooms can disagree for a tick. OutdoorDaytime is the one
+shared latch: the house-wide Outdoor Daytime binary sensor feeds it every
+lux update and every room reads the verdict (WEATHER_DAYTIME_PLAN.md).
+
+Same semantics as the blueprint, plus staleness: a reading older than
+STALE_SECONDS (the sensor normally reports every ~30 s) counts as missing,
+so a dead or covered roof sensor hands over to the sun window instead of
+freezing the house on its last value.
+
+Pure Python, no Home Assistant imports.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+DAYTIME_SOURCE_SUN = "sun_times"
+DAYTIME_SOURCE_LUX = "outdoor_lux"
+DAYTIME_SOURCE_LUX_WITH_SUN = "outdoor_lux_with_sun_fallback"
+
+# Outdoor reading older than this is treated as unavailable
+STALE_SECONDS = 600
+# Minimum hysteresis band (blueprint: outdoor_bright_eff)
+MIN_BAND_LUX = 200
+
+
+@dataclass(frozen=True, slots=True)
+class DaytimeParams:
+    """Daytime source settings (blueprint v3.13+ inputs / the house entry)."""
+
+    daytime_source: str = DAYTIME_SOURCE_LUX_WITH_SUN
+    outdoor_lux_sensor: str | None = None
+    outdoor_dark_below_lux: float = 3000
+    outdoor_bright_above_lux: float = 4500
+
+    @classmethod
+    def from_entry_data(cls, data: Mapping[str, Any]) -> DaytimeParams:
+        """Build the params from the house entry's data."""
+        return cls(
+            daytime_source=data.get("daytime_source", DAYTIME_SOURCE_LUX_WITH_SUN),
+            outdoor_lux_sensor=data.get("outdoor_lux_sensor") or None,
+            outdoor_dark_below_lux=data.get("outdoor_dark_below_lux", 3000),
+            outdoor_bright_above_lux=data.get("outdoor_bright_above_lux", 4500),
+        )
+
+    @property
+    def outdoor_bright_eff(self) -> float:
+        """Bright threshold clamped to dark+200 (blueprint: outdoor_bright_eff)."""
+        return max(self.outdoor_bright_above_lux, self.outdoor_dark_below_lux + MIN_BAND_LUX)
+
+
+class OutdoorDaytime:
+    """The outdoor-dark hysteresis latch and the verdict it gives.
+
+    `outdoor_dark` is the latch (None until the first valid reading outside
+    the band). update() returns the lux verdict - True for day, False for
+    dark - or None when the lux has nothing to say and each room's own
+    sunrise/sunset window decides (blueprint: is_daytime_verified).
+    """
+
+    __slots__ = ("params", "outdoor_dark", "verdict", "valid")
+
+    def __init__(self, params: DaytimeParams, outdoor_dark: bool | None = None) -> None:
+        self.params = params
+        self.outdoor_dark = outdoor_dark
+        self.verdict: bool | None = None
+        self.valid = False
+
+    def update(self, lux: float | None, age_seconds: float | None) -> bool | None:
+        """Fold in the current reading (None if unavailable) and its age."""
+        params = self.params
+        self.valid = (
+            lux is not None
+            and lux >= 0
+            and age_seconds is not None
+            and age_seconds <= STALE_SECONDS
+        )
+        if params.daytime_source == DAYTIME_SOURCE_SUN:
+            self.verdict = None
+            return None
+        if self.valid:
+            if lux < params.outdoor_dark_below_lux:
+                self.outdoor_dark = True
+            elif lux >= params.outdoor_bright_eff:
+                self.outdoor_dark = False
+            # inside the band the latch holds - that memory IS the hysteresis
+        elif params.daytime_source != DAYTIME_SOURCE_LUX:
+            # Dead sensor: the sun window takes over (the latch is kept for
+            # when the sensor comes back)
+            self.verdict = None
+            return None
+        self.verdict = None if self.outdoor_dark is None else not self.outdoor_dark
+        return self.verdict
+
+    @property
+    def source(self) -> str:
+        """Where the verdict comes from: outdoor_lux, held (dead sensor) or sun_times."""
+        if self.verdict is None:
+            return DAYTIME_SOURCE_SUN
+        return DAYTIME_SOURCE_LUX if self.valid else "held"
@@ -0,0 +1,729 @@
+"""Pure decision logic for the native room engine.
+
+A line-for-line port of the blueprint's `variables:` block and main `choose:`
+(Universal-Smart-Light-Automation.yaml v3.19.1). The inputs later versions
+read from shared sensors - the house-wide outdoor daytime verdict (v3.15.0),
+Someone Home (v3.17.0) and the filtered illuminance (v3.19.0) - arrive here
+already resolved as RoomState.is_daytime, .someone_home and the illuminance
+window. Deliberately free of Home Assistant imports: the engine feeds it a
+RoomState snapshot plus the current time and applies whatever Decision comes
+back, so the same code can be replayed offline or benchmarked without a
+running instance.
+
+All timestamps are POSIX seconds (float). Comments reference the blueprint
+variable each function replaces so the two stay easy to diff.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import math
+from typing import TYPE_CHECKING, Any, Mapping
+
+from .const import (
+    DEFAULT_BRIGHTNESS_DELTA_PCT,
+    DEFAULT_COALESCE_WINDOW_MS,
+    DEFAULT_KELVIN_DELTA,
+)
+from .illuminance import DEFAULT_WINDOW, IlluminanceWindow
+
+if TYPE_CHECKING:
+    from .curves import AdaptiveCurves
+
+ACTION_NONE = "none"
+ACTION_TURN_ON = "turn_on"
+ACTION_TURN_OFF = "turn_off"
+
+# Bed sensor dropout fail-safe (blueprint: bed_blocks_auto_on, 10 minutes)
+BED_INVALID_GRACE_SECONDS = 600
+# override_respect_presence needs SUSTAINED vacancy before an expired override clears
+OVERRIDE_VACANCY_SECONDS = 300
+# primary_recently_changed - automatic control waits this long after a light change
+PRIMARY_SETTLE_SECONDS = 2
+# Fallback sunrise/sunset (local hour) when sun.sun has no rise/set data
+FALLBACK_SUNRISE_HOUR = 6
+FALLBACK_SUNSET_HOUR = 18
+# Degenerate-window fallback (atmospheric refraction)
+SUN_UP_ELEVATION = -0.833
+
+
+def _entity_list(value: Any) -> tuple[str, ...]:
+    """Normalise a selector value (str, list or empty) to a tuple of entity ids."""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(v for v in value if v)
+
+
+@dataclass(frozen=True, slots=True)
+class RoomConfig:
+    """Static per-room settings, built from the config entry data.
+
+    Defaults mirror the ones `_create_automation` writes into the blueprint
+    inputs (and, for inputs the wizard never sets, the blueprint's own).
+    """
+
+    room_name: str
+    sanitized_room_name: str
+    control_mode: str = "switch_only"
+    light_switch: str | None = None
+    light_entities: tuple[str, ...] = ()
+    presence_pir_sensor: str | None = None
+    presence_mmwave_sensor: str | None = None
+    sensor_off_latency_entity: str | None = None
+    fixed_latency_seconds: float = 60
+    vacancy_timeout_multiplier: float = 5
+    illuminance_sensor: str | None = None
+    dark_threshold: float = 30
+    bright_threshold: float = 200
+    extremely_dark_threshold: float = 3
+    enable_illuminance_averaging: bool = True
+    illuminance_window: int = DEFAULT_WINDOW
+    override_behavior: str = "timeout_only"
+    override_timeout_hours: float = 3
+    override_respect_presence: bool = True
+    vacancy_clear_minutes: float = 45
+    daytime_control_mode: str = "always_allow"
+    presence_trackers: tuple[str, ...] = ()
+    sunrise_offset_minutes: float = 30
+    sunset_offset_minutes: float = -30
+    bed_occupied_helper: str | None = None
+    turn_off_when_bed_occupied: bool = True
+    bed_exit_delay_seconds: float = 15
+    bed_entry_delay_seconds: float = 15
+    enable_adaptive_brightness: bool = True
+    enable_color_temperature: bool = True
+    day_color_temp: int = 5000
+    night_color_temp: int = 3000
+    enable_fade_on: bool = True
+    fade_on_time: float = 1.5
+    enable_fade_off: bool = True
+    fade_off_time: float = 2.0
+    enable_guest_mode: bool = False
+    guest_vacancy_multiplier: float = 2.5
+    guest_override_multiplier: float = 2.0
+    guest_ignore_bed: bool = True
+    enable_debug_logs: bool = False
+    coalesce_window_ms: float = DEFAULT_COALESCE_WINDOW_MS
+    command_brightness_delta: float = DEFAULT_BRIGHTNESS_DELTA_PCT
+    command_kelvin_delta: float = DEFAULT_KELVIN_DELTA
+
+    @classmethod
+    def from_entry_data(cls, data: Mapping[str, Any]) -> RoomConfig:
+        """Build a RoomConfig from the data stored by the config flow."""
+        daytime_mode = "always_allow"
+        if data.get("enable_daytime_control"):
+            daytime_mode = data.get("daytime_control_mode", "always_allow")
+        bed_helper = None
+        if data.get("enable_bed_sensor") and data.get("bed_occupied_helper"):
+            bed_helper = data["bed_occupied_helper"]
+        return cls(
+            room_name=data["room_name"],
+            sanitized_room_name=data["sanitized_room_name"],
+            control_mode=data.get("control_mode", "switch_only"),
+            light_switch=data.get("light_switch") or None,
+            light_entities=_entity_list(data.get("light_entities")),
+            presence_pir_sensor=data.get("presence_pir_sensor") or None,
+            presence_mmwave_sensor=data.get("presence_mmwave_sensor") or None,
+            sensor_off_latency_entity=data.get("sensor_off_latency_entity") or None,
+            fixed_latency_seconds=data.get("fixed_latency_seconds", 60),
+            vacancy_timeout_multiplier=data.get("vacancy_timeout_multiplier", 5),
+            illuminance_sensor=data.get("illuminance_sensor") or None,
+            dark_threshold=data.get("dark_threshold", 30),
+            bright_threshold=data.get("bright_threshold", 200),
+            extremely_dark_threshold=data.get("extremely_dark_threshold", 3),
+            enable_illuminance_averaging=data.get("enable_illuminance_averaging", True),
+            illuminance_window=data.get("illuminance_window", DEFAULT_WINDOW),
+            override_behavior=data.get("override_behavior", "timeout_only"),
+            override_timeout_hours=data.get("override_timeout_hours", 3),
+            override_respect_presence=data.get("override_respect_presence", True),
+            vacancy_clear_minutes=data.get("vacancy_clear_minutes", 45),
+            daytime_control_mode=daytime_mode,
+            presence_trackers=_entity_list(data.get("presence_trackers")),
+            sunrise_offset_minutes=data.get("sunrise_offset_minutes", 30),
+            sunset_offset_minutes=data.get("sunset_offset_minutes", -30),
+            bed_occupied_helper=bed_helper,
+            turn_off_when_bed_occupied=data.get("turn_off_when_bed_occupied", True),
+            bed_exit_delay_seconds=data.get("bed_exit_delay_seconds", 15),
+            bed_entry_delay_seconds=data.get("bed_entry_delay_seconds", 15),
+            enable_adaptive_brightness=data.get("enable_adaptive_brightness", True),
+            enable_color_temperature=data.get("enable_color_temperature", True),
+            day_color_temp=data.get("day_color_temp", 5000),
+            night_color_temp=data.get("night_color_temp", 3000),
+            enable_fade_on=data.get("enable_fade_on", True),
+            fade_on_time=data.get("fade_on_time", 1.5),
+            enable_fade_off=data.get("enable_fade_off", True),
+            fade_off_time=data.get("fade_off_time", 2.0),
+            enable_guest_mode=data.get("enable_guest_mode", False),
+            guest_vacancy_multiplier=data.get("guest_vacancy_multiplier", 2.5),
+            guest_override_multiplier=data.get("guest_override_multiplier", 2.0),
+            guest_ignore_bed=data.get("guest_ignore_bed", True),
+            enable_debug_logs=data.get("enable_debug_logs", False),
+            coalesce_window_ms=data.get("coalesce_window_ms", DEFAULT_COALESCE_WINDOW_MS),
+            command_brightness_delta=data.get(
+                "command_brightness_delta", DEFAULT_BRIGHTNESS_DELTA_PCT
+            ),
+            command_kelvin_delta=data.get("command_kelvin_delta", DEFAULT_KELVIN_DELTA),
+        )
+
+    # -- derived static facts (blueprint: has_* / effective_* variables) --
+
+    @property
+    def has_switch(self) -> bool:
+        return bool(self.light_switch)
+
+    @property
+    def has_lights(self) -> bool:
+        return bool(self.light_entities)
+
+    @property
+    def has_bed_sensor(self) -> bool:
+        return bool(self.bed_occupied_helper)
+
+    @property
+    def bed_ignored(self) -> bool:
+        """Bed sensor ignored entirely for guests (bed_ignored_for_guests)."""
+        return self.enable_guest_mode and self.guest_ignore_bed
+
+    @property
+    def mmwave_sensor(self) -> str | None:
+        """Effective mmWave sensor - falls back to the PIR like the blueprint."""
+        return self.presence_mmwave_sensor or self.presence_pir_sensor
+
+    @property
+    def primary_control_entity(self) -> str | None:
+        if self.control_mode == "lights_only":
+            return self.light_entities[0] if self.has_lights else None
+        if self.control_mode == "switch_and_lights":
+            if self.has_lights:
+                return self.light_entities[0]
+            return self.light_switch
+        return self.light_switch
+
+    @property
+    def primary_entities(self) -> tuple[str, ...]:
+        """Entities whose changes count as a primary (manual) trigger."""
+        if self.control_mode == "switch_only":
+            return _entity_list(self.light_switch)
+        if self.control_mode == "switch_and_lights":
+            return self.light_entities + _entity_list(self.light_switch)
+        return self.light_entities
+
+    @property
+    def blueprint_trigger_entities(self) -> list[str]:
+        """Entities behind the blueprint automation's state triggers."""
+        entities = [
+            self.presence_pir_sensor,
+            self.presence_mmwave_sensor,
+            self.illuminance_sensor,
+            self.light_switch,
+            *self.light_entities,
+            "sun.sun",
+            self.bed_occupied_helper,
+        ]
+        return list(dict.fromkeys(e for e in entities if e))
+
+    @property
+    def health_entities(self) -> list[str]:
+        """The sensors watched for staleness (the blueprint watchdog's list)."""
+        entities = [
+            self.presence_pir_sensor,
+            self.presence_mmwave_sensor,
+            self.illuminance_sensor,
+            self.bed_occupied_helper,
+        ]
+        return list(dict.fromkeys(e for e in entities if e))
+
+    @property
+    def blocks_when_away(self) -> bool:
+        """Whether daytime auto-on depends on the device trackers."""
+        return self.daytime_control_mode == "block_when_away" and bool(self.presence_trackers)
+
+    @property
+    def thresholds_valid(self) -> bool:
+        return self.dark_threshold < self.bright_threshold
+
+    @property
+    def effective_vacancy_multiplier(self) -> float:
+        if self.enable_guest_mode:
+            return self.vacancy_timeout_multiplier * self.guest_vacancy_multiplier
+        return self.vacancy_timeout_multiplier
+
+    @property
+    def effective_override_hours(self) -> float:
+        if self.enable_guest_mode:
+            return self.override_timeout_hours * self.guest_override_multiplier
+        return self.override_timeout_hours
+
+    @property
+    def effective_vacancy_clear_minutes(self) -> float:
+        if self.enable_guest_mode:
+            return self.vacancy_clear_minutes * self.guest_vacancy_multiplier
+        return self.vacancy_clear_minutes
+
+    @property
+    def effective_fade_on_time(self) -> float:
+        return self.fade_on_time if self.enable_fade_on else 0
+
+    @property
+    def effective_fade_off_time(self) -> float:
+        return self.fade_off_time if self.enable_fade_off else 0
+
+    def helper_entity_id(self, domain: str, key: str) -> str:
+        """Entity id of one of the wizard-created helpers for this room."""
+        return f"{domain}.{self.sanitized_room_name}_{key}"
+
+
+@dataclass(slots=True)
+class RoomState:
+    """Everything the decision needs that changes at runtime.
+
+    Maintained incrementally by the engine from state-change events, so a
+    decision never has to look anything up.
+    """
+
+    pir_on: bool = False
+    mmwave_on: bool = False
+    # Timestamp the room last went from occupied to vacant (None = occupied)
+    vacant_since: float | None = None
+    illuminance_raw: float | None = None
+    illuminance_valid: bool = False
+    # Averaging history (blueprint: input_text illuminance_history helper)
+    illuminance_window: IlluminanceWindow = field(default_factory=IlluminanceWindow)
+    # Bed: "on" / "off" / None (configured but unknown/unavailable)
+    bed_state: str | None = "off"
+    bed_changed_at: float = 0.0
+    lights_on: bool = False
+    primary_changed_at: float = 0.0
+    manual_override: bool = False
+    override_changed_at: float = 0.0
+    light_was_auto_on: bool = False
+    light_auto_on_changed_at: float = 0.0
+    sensor_off_latency: float | None = None
+    is_daytime: bool = False
+    someone_home: bool = True
+    light_is_dimmable: bool = False
+    light_supports_color_temp: bool = False
+    # Derived values cached between evaluations - see refresh_derived()
+    illuminance: float = 0.0
+    vacancy_timeout_minutes: int = 1
+
+    @property
+    def someone_present(self) -> bool:
+        return self.pir_on or self.mmwave_on
+
+
+@dataclass(slots=True)
+class Decision:
+    """Outcome of one evaluation."""
+
+    action: str
+    reason: str
+    someone_present: bool = False
+    is_dark: bool = False
+    illuminance: float = 0.0
+    prevent_auto_on: bool = False
+    bed_blocks_auto_on: bool = False
+    auto_would_turn_on: bool = False
+    auto_would_turn_off: bool = False
+    clear_override: bool = False
+    override_clear_reason: str | None = None
+    brightness_pct: int | None = None
+    color_temp_kelvin: int | None = None
+    transition: float | None = None
+
+
+# ---------------------------------------------------------------------------
+# Illuminance
+# ---------------------------------------------------------------------------
+
+def effective_illuminance(config: RoomConfig, state: RoomState) -> float:
+    """Current illuminance with the offline fallback (blueprint: illuminance_raw).
+
+    With averaging on this is the spike/drop-filtered value the window
+    computed when the reading arrived (blueprint: illuminance).
+    """
+    window = state.illuminance_window
+    if not state.illuminance_valid or state.illuminance_raw is None:
+        # Sensor offline: last stored average, then bright_threshold - which
+        # safely suppresses auto-ON (auto-OFF never depends on illuminance)
+        if (mean := window.mean) is not None:
+            return round(mean, 2)
+        return float(config.bright_threshold)
+    if not config.enable_illuminance_averaging or window.value is None:
+        return round(state.illuminance_raw, 2)
+    return window.value
+
+
+# ---------------------------------------------------------------------------
+# Sun / daytime
+# ---------------------------------------------------------------------------
+
+def todays_sun_event(next_event: float | None, today_start: float, today_end: float,
+                     fallback: float) -> float:
+    """Today's sunrise/sunset from sun.sun's next_* (blueprint: sunrise_today)."""
+    if next_event is None:
+        return fallback
+    if next_event > today_end:
+        return next_event - 86400
+    if next_event < today_start:
+        return next_event + 86400
+    return next_event
+
+
+def is_daytime(now: float, sunrise_offset_ts: float, sunset_offset_ts: float,
+               sun_elevation: float) -> bool:
+    """Offset daytime window (blueprint: is_daytime)."""
+    if sunrise_offset_ts >= sunset_offset_ts:
+        return sun_elevation > SUN_UP_ELEVATION
+    if sunrise_offset_ts <= now < sunset_offset_ts:
+        return True
+    # Yesterday's window extended past midnight (large positive sunset offset)
+    return now < sunrise_offset_ts and now < sunset_offset_ts - 86400
+
+
+def next_daytime_boundary(now: float, sunrise_offset_ts: float,
+                          sunset_offset_ts: float) -> float | None:
+    """Next instant the offset daytime window opens or closes."""
+    candidates = [
+        ts
+        for ts in (
+            sunrise_offset_ts,
+            sunset_offset_ts,
+            sunrise_offset_ts + 86400,
+            sunset_offset_ts + 86400,
+        )
+        if ts > now
+    ]
+    return min(candidates) if candidates else None
+
+
+# ---------------------------------------------------------------------------
+# Derived runtime facts
+# ---------------------------------------------------------------------------
+
+def vacancy_timeout_minutes(config: RoomConfig, state: RoomState) -> int:
+    """Minutes lights stay on after the room reads vacant."""
+    latency = config.fixed_latency_seconds
+    if state.sensor_off_latency is not None and state.sensor_off_latency > 0:
+        latency = state.sensor_off_latency
+    timeout = (latency * config.effective_vacancy_multiplier) / 60
+    return max(int(math.ceil(timeout)), 1)
+
+
+def refresh_derived(config: RoomConfig, state: RoomState) -> None:
+    """Recompute RoomState's cached derived fields.
+
+    The engine does this incrementally through a DerivedGraph (only when the
+    illuminance or latency sensor changed); callers without one - offline
+    replay, simulations - call this after mutating the state.
+    """
+    state.illuminance = effective_illuminance(config, state)
+    state.vacancy_timeout_minutes = vacancy_timeout_minutes(config, state)
+
+
+def room_vacant_seconds(state: RoomState, now: float) -> float:
+    if state.someone_present or state.vacant_since is None:
+        return 0.0
+    return max(now - state.vacant_since, 0.0)
+
+
+def prevent_auto_on(config: RoomConfig, state: RoomState) -> bool:
+    """Daytime control gate (blueprint: prevent_auto_on)."""
+    if not state.is_daytime:
+        return False
+    if config.daytime_control_mode == "always_block":
+        return True
+    if config.daytime_control_mode == "block_when_away":
+        return config.blocks_when_away and not state.someone_home
+    return False
+
+
+def no_daytime_lights_active(config: RoomConfig, state: RoomState) -> bool:
+    return config.daytime_control_mode == "always_block" and state.is_daytime
+
+
+def _bed_age(state: RoomState, now: float) -> float:
+    return now - state.bed_changed_at
+
+
+def bed_blocks_auto_on(config: RoomConfig, state: RoomState, now: float) -> bool:
+    """Occupied, dropped out < 10 min ago, or inside the exit delay."""
+    if not config.has_bed_sensor or config.bed_ignored:
+        return False
+    if state.bed_state == "on":
+        return True
+    if state.bed_state is None:
+        return _bed_age(state, now) < BED_INVALID_GRACE_SECONDS
+    return _bed_age(state, now) < config.bed_exit_delay_seconds
+
+
+def bed_occupied(config: RoomConfig, state: RoomState) -> bool:
+    """Instantaneous bed state (used to classify manual actions)."""
+    return config.has_bed_sensor and not config.bed_ignored and state.bed_state == "on"
+
+
+def bed_occupied_sustained(config: RoomConfig, state: RoomState, now: float) -> bool:
+    """Occupied for at least the bed ENTRY delay."""
+    if not bed_occupied(config, state):
+        return False
+    return _bed_age(state, now) >= config.bed_entry_delay_seconds
+
+
+def override_clear_reason(config: RoomConfig, state: RoomState, now: float) -> str | None:
+    """Why an active override should clear now, or None (override_should_clear)."""
+    if not state.manual_override:
+        return None
+    active = now - state.override_changed_at
+    vacant = room_vacant_seconds(state, now)
+    guest = " guest mode" if config.enable_guest_mode else ""
+    if active / 3600 > config.effective_override_hours:
+        if not config.override_respect_presence:
+            return f"timeout ({config.effective_override_hours}h{guest})"
+        if not state.someone_present and vacant >= OVERRIDE_VACANCY_SECONDS:
+            return f"timeout while vacant ({config.effective_override_hours}h{guest})"
+    clear_seconds = config.effective_vacancy_clear_minutes * 60
+    if (
+        config.override_behavior == "vacancy_clear"
+        and vacant >= clear_seconds
+        and active >= clear_seconds
+    ):
+        return f"vacancy ({int(vacant // 60)}min{guest})"
+    return None
+
+
+def adaptive_brightness(config: RoomConfig, state: RoomState, local_hour: int,
+                        is_dark: bool, is_extremely_dark: bool) -> int:
+    """Brightness percentage for the time of day (blueprint: adaptive_brightness)."""
+    if not config.enable_adaptive_brightness or not state.light_is_dimmable:
+        return 100
+    night = local_hour >= 22 or local_hour < 6
+    shoulder = 20 <= local_hour < 22 or 6 <= local_hour < 8
+    if config.enable_guest_mode:
+        if is_extremely_dark:
+            return 50 if night else 90
+        if is_dark:
+            return 60 if night else 80 if shoulder else 100
+        return 100
+    if is_extremely_dark:
+        return 30 if night else 80
+    if is_dark:
+        return 40 if night else 70 if shoulder else 90
+    return 100
+
+
+def adaptive_color_temp(config: RoomConfig, state: RoomState, local_hour: float) -> int:
+    """Colour temperature for the time of day, 0 = don't send one."""
+    if not config.enable_color_temperature or not state.light_supports_color_temp:
+        return 0
+    if 6 <= local_hour < 9:
+        progress = (local_hour - 6) / 3
+    elif 9 <= local_hour < 17:
+        progress = 1.0
+    elif 17 <= local_hour < 21:
+        progress = 1 - ((local_hour - 17) / 4)
+    else:
+        progress = 0.0
+    temp_range = config.day_color_temp - config.night_color_temp
+    return int(config.night_color_temp + temp_range * progress)
+
+
+# ---------------------------------------------------------------------------
+# Decisions
+# ---------------------------------------------------------------------------
+
+def evaluate(config: RoomConfig, state: RoomState, now: float,
+             local_hour: float, curves: AdaptiveCurves | None = None) -> Decision:
+    """Decide what the room should do right now (blueprint: main choose).
+
+    With `curves` (the room's precomputed tables) the adaptive brightness and
+    colour temperature are looked up instead of computed.
+    """
+    present = state.someone_present
+    illuminance = state.illuminance
+    is_dark = illuminance < config.dark_threshold
+    is_extremely_dark = illuminance < config.extremely_dark_threshold
+    prevent = prevent_auto_on(config, state)
+    bed_blocks = bed_blocks_auto_on(config, state, now)
+
+    would_on = not prevent and not bed_blocks and is_dark and present
+    vacant_ok = (
+        not present
+        and room_vacant_seconds(state, now) >= state.vacancy_timeout_minutes * 60
+    )
+    bed_ok = (
+        config.has_bed_sensor
+        and config.turn_off_when_bed_occupied
+        and bed_occupied_sustained(config, state, now)
+    )
+    would_off = state.lights_on and (
+        vacant_ok or bed_ok or no_daytime_lights_active(config, state)
+    )
+
+    decision = Decision(
+        action=ACTION_NONE,
+        reason="no_change",
+        someone_present=present,
+        is_dark=is_dark,
+        illuminance=illuminance,
+        prevent_auto_on=prevent,
+        bed_blocks_auto_on=bed_blocks,
+        auto_would_turn_on=would_on,
+        auto_would_turn_off=would_off,
+    )
+
+    if not config.thresholds_valid:
+        decision.reason = "inverted_thresholds"
+        return decision
+
+    manual_override = state.manual_override
+    clear_reason = override_clear_reason(config, state, now)
+    if clear_reason is not None:
+        decision.clear_override = True
+        decision.override_clear_reason = clear_reason
+        manual_override = False
+    if manual_override:
+        decision.reason = "manual_override"
+        return decision
+
+    if now - state.primary_changed_at < PRIMARY_SETTLE_SECONDS:
+        decision.reason = "primary_recently_changed"
+        return decision
+
+    if would_on and not state.lights_on:
+        decision.action = ACTION_TURN_ON
+        decision.reason = "dark_and_occupied"
+        if curves is not None:
+            decision.brightness_pct = curves.brightness_pct(
+                state, local_hour, is_dark, is_extremely_dark
+            )
+            kelvin = curves.color_temp_kelvin(state, local_hour)
+        else:
+            decision.brightness_pct = adaptive_brightness(
+                config, state, int(local_hour), is_dark, is_extremely_dark
+            )
+            kelvin = adaptive_color_temp(config, state, local_hour)
+        decision.color_temp_kelvin = kelvin or None
+        decision.transition = config.effective_fade_on_time or None
+    elif would_off:
+        decision.action = ACTION_TURN_OFF
+        if bed_ok:
+            decision.reason = "bed_occupied"
+        elif vacant_ok:
+            decision.reason = "room_vacant"
+        else:
+            decision.reason = "daytime_energy_saving"
+        decision.transition = config.effective_fade_off_time or None
+    elif prevent and is_dark and present and not bed_blocks and not state.lights_on:
+        decision.reason = "auto_on_prevented"
+    return decision
+
+
+def classify_manual_change(config: RoomConfig, state: RoomState, now: float,
+                           turned_on: bool) -> bool | None:
+    """Manual override outcome of a user light change.
+
+    Returns True to set the override, False to clear it and None to leave it
+    alone (blueprint: the "Handle manual light changes" choose).
+    """
+    present = state.someone_present
+    illuminance = state.illuminance
+    is_dark = illuminance < config.dark_threshold
+    is_bright = illuminance >= config.bright_threshold
+    is_extremely_dark = illuminance < config.extremely_dark_threshold
+    prevent = prevent_auto_on(config, state)
+    would_on = (
+        not prevent
+        and not bed_blocks_auto_on(config, state, now)
+        and is_dark
+        and present
+    )
+    turned_off = not turned_on
+    bed = bed_occupied(config, state)
+
+    # User action conflicts with automation
+    if (turned_on and (not would_on or prevent)) or (turned_off and would_on and not prevent):
+        return True
+
+    # User action matches automation intent (pre-change intent for OFF)
+    would_off_prechange = (
+        not present
+        or (config.has_bed_sensor and config.turn_off_when_bed_occupied and bed)
+        or no_daytime_lights_active(config, state)
+    )
+    if (
+        (turned_on and would_on and not prevent)
+        or (turned_off and would_off_prechange)
+        or (turned_off and prevent and not would_on)
+    ):
+        return False
+
+    # Lights off in genuinely bright daylight
+    if turned_off and is_bright and present and state.is_daytime:
+        return False
+
+    # Default case - user preference
+    auto_on_recent = (
+        turned_on
+        and state.light_was_auto_on
+        and now - state.light_auto_on_changed_at < 5
+    )
+    bed_auto_off = turned_off and config.turn_off_when_bed_occupied and bed
+    if auto_on_recent or bed_auto_off:
+        return None
+    in_middle = config.dark_threshold <= illuminance < config.bright_threshold
+    narrow = (config.bright_threshold - config.dark_threshold) <= 10
+    if (
+        (turned_off and present and (not is_bright or not state.is_daytime))
+        or (turned_on and not is_dark and present)
+        or (turned_off and state.light_was_auto_on and present)
+        or (turned_off and is_extremely_dark and present)
+        or (narrow and in_middle and present)
+        or (config.has_bed_sensor and bed and turned_on)
+    ):
+        return True
+    return None
+
+
+def next_deadline(config: RoomConfig, state: RoomState, now: float) -> float | None:
+    """Earliest future instant at which evaluate() could change its answer.
+
+    Replaces the blueprint's 5-second periodic_check: instead of polling,
+    the engine arms one timer for whichever delayed decision comes first -
+    bed entry/exit delay, vacancy timeout, override expiry or the settle
+    window after a light change. Daytime boundaries are added by the engine,
+    which owns the sun data.
+    """
+    deadlines: list[float] = []
+
+    if config.has_bed_sensor and not config.bed_ignored:
+        if state.bed_state == "on":
+            deadlines.append(state.bed_changed_at + config.bed_entry_delay_seconds)
+        elif state.bed_state is None:
+            deadlines.append(state.bed_changed_at + BED_INVALID_GRACE_SECONDS)
+        else:
+            deadlines.append(state.bed_changed_at + config.bed_exit_delay_seconds)
+
+    if not state.someone_present and state.vacant_since is not None:
+        if state.lights_on:
+            deadlines.append(
+                state.vacant_since + state.vacancy_timeout_minutes * 60
+            )
+        if state.manual_override:
+            deadlines.append(state.vacant_since + OVERRIDE_VACANCY_SECONDS)
+            if config.override_behavior == "vacancy_clear":
+                clear_seconds = config.effective_vacancy_clear_minutes * 60
+                deadlines.append(
+                    max(state.vacant_since, state.override_changed_at) + clear_seconds
+                )
+
+    if state.manual_override:
+        # Strictly greater-than in the blueprint - nudge past the boundary
+        deadlines.append(
+            state.override_changed_at + config.effective_override_hours * 3600 + 1
+        )
+
+    deadlines.append(state.primary_changed_at + PRIMARY_SETTLE_SECONDS)
+
+    future = [d for d in deadlines if d > now]
+    return min(future) if future else None
@@ -0,0 +1,76 @@
+"""Per-room ring buffer of structured decision records.
+
+The blueprint's debug mode explains a run by formatting several multi-line
+system_log.write warnings - expensive enough, and noisy enough, that
+nobody leaves it on, so the run that went wrong is never the one that was
+logged. Each room instead keeps a DecisionTrace: the last TRACE_SIZE
+decisions as small DecisionRecords (trigger, the inputs that matter,
+reason, action, latency). Recording is one record construction and a
+deque append, memory is fixed, and nothing is formatted until someone
+reads the trace (room diagnostics, or live through the
+`universal_lighting_setup_wizard/trace/subscribe` websocket command).
+
+Native rooms record every evaluation; blueprint rooms fire one
+`universal_lighting_decision` event per run (blueprint input
+enable_decision_trace), recorded by the BlueprintRunObserver.
+
+Pure Python, no Home Assistant imports.
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+TRACE_SIZE = 100
+# The key inputs a record carries (also the blueprint event's data keys)
+TRACE_INPUTS = (
+    "someone_present",
+    "is_dark",
+    "illuminance",
+    "lights_on",
+    "manual_override",
+    "is_daytime",
+    "prevent_auto_on",
+    "bed_blocks_auto_on",
+)
+
+
+@dataclass(slots=True)
+class DecisionRecord:
+    """One decision: what triggered it, what it saw, what it chose."""
+
+    time: float
+    trigger: str
+    reason: str
+    action: str
+    latency_ms: float | None
+    inputs: dict[str, Any]
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class DecisionTrace:
+    """The last TRACE_SIZE decisions of one room, plus live listeners."""
+
+    __slots__ = ("records", "_listeners")
+
+    def __init__(self, size: int = TRACE_SIZE) -> None:
+        self.records: deque[DecisionRecord] = deque(maxlen=size)
+        self._listeners: list[Callable[[DecisionRecord], None]] = []
+
+    def record(self, record: DecisionRecord) -> None:
+        """Append a record (evicting the oldest) and hand it to the listeners."""
+        self.records.append(record)
+        for listener in self._listeners:
+            listener(record)
+
+    def listen(self, listener: Callable[[DecisionRecord], None]) -> Callable[[], None]:
+        """Call `listener` with every new record; returns the callback that stops it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """The records, oldest first."""
+        return [record.as_dict() for record in self.records]
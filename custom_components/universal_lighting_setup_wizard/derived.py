@@ -0,0 +1,85 @@
+"""Incremental derived-state cache for the native room engine.
+
+The blueprint re-renders every variable on every trigger - a PIR blip pays
+for the light capability scan, the tracker expansion and the illuminance
+parsing all over again. Here each derived value is a node that declares the
+sources it reads (entity ids, `registry:<entity_id>` for entity-registry
+facts, or other node names). A state change only dirties the nodes that read
+that entity, and refresh() recomputes just those, in registration order.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+
+def registry_source(entity_id: str) -> str:
+    """Source key for facts read from an entity's registry entry."""
+    return f"registry:{entity_id}"
+
+
+@dataclass(slots=True)
+class _Node:
+    name: str
+    compute: Callable[[], None]
+    sources: frozenset[str]
+
+
+class DerivedGraph:
+    """Dependency graph of lazily recomputed values.
+
+    Nodes must be added after every node they depend on, so registration
+    order is a valid topological order.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty graph."""
+        self._nodes: dict[str, _Node] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._dirty: set[str] = set()
+        self.recomputes = 0
+
+    def add(self, name: str, sources: Iterable[str], compute: Callable[[], None]) -> None:
+        """Register a node; it starts dirty so the first refresh computes it."""
+        node = _Node(name, compute, frozenset(s for s in sources if s))
+        if name in node.sources:
+            raise ValueError(f"Node {name} depends on itself")
+        for source in node.sources:
+            self._dependents.setdefault(source, set()).add(name)
+        self._nodes[name] = node
+        self._dirty.add(name)
+
+    @property
+    def sources(self) -> set[str]:
+        """Every external source (not a node) some node reads."""
+        return {s for s in self._dependents if s not in self._nodes}
+
+    def invalidate(self, source: str) -> bool:
+        """Dirty every node reading `source` (transitively). True if any did."""
+        pending = list(self._dependents.get(source, ()))
+        dirtied = False
+        while pending:
+            name = pending.pop()
+            if name in self._dirty:
+                continue
+            self._dirty.add(name)
+            dirtied = True
+            pending.extend(self._dependents.get(name, ()))
+        return dirtied
+
+    def invalidate_all(self) -> None:
+        self._dirty.update(self._nodes)
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def refresh(self) -> None:
+        """Recompute the dirty nodes (and only those)."""
+        if not self._dirty:
+            return
+        for name, node in self._nodes.items():
+            if name in self._dirty:
+                node.compute()
+                self.recomputes += 1
+        self._dirty.clear()
@@ -0,0 +1,66 @@
+"""Diagnostics for Universal Smart Lighting Setup Wizard.
+
+A room's download carries its settings, its telemetry and its adaptive
+brightness / colour-temperature tables (one value per minute of the day,
+ready to plot), its stale sensors and its decision trace; native rooms add
+the last decision, blueprint rooms the per-variable template profile (once
+profiled).
+The house entry reports the outdoor daytime latch.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_ENTRY_TYPE,
+    DATA_DAYTIME,
+    DATA_ENGINES,
+    DATA_HEALTH,
+    DATA_PROFILER,
+    DATA_TELEMETRY,
+    DATA_TRACES,
+    ENTRY_TYPE_HOUSE,
+)
+from .curves import curves_for
+from .decision import RoomConfig
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a room or the house entry."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_HOUSE:
+        daytime = hass.data.get(DATA_DAYTIME)
+        return {
+            "entry_data": dict(entry.data),
+            "outdoor_daytime": None if daytime is None else {
+                "verdict": daytime.verdict,
+                "source": daytime.source,
+                "outdoor_dark": daytime.outdoor_dark,
+                "valid": daytime.valid,
+            },
+        }
+
+    engine = hass.data.get(DATA_ENGINES, {}).get(entry.entry_id)
+    telemetry = hass.data.get(DATA_TELEMETRY, {}).get(entry.entry_id)
+    trace = hass.data.get(DATA_TRACES, {}).get(entry.entry_id)
+    curves = engine.curves if engine is not None else curves_for(
+        RoomConfig.from_entry_data(entry.data)
+    )
+    diagnostics: dict[str, Any] = {
+        "entry_data": dict(entry.data),
+        "telemetry": telemetry.as_dict() if telemetry is not None else None,
+        "adaptive_curves": curves.as_dict(),
+        "stale_sensors": hass.data[DATA_HEALTH].stale_sensors(entry.entry_id),
+        "decision_trace": trace.as_list() if trace is not None else None,
+    }
+    if engine is not None:
+        decision = engine.last_decision
+        diagnostics["last_decision"] = asdict(decision) if decision is not None else None
+    elif automation_id := entry.data.get("automation_id"):
+        diagnostics["template_profile"] = hass.data[DATA_PROFILER].report(automation_id)
+    return diagnostics
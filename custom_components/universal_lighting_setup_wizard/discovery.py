@@ -0,0 +1,172 @@
+"""Area-keyed index of the entities a room is usually built from.
+
+The wizard's entity selectors list every entity of a domain; on an install
+with thousands of entities, finding the PIR, mmWave, illuminance, bed and
+light entities of each room is slow and easy to get wrong. EntityIndex
+walks the entity and device registries once and sorts the candidates of
+every area by what they are for (lights, switches, motion, occupancy /
+presence, illuminance, bed). The flows pre-fill their forms from it and the
+area bulk import builds its rooms from it.
+
+The index is kept in hass.data and shared by every flow; an entity, device
+or area registry update just drops it, and the next lookup rebuilds it from
+the current registries.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import re
+from typing import Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+
+from .const import DATA_ENTITY_INDEX
+
+# Occupancy / presence sensors whose entity_id names a bed (binary_sensor.bed_occupied,
+# binary_sensor.master_bed_left - but not binary_sensor.bedroom_motion)
+_BED_PATTERN = re.compile(r"(?:^|[._])bed(?:[._]|$)")
+
+_REGISTRY_EVENTS = (
+    er.EVENT_ENTITY_REGISTRY_UPDATED,
+    dr.EVENT_DEVICE_REGISTRY_UPDATED,
+    ar.EVENT_AREA_REGISTRY_UPDATED,
+)
+
+
+@dataclass(slots=True)
+class AreaCandidates:
+    """One area's candidate entities per role, each list sorted."""
+
+    lights: list[str] = field(default_factory=list)
+    switches: list[str] = field(default_factory=list)
+    motion: list[str] = field(default_factory=list)
+    occupancy: list[str] = field(default_factory=list)
+    illuminance: list[str] = field(default_factory=list)
+    bed: list[str] = field(default_factory=list)
+
+    @property
+    def presence(self) -> list[str]:
+        """Presence sensors, motion first (PIR) then occupancy (mmWave)."""
+        return self.motion + self.occupancy
+
+
+def _role(entity: er.RegistryEntry) -> str | None:
+    """Which AreaCandidates list an entity belongs in, if any."""
+    domain = entity.domain
+    if domain == "light":
+        return "lights"
+    if domain == "switch":
+        return "switches"
+    device_class = entity.device_class or entity.original_device_class
+    if domain == "sensor":
+        return "illuminance" if device_class == "illuminance" else None
+    if domain != "binary_sensor":
+        return None
+    if device_class in ("motion", "occupancy", "presence"):
+        if _BED_PATTERN.search(entity.entity_id):
+            return "bed"
+        return "motion" if device_class == "motion" else "occupancy"
+    return None
+
+
+class EntityIndex:
+    """Candidate entities of every area, by role; built on first use."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an index that has not been built yet."""
+        self.hass = hass
+        self._areas: dict[str, AreaCandidates] | None = None
+        self.builds = 0
+
+    @callback
+    def async_invalidate(self, _event: Event | None = None) -> None:
+        """Drop the index; the next lookup rebuilds it."""
+        self._areas = None
+
+    @property
+    def areas(self) -> dict[str, AreaCandidates]:
+        """area_id -> candidates, walking the registries if needed."""
+        if self._areas is None:
+            self._areas = self._build()
+        return self._areas
+
+    def _build(self) -> dict[str, AreaCandidates]:
+        """Walk the entity registry once (device area as the fallback)."""
+        dev_reg = dr.async_get(self.hass)
+        ent_reg = er.async_get(self.hass)
+        areas: dict[str, AreaCandidates] = {}
+        for entity in ent_reg.entities.values():
+            if entity.disabled_by is not None or (role := _role(entity)) is None:
+                continue
+            area_id = entity.area_id
+            if area_id is None and entity.device_id is not None:
+                device = dev_reg.async_get(entity.device_id)
+                area_id = device.area_id if device is not None else None
+            if area_id is None:
+                continue
+            if (candidates := areas.get(area_id)) is None:
+                candidates = areas[area_id] = AreaCandidates()
+            getattr(candidates, role).append(entity.entity_id)
+        for candidates in areas.values():
+            for entity_ids in (
+                candidates.lights, candidates.switches, candidates.motion,
+                candidates.occupancy, candidates.illuminance, candidates.bed,
+            ):
+                entity_ids.sort()
+        self.builds += 1
+        return areas
+
+    def candidates(self, area_id: str | None) -> AreaCandidates:
+        """The area's candidates (empty for unknown areas)."""
+        return self.areas.get(area_id or "") or AreaCandidates()
+
+    def suggestions(self, area_id: str | None) -> dict[str, Any]:
+        """Wizard options guessed from the area's entities.
+
+        Lights (or a switch if there are none), the first motion sensor as
+        PIR, the next presence sensor as mmWave, the first illuminance
+        sensor and a bed sensor. Options without a candidate are left out.
+        """
+        candidates = self.candidates(area_id)
+        room: dict[str, Any] = {}
+        if candidates.lights:
+            room["control_mode"] = "lights_only"
+            room["light_entities"] = list(candidates.lights)
+        elif candidates.switches:
+            room["control_mode"] = "switch_only"
+            room["light_switch"] = candidates.switches[0]
+        presence = candidates.presence
+        if presence:
+            room["presence_pir_sensor"] = presence[0]
+        if len(presence) > 1:
+            room["presence_mmwave_sensor"] = presence[1]
+        if candidates.illuminance:
+            room["illuminance_sensor"] = candidates.illuminance[0]
+        if candidates.bed:
+            room["bed_occupied_helper"] = candidates.bed[0]
+        return room
+
+
+@callback
+def async_get_entity_index(hass: HomeAssistant) -> EntityIndex:
+    """The shared index (dropped on every entity / device / area registry update)."""
+    if (index := hass.data.get(DATA_ENTITY_INDEX)) is None:
+        index = hass.data[DATA_ENTITY_INDEX] = EntityIndex(hass)
+        for event_type in _REGISTRY_EVENTS:
+            hass.bus.async_listen(event_type, index.async_invalidate)
+    return index
+
+
+@callback
+def async_area_for_room(hass: HomeAssistant, room_name: str,
+                        area_id: str | None = None) -> str | None:
+    """The chosen area, else the area named like the room (if any)."""
+    if area_id:
+        return area_id
+    area = ar.async_get(hass).async_get_area_by_name(room_name)
+    return area.id if area is not None else None
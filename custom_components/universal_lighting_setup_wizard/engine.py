@@ -0,0 +1,1001 @@
+"""Event-driven native room engine.
+
+Replaces a room's blueprint automation (and its 5-second time_pattern poll)
+when the config entry was created with `engine: native`. The engine keeps a
+RoomState up to date from state-change events of the room's own entities,
+runs decision.evaluate() only when something it depends on changed, and
+registers the next deadline that matters (bed entry/exit delay, vacancy
+timeout, override expiry or a sunrise/sunset offset boundary) with the
+shared scheduler. An idle room has no deadline and no work at all.
+
+Daytime is the room's own sunrise/sunset offset window, unless the house
+entry's outdoor daytime sensor has a lux verdict: then that shared verdict
+wins, and the engine hears about changes through a dispatcher signal.
+Whether someone is home (block_when_away) comes the same way from the
+shared HomePresence aggregate (presence.py), so the room neither
+subscribes to nor scans its device trackers.
+
+State changes are folded into the RoomState as they arrive, but the
+decision itself goes through a TriggerCoalescer: the burst one person
+walking in causes (PIR, mmWave, lux, light echoes) is decided once, after
+the room's coalescing window - except presence turning on, which decides
+immediately.
+
+Derived values (lights on, light capabilities, someone home, effective
+illuminance, vacancy timeout) live in a DerivedGraph: an event only
+recomputes the values that read the entity that changed, and light
+capabilities come from the entity registry and are cached until it changes.
+Adaptive brightness and colour temperature are read from per-minute tables
+(curves.py) built once per set of curve settings.
+
+Light commands go through the shared LightCommandBatcher, which merges
+identical commands from all rooms into one call per integration. Before
+that, the room's CommandCache drops the lights that already are in the
+target state (or within the configured brightness / kelvin deltas of it).
+
+Presence fast path: after every decision the engine notes whether presence
+alone would turn the lights on (dark, lights off, no override, daytime gate
+open). When it would and presence does come on, the turn-on is the first
+thing that happens: its task is the first one the state change creates, it
+goes out at once when the batcher has nothing queued for the lights'
+integration (LightCommandBatcher.async_send_now), and the occupancy /
+auto-on / last-action helper writes follow on the next event-loop
+iteration instead of queueing in front of it.
+
+Warm start: the room's presence, vacancy start and last valid lux reading
+are kept in the shared RoomSnapshotStore (snapshot.py). After a restart the
+snapshot stands in for the sensors that are still unavailable, and no
+decision is made until the presence and illuminance sensors have reported
+or STARTUP_GRACE_SECONDS have passed - the boot-time flurry of
+unavailable -> real transitions is folded into the RoomState and decided
+once, from real values.
+
+The wizard-created helpers stay the source of truth users see: the override
+helper is read (and written on manual changes), and occupancy, auto-on and
+last-action bookkeeping are written exactly like the blueprint does.
+"""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+import logging
+import time
+from typing import Any, Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_HOME, STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Context, Event, HomeAssistant, State, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .batcher import LightCommandBatcher
+from .coalescer import (
+    TRIGGER_BED,
+    TRIGGER_ILLUMINANCE,
+    TRIGGER_LATENCY,
+    TRIGGER_LIGHT,
+    TRIGGER_OUTDOOR_DAYTIME,
+    TRIGGER_OVERRIDE,
+    TRIGGER_PRESENCE,
+    TRIGGER_PRESENCE_ON,
+    TRIGGER_SUN,
+    TRIGGER_TIMER,
+    TRIGGER_TRACKER,
+    TriggerCoalescer,
+)
+from .command_cache import CommandCache, LightSnapshot
+from .const import (
+    DATA_DAYTIME,
+    DATA_HOME_PRESENCE,
+    DATA_SNAPSHOTS,
+    SIGNAL_DAYTIME_UPDATED,
+    SIGNAL_HOME_PRESENCE_UPDATED,
+)
+from .decision import (
+    ACTION_TURN_OFF,
+    ACTION_TURN_ON,
+    FALLBACK_SUNRISE_HOUR,
+    FALLBACK_SUNSET_HOUR,
+    SUN_UP_ELEVATION,
+    Decision,
+    RoomConfig,
+    RoomState,
+    classify_manual_change,
+    effective_illuminance,
+    evaluate,
+    is_daytime,
+    prevent_auto_on,
+    next_daytime_boundary,
+    next_deadline,
+    todays_sun_event,
+    vacancy_timeout_minutes,
+)
+from .curves import curves_for
+from .decision_trace import DecisionRecord, DecisionTrace
+from .derived import DerivedGraph, registry_source
+from .illuminance import IlluminanceWindow
+from .presence import HomePresence
+from .scheduler import RoomScheduler
+from .snapshot import RoomSnapshot, RoomSnapshotStore
+from .telemetry import RoomTelemetry
+
+_LOGGER = logging.getLogger(__name__)
+
+SUN_ENTITY = "sun.sun"
+# DerivedGraph source of the shared someone-home aggregate
+_HOME_PRESENCE_SOURCE = "home_presence"
+_INVALID_STATES = (None, "", STATE_UNKNOWN, STATE_UNAVAILABLE)
+# Longest a (re)started room waits for its sensors before deciding anyway
+STARTUP_GRACE_SECONDS = 30
+# Context ids of our own service calls, used to ignore their state echoes
+_OWN_CONTEXT_LIMIT = 32
+
+
+def _is_invalid(state: State | None) -> bool:
+    return state is None or state.state in _INVALID_STATES
+
+
+def _float_state(state: State | None) -> float | None:
+    if _is_invalid(state):
+        return None
+    try:
+        return float(state.state)
+    except (TypeError, ValueError):
+        return None
+
+
+class RoomEngine:
+    """Drives one room from state-change events and scheduler deadlines."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry,
+                 scheduler: RoomScheduler,
+                 window: IlluminanceWindow | None = None,
+                 telemetry: RoomTelemetry | None = None,
+                 batcher: LightCommandBatcher | None = None,
+                 trace: DecisionTrace | None = None) -> None:
+        """Initialize the engine from the config entry data.
+
+        `window` is the room's illuminance ring buffer, shared with (and
+        restored by) the room's filtered illuminance sensor; `telemetry`
+        is published by the room's diagnostic sensors; light commands go
+        through the shared `batcher` when given, straight out otherwise;
+        every decision is recorded in `trace`.
+        """
+        self.hass = hass
+        self.entry = entry
+        self.scheduler = scheduler
+        self.config = RoomConfig.from_entry_data(entry.data)
+        self.state = RoomState(
+            illuminance_window=window or IlluminanceWindow(self.config.illuminance_window)
+        )
+        self.last_decision: Decision | None = None
+        self.telemetry = telemetry or RoomTelemetry()
+        self.trace = trace or DecisionTrace()
+        self.batcher = batcher
+        self.commands = CommandCache(
+            self.config.command_brightness_delta, self.config.command_kelvin_delta
+        )
+        self._commanded_entities = frozenset(
+            e for e in (self.config.light_switch, *self.config.light_entities) if e
+        )
+        self._own_contexts: deque[str] = deque(maxlen=_OWN_CONTEXT_LIMIT)
+        self._unsubs: list[Callable[[], None]] = []
+        self._sunrise_offset_ts: float | None = None
+        self._sunset_offset_ts: float | None = None
+        self.curves = curves_for(self.config)
+        # The shared aggregate when it watches this room (set up by
+        # __init__); a standalone engine follows its trackers itself
+        presence: HomePresence | None = hass.data.get(DATA_HOME_PRESENCE)
+        self._home_presence = (
+            presence if presence is not None and presence.is_watched(entry.entry_id) else None
+        )
+        self.graph = self._build_graph()
+        self._trigger_types = self._build_trigger_types()
+        self.coalescer = TriggerCoalescer(
+            hass, self.config.coalesce_window_ms, self._async_coalesced
+        )
+        self.fast_path_enabled = True
+        # Set after each decision: presence coming on would turn the lights on
+        self._presence_fast_path = False
+        # Helper writes held back while the fast path sends its command
+        self._deferred_writes: list[Callable[[], None]] | None = None
+        self._snapshots: RoomSnapshotStore | None = hass.data.get(DATA_SNAPSHOTS)
+        # True until the required sensors reported (or the grace ran out)
+        self._holding = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def tracked_entities(self) -> list[str]:
+        """Every entity whose state can change this room's decision."""
+        cfg = self.config
+        entities = [
+            cfg.presence_pir_sensor,
+            cfg.presence_mmwave_sensor,
+            cfg.illuminance_sensor,
+            cfg.light_switch,
+            *cfg.light_entities,
+            cfg.bed_occupied_helper,
+            cfg.sensor_off_latency_entity,
+            *(cfg.presence_trackers if self._home_presence is None else ()),
+            cfg.helper_entity_id("input_boolean", "manual_override"),
+        ]
+        if cfg.daytime_control_mode != "always_allow":
+            entities.append(SUN_ENTITY)
+        return list(dict.fromkeys(e for e in entities if e))
+
+    @property
+    def _required_sensors(self) -> list[str]:
+        """The sensors a first decision waits for."""
+        cfg = self.config
+        return [e for e in (cfg.presence_pir_sensor, cfg.mmwave_sensor, cfg.illuminance_sensor) if e]
+
+    def _awaiting_sensors(self) -> bool:
+        states = self.hass.states
+        return any(_is_invalid(states.get(e)) for e in self._required_sensors)
+
+    async def async_start(self) -> None:
+        """Load the current states, subscribe, and make a first decision.
+
+        The decision waits while a required sensor has not reported yet
+        (see STARTUP_GRACE_SECONDS).
+        """
+        now = dt_util.utcnow().timestamp()
+        for entity_id in self.tracked_entities:
+            new_state = self.hass.states.get(entity_id)
+            if entity_id in self._commanded_entities:
+                self._observe_light(entity_id, new_state, now)
+            self._apply_state(entity_id, new_state, now, initial=True)
+        if self._snapshots is not None:
+            if (snapshot := self._snapshots.restore(self.entry.entry_id, now)) is not None:
+                self._restore_snapshot(snapshot)
+            self._unsubs.append(self._snapshots.async_add(self.entry.entry_id, self.snapshot))
+        self._refresh_daytime(now)
+
+        self._unsubs.append(
+            async_track_state_change_event(
+                self.hass, self.tracked_entities, self._async_state_changed
+            )
+        )
+        self._unsubs.append(
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated
+            )
+        )
+        if self.config.daytime_control_mode != "always_allow":
+            self._unsubs.append(
+                async_dispatcher_connect(
+                    self.hass, SIGNAL_DAYTIME_UPDATED, self._async_outdoor_daytime_updated
+                )
+            )
+        if self._home_presence is not None:
+            self._unsubs.append(
+                async_dispatcher_connect(
+                    self.hass,
+                    f"{SIGNAL_HOME_PRESENCE_UPDATED}_{self.entry.entry_id}",
+                    self._async_home_presence_updated,
+                )
+            )
+        if self._awaiting_sensors():
+            self._holding = True
+            self.scheduler.async_schedule(
+                ("startup", self.entry.entry_id),
+                now + STARTUP_GRACE_SECONDS,
+                self._async_startup_grace_expired,
+            )
+            return
+        self._async_evaluate("startup")
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe from everything and cancel the pending deadline."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        self.coalescer.async_cancel()
+        self.scheduler.async_cancel(self.entry.entry_id)
+        self.scheduler.async_cancel(("startup", self.entry.entry_id))
+
+    def snapshot(self) -> RoomSnapshot:
+        """The room's state to carry across a restart."""
+        state = self.state
+        return RoomSnapshot(
+            dt_util.utcnow().timestamp(),
+            state.pir_on,
+            state.mmwave_on,
+            state.vacant_since,
+            state.illuminance_raw if state.illuminance_valid else None,
+        )
+
+    def _restore_snapshot(self, snapshot: RoomSnapshot) -> None:
+        """Stand in for the sensors that have not reported since the restart."""
+        cfg = self.config
+        state = self.state
+        states = self.hass.states
+        presence_restored = False
+        if cfg.presence_pir_sensor and _is_invalid(states.get(cfg.presence_pir_sensor)):
+            state.pir_on = snapshot.pir_on
+            presence_restored = True
+        if cfg.mmwave_sensor and _is_invalid(states.get(cfg.mmwave_sensor)):
+            state.mmwave_on = snapshot.mmwave_on
+            presence_restored = True
+        if state.someone_present:
+            state.vacant_since = None
+        elif presence_restored and snapshot.vacant_since is not None:
+            state.vacant_since = snapshot.vacant_since
+        if (
+            snapshot.illuminance_raw is not None
+            and _is_invalid(states.get(cfg.illuminance_sensor))
+        ):
+            state.illuminance_raw = snapshot.illuminance_raw
+            state.illuminance_valid = True
+            self.graph.invalidate(cfg.illuminance_sensor)
+
+    @callback
+    def _async_startup_grace_expired(self, now: float) -> None:
+        """Decide with whatever the sensors say now; dead ones count as dead."""
+        if not self._holding:
+            return
+        for entity_id in self._required_sensors:
+            new_state = self.hass.states.get(entity_id)
+            if _is_invalid(new_state):
+                self._apply_state(entity_id, new_state, now)
+                self.graph.invalidate(entity_id)
+        self._holding = False
+        self._async_evaluate("startup")
+
+    # ------------------------------------------------------------------
+    # Derived values
+    # ------------------------------------------------------------------
+
+    @property
+    def _capability_entities(self) -> tuple[str, ...]:
+        """Entities whose light capabilities decide dimming / colour temp."""
+        cfg = self.config
+        if cfg.control_mode == "switch_only" or not cfg.has_lights:
+            if cfg.light_switch and cfg.light_switch.startswith("light."):
+                return (cfg.light_switch,)
+            return ()
+        return cfg.light_entities
+
+    def _build_graph(self) -> DerivedGraph:
+        cfg = self.config
+        graph = DerivedGraph()
+        graph.add("lights", cfg.primary_entities, self._compute_lights)
+        graph.add(
+            "capabilities",
+            [registry_source(e) for e in self._capability_entities],
+            self._compute_capabilities,
+        )
+        graph.add(
+            "someone_home",
+            cfg.presence_trackers if self._home_presence is None else [_HOME_PRESENCE_SOURCE],
+            self._compute_someone_home,
+        )
+        graph.add("illuminance", [cfg.illuminance_sensor], self._compute_illuminance)
+        graph.add(
+            "vacancy_timeout", [cfg.sensor_off_latency_entity], self._compute_vacancy_timeout
+        )
+        return graph
+
+    def _compute_lights(self) -> None:
+        """lights_on and primary_changed_at from the live light/switch states."""
+        cfg = self.config
+        state = self.state
+        states = self.hass.states
+        if cfg.control_mode == "switch_only" or not cfg.has_lights:
+            switch = states.get(cfg.light_switch) if cfg.light_switch else None
+            state.lights_on = switch is not None and switch.state == STATE_ON
+        else:
+            state.lights_on = any(
+                (s := states.get(e)) is not None and s.state == STATE_ON
+                for e in cfg.light_entities
+            )
+        primary = cfg.primary_control_entity
+        primary_state = states.get(primary) if primary else None
+        if primary_state is not None:
+            state.primary_changed_at = primary_state.last_changed.timestamp()
+
+    def _compute_capabilities(self) -> None:
+        """light_is_dimmable / light_supports_color_temp (blueprint: expand() scan).
+
+        Read from the entity registry; entities without a registry entry fall
+        back to their state attributes.
+        """
+        registry = er.async_get(self.hass)
+        capabilities: list[Any] = []
+        for entity_id in self._capability_entities:
+            entry = registry.async_get(entity_id)
+            if entry is not None and entry.capabilities is not None:
+                capabilities.append(entry.capabilities)
+            elif (s := self.hass.states.get(entity_id)) is not None:
+                capabilities.append(s.attributes)
+        self.state.light_is_dimmable = any(
+            mode != "onoff"
+            for caps in capabilities
+            for mode in (caps.get("supported_color_modes") or [])
+        )
+        self.state.light_supports_color_temp = any(
+            caps.get("min_color_temp_kelvin") is not None for caps in capabilities
+        )
+
+    def _compute_someone_home(self) -> None:
+        if self._home_presence is not None:
+            self.state.someone_home = self._home_presence.someone_home(self.entry.entry_id)
+            return
+        trackers = self.config.presence_trackers
+        self.state.someone_home = not trackers or any(
+            (s := self.hass.states.get(t)) is not None and s.state == STATE_HOME
+            for t in trackers
+        )
+
+    def _compute_illuminance(self) -> None:
+        self.state.illuminance = effective_illuminance(self.config, self.state)
+
+    def _compute_vacancy_timeout(self) -> None:
+        self.state.vacancy_timeout_minutes = vacancy_timeout_minutes(self.config, self.state)
+
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        """Drop cached capabilities when a light's registry entry changes.
+
+        Recomputed lazily by the next evaluation - capabilities only shape the
+        next light command, never whether one is sent.
+        """
+        for key in ("entity_id", "old_entity_id"):
+            if entity_id := event.data.get(key):
+                self.graph.invalidate(registry_source(entity_id))
+
+    # ------------------------------------------------------------------
+    # State tracking
+    # ------------------------------------------------------------------
+
+    def _build_trigger_types(self) -> dict[str, str]:
+        """Coalescer trigger type of every tracked entity except presence."""
+        cfg = self.config
+        types: dict[str, str] = {}
+        if self._home_presence is None:
+            types.update((e, TRIGGER_TRACKER) for e in cfg.presence_trackers)
+        types.update((e, TRIGGER_LIGHT) for e in cfg.primary_entities)
+        types.update((e, TRIGGER_LIGHT) for e in cfg.light_entities)
+        for entity_id, trigger in (
+            (cfg.light_switch, TRIGGER_LIGHT),
+            (cfg.illuminance_sensor, TRIGGER_ILLUMINANCE),
+            (cfg.bed_occupied_helper, TRIGGER_BED),
+            (cfg.sensor_off_latency_entity, TRIGGER_LATENCY),
+            (cfg.helper_entity_id("input_boolean", "manual_override"), TRIGGER_OVERRIDE),
+        ):
+            if entity_id:
+                types[entity_id] = trigger
+        return types
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        entity_id: str = event.data["entity_id"]
+        old_state: State | None = event.data.get("old_state")
+        new_state: State | None = event.data.get("new_state")
+        now = dt_util.utcnow().timestamp()
+
+        if entity_id == SUN_ENTITY:
+            # sun.sun updates its attributes every few minutes; only a flip of
+            # the offset window needs a decision, otherwise just re-arm
+            was_daytime = self.state.is_daytime
+            self._refresh_daytime(now)
+            if self.state.is_daytime != was_daytime:
+                self.coalescer.async_add(TRIGGER_SUN, event.time_fired)
+            else:
+                self._async_schedule_next(now)
+            return
+
+        if entity_id in self._commanded_entities:
+            # Brightness / colour temperature changes keep the state, so
+            # record every report, not only on/off flips
+            self._observe_light(entity_id, new_state, now)
+        graph = self.graph
+        graph.invalidate(entity_id)
+        if _is_invalid(old_state) and not _is_invalid(new_state):
+            # A light coming back may have registered (or changed) capabilities
+            graph.invalidate(registry_source(entity_id))
+        state_changed = (
+            old_state is None or new_state is None or old_state.state != new_state.state
+        )
+        if entity_id in self.config.primary_entities:
+            graph.refresh()
+            if state_changed and self._is_manual_change(old_state, new_state):
+                self._async_manual_change(new_state.state == STATE_ON, now)
+                return
+        if not state_changed:
+            return
+        was_present = self.state.someone_present
+        is_presence = entity_id in (self.config.presence_pir_sensor, self.config.mmwave_sensor)
+        if (
+            is_presence
+            and self._presence_fast_path
+            and not was_present
+            and new_state is not None
+            and new_state.state == STATE_ON
+        ):
+            self._async_presence_fast_path(entity_id, new_state, now, event.time_fired)
+            return
+        self._apply_state(entity_id, new_state, now)
+        if is_presence:
+            if self.state.someone_present and not was_present:
+                trigger = TRIGGER_PRESENCE_ON
+            else:
+                trigger = TRIGGER_PRESENCE
+        else:
+            trigger = self._trigger_types.get(entity_id, TRIGGER_LIGHT)
+        self.coalescer.async_add(trigger, event.time_fired)
+
+    def _apply_state(self, entity_id: str, new_state: State | None, now: float,
+                     initial: bool = False) -> None:
+        """Fold one entity's new state into the RoomState."""
+        cfg = self.config
+        state = self.state
+        changed_at = new_state.last_changed.timestamp() if new_state else now
+
+        if entity_id in (cfg.presence_pir_sensor, cfg.mmwave_sensor):
+            was_present = state.someone_present
+            is_on = not _is_invalid(new_state) and new_state.state == STATE_ON
+            if entity_id == cfg.presence_pir_sensor:
+                state.pir_on = is_on
+            if entity_id == cfg.mmwave_sensor:
+                state.mmwave_on = is_on
+            if state.someone_present:
+                state.vacant_since = None
+            elif was_present or initial:
+                vacant_since = now if not initial else changed_at
+                if state.vacant_since is not None:
+                    vacant_since = max(state.vacant_since, vacant_since)
+                state.vacant_since = vacant_since
+                if not initial:
+                    self._write_helper("occupancy_state", False)
+            if state.someone_present and not was_present and not initial:
+                self._write_helper("occupancy_state", True)
+
+        if entity_id == cfg.illuminance_sensor:
+            raw = _float_state(new_state)
+            state.illuminance_valid = raw is not None
+            if raw is not None:
+                state.illuminance_raw = raw
+                if cfg.enable_illuminance_averaging:
+                    state.illuminance_window.update(
+                        raw, cfg.dark_threshold, cfg.bright_threshold,
+                        key=new_state.last_updated,
+                    )
+
+        if entity_id == cfg.bed_occupied_helper:
+            state.bed_state = None if _is_invalid(new_state) else new_state.state
+            state.bed_changed_at = changed_at
+
+        if entity_id == cfg.sensor_off_latency_entity:
+            state.sensor_off_latency = _float_state(new_state)
+
+        if entity_id == cfg.helper_entity_id("input_boolean", "manual_override"):
+            state.manual_override = new_state is not None and new_state.state == STATE_ON
+            state.override_changed_at = changed_at
+
+    def _observe_light(self, entity_id: str, new_state: State | None, now: float) -> None:
+        """Record what a light/switch reports in the CommandCache."""
+        if _is_invalid(new_state):
+            self.commands.observe(entity_id, None, None, None, now)
+            return
+        attrs = new_state.attributes
+        brightness = attrs.get("brightness")
+        self.commands.observe(
+            entity_id,
+            new_state.state == STATE_ON,
+            None if brightness is None else brightness * 100 / 255,
+            attrs.get("color_temp_kelvin"),
+            now,
+        )
+
+    @callback
+    def _async_outdoor_daytime_updated(self) -> None:
+        was_daytime = self.state.is_daytime
+        self._refresh_daytime(dt_util.utcnow().timestamp())
+        if self.state.is_daytime != was_daytime:
+            self.coalescer.async_add(TRIGGER_OUTDOOR_DAYTIME)
+
+    @callback
+    def _async_home_presence_updated(self) -> None:
+        self.graph.invalidate(_HOME_PRESENCE_SOURCE)
+        # The set of home trackers changed; only a flip needs a decision
+        if self._home_presence.someone_home(self.entry.entry_id) != self.state.someone_home:
+            self.coalescer.async_add(TRIGGER_TRACKER)
+
+    def _refresh_daytime(self, now: float) -> None:
+        """Recompute today's offset daytime window from sun.sun.
+
+        The house-wide outdoor lux verdict, when there is one, overrides it
+        (blueprint: is_daytime_final).
+        """
+        cfg = self.config
+        sun = self.hass.states.get(SUN_ENTITY)
+        attrs = sun.attributes if sun is not None else {}
+        today = dt_util.start_of_local_day()
+        today_start = today.timestamp()
+        today_end = today_start + 86399
+
+        def _ts(value: Any) -> float | None:
+            if value is None:
+                return None
+            parsed = value if isinstance(value, datetime) else dt_util.parse_datetime(str(value))
+            return parsed.timestamp() if parsed is not None else None
+
+        next_rising = _ts(attrs.get("next_rising"))
+        next_setting = _ts(attrs.get("next_setting"))
+        elevation = float(attrs.get("elevation") or 0)
+        sunrise = todays_sun_event(
+            next_rising, today_start, today_end, today_start + FALLBACK_SUNRISE_HOUR * 3600
+        )
+        sunset = todays_sun_event(
+            next_setting, today_start, today_end, today_start + FALLBACK_SUNSET_HOUR * 3600
+        )
+        self._sunrise_offset_ts = sunrise + cfg.sunrise_offset_minutes * 60
+        self._sunset_offset_ts = sunset + cfg.sunset_offset_minutes * 60
+        if next_rising is not None and next_setting is not None:
+            self.state.is_daytime = is_daytime(
+                now, self._sunrise_offset_ts, self._sunset_offset_ts, elevation
+            )
+        else:
+            self.state.is_daytime = elevation > SUN_UP_ELEVATION
+        outdoor = self.hass.data.get(DATA_DAYTIME)
+        if outdoor is not None and outdoor.verdict is not None:
+            self.state.is_daytime = outdoor.verdict
+
+    def _is_manual_change(self, old_state: State | None, new_state: State | None) -> bool:
+        """A real on<->off flip that was not caused by a service call."""
+        if old_state is None or new_state is None:
+            return False
+        if {old_state.state, new_state.state} != {"on", "off"}:
+            return False
+        context = new_state.context
+        if context.id in self._own_contexts:
+            return False
+        return context.parent_id is None
+
+    # ------------------------------------------------------------------
+    # Decisions
+    # ------------------------------------------------------------------
+
+    @callback
+    def _async_presence_fast_path(self, entity_id: str, new_state: State, now: float,
+                                  fired: datetime) -> None:
+        """Someone walked into a dark room with the lights off: light first.
+
+        The decision is the regular one (the immediate presence_on flush);
+        only the order changes - the light command task is the first one
+        created, and the helper writes run after it.
+        """
+        deferred: list[Callable[[], None]] = []
+        self._deferred_writes = deferred
+        try:
+            self._apply_state(entity_id, new_state, now)
+            self.coalescer.async_add(TRIGGER_PRESENCE_ON, fired)
+        finally:
+            self._deferred_writes = None
+        if deferred:
+            self.hass.loop.call_soon(self._async_run_deferred, deferred)
+
+    @callback
+    def _async_run_deferred(self, deferred: list[Callable[[], None]]) -> None:
+        for write in deferred:
+            write()
+
+    def _arm_presence_fast_path(self) -> None:
+        """Note whether presence alone would turn the lights on right now."""
+        cfg = self.config
+        state = self.state
+        self._presence_fast_path = (
+            self.fast_path_enabled
+            and cfg.thresholds_valid
+            and not state.someone_present
+            and not state.lights_on
+            and not state.manual_override
+            and state.illuminance < cfg.dark_threshold
+            and not prevent_auto_on(cfg, state)
+        )
+
+    @callback
+    def _async_manual_change(self, turned_on: bool, now: float) -> None:
+        outcome = classify_manual_change(self.config, self.state, now, turned_on)
+        _LOGGER.debug(
+            "[%s] Manual change (turned %s) -> override %s",
+            self.config.room_name,
+            "on" if turned_on else "off",
+            {True: "SET", False: "CLEARED", None: "unchanged"}[outcome],
+        )
+        if outcome is not None:
+            self.state.manual_override = outcome
+            self.state.override_changed_at = now
+            self._write_helper("manual_override", outcome)
+        self.state.light_was_auto_on = False
+        self.state.light_auto_on_changed_at = now
+        self._write_helper("light_auto_on", False)
+        self._arm_presence_fast_path()
+        self._async_schedule_next(now)
+
+    @callback
+    def _async_coalesced(self, triggers: list[str], fired: datetime | None) -> None:
+        """One decision for a batch of triggers from the coalescer."""
+        self.telemetry.coalesced_triggers += len(triggers) - 1
+        if self._holding:
+            # The states are folded in already; decide once everything reported
+            if self._awaiting_sensors():
+                return
+            self._holding = False
+            self.scheduler.async_cancel(("startup", self.entry.entry_id))
+            triggers = ["startup", *triggers]
+        self._async_evaluate(
+            "+".join(dict.fromkeys(triggers)), fired, urgent=TRIGGER_PRESENCE_ON in triggers
+        )
+
+    @callback
+    def _async_evaluate(self, trigger: str, fired: datetime | None = None,
+                        urgent: bool = False) -> None:
+        """Decide and act; `fired` is when the (first) triggering event happened.
+
+        `urgent` (someone walked in) sends the light command without waiting
+        for the batcher's window.
+        """
+        started = time.perf_counter()
+        now_dt = dt_util.now()
+        now = now_dt.timestamp()
+        self.graph.refresh()
+        local_hour = now_dt.hour + now_dt.minute / 60
+        decision = evaluate(self.config, self.state, now, local_hour, self.curves)
+        self.last_decision = decision
+        self.telemetry.runs += 1
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.telemetry.decision_latency.add(elapsed_ms)
+        state = self.state
+        self.trace.record(DecisionRecord(
+            now,
+            trigger,
+            decision.reason,
+            decision.action,
+            (now - fired.timestamp()) * 1000 if fired is not None else elapsed_ms,
+            {
+                "someone_present": decision.someone_present,
+                "is_dark": decision.is_dark,
+                "illuminance": decision.illuminance,
+                "lights_on": state.lights_on,
+                "manual_override": state.manual_override,
+                "is_daytime": state.is_daytime,
+                "prevent_auto_on": decision.prevent_auto_on,
+                "bed_blocks_auto_on": decision.bed_blocks_auto_on,
+            },
+        ))
+        if self.config.enable_debug_logs:
+            _LOGGER.debug(
+                "[%s] %s -> %s (%s) present=%s dark=%s lux=%s",
+                self.config.room_name,
+                trigger,
+                decision.action,
+                decision.reason,
+                decision.someone_present,
+                decision.is_dark,
+                decision.illuminance,
+            )
+
+        if decision.clear_override:
+            _LOGGER.info(
+                "[%s] Override cleared: %s",
+                self.config.room_name,
+                decision.override_clear_reason,
+            )
+            self.state.manual_override = False
+            self.state.override_changed_at = now
+            self._write_helper("manual_override", False)
+            self._write_helper("light_auto_on", False)
+
+        if decision.action in (ACTION_TURN_ON, ACTION_TURN_OFF):
+            self._apply_action(decision, now, fired or now_dt, urgent)
+        self._arm_presence_fast_path()
+        self._async_schedule_next(now)
+
+    def _apply_action(self, decision: Decision, now: float, fired: datetime,
+                      urgent: bool = False) -> None:
+        """Issue the light command plus the blueprint's bookkeeping writes."""
+        turning_on = decision.action == ACTION_TURN_ON
+        # Optimistic: the echo of our own command must not re-trigger it
+        self.state.lights_on = turning_on
+        self.state.light_was_auto_on = turning_on
+        self.state.light_auto_on_changed_at = now
+        self._write_last_action(now)
+        self._write_helper("light_auto_on", turning_on)
+        direct = self._deferred_writes is not None
+        if direct:
+            self.telemetry.fast_path_runs += 1
+        self.hass.async_create_task(
+            self._async_send_light_command(decision, fired, urgent, direct)
+        )
+
+    async def _async_send_light_command(self, decision: Decision, fired: datetime,
+                                        urgent: bool = False, direct: bool = False) -> None:
+        """Send the decision's light/switch calls in order (batched if shared).
+
+        `direct` (the presence fast path) sends each call at once when the
+        batcher has nothing queued for its integration.
+        """
+        context = self._new_context()
+        now = dt_util.utcnow().timestamp()
+        calls = self._light_calls(decision, now)
+        if self.config.enable_debug_logs:
+            _LOGGER.debug(
+                "[%s] Action taken: %s, %d light(s) commanded, %d/%d on after it",
+                self.config.room_name,
+                decision.action,
+                sum(len(data["entity_id"]) for _, _, data in calls),
+                self.commands.lights_on(tuple(self._commanded_entities), now),
+                len(self._commanded_entities),
+            )
+        for index, (domain, service, data) in enumerate(calls):
+            if self.batcher is not None and direct:
+                dispatched = await self.batcher.async_send_now(domain, service, data, context)
+            elif self.batcher is not None:
+                dispatched = await self.batcher.async_submit(
+                    domain, service, data, context, urgent
+                )
+            else:
+                dispatched = dt_util.utcnow()
+                await self._async_call(domain, service, data, context, blocking=direct)
+            if index == 0:
+                self.telemetry.command_latency.add(
+                    (dispatched - fired).total_seconds() * 1000
+                )
+
+    def _light_calls(self, decision: Decision,
+                     now: float) -> list[tuple[str, str, dict[str, Any]]]:
+        """The (domain, service, data) calls that carry out a turn on/off.
+
+        Lights the CommandCache says are already there are left out (and a
+        call left with no entities is dropped).
+        """
+        cfg = self.config
+        turning_on = decision.action == ACTION_TURN_ON
+        data: dict[str, Any] = {}
+        if decision.transition:
+            data["transition"] = decision.transition
+
+        if cfg.control_mode != "switch_only" and cfg.has_lights:
+            calls: list[tuple[str, str, dict[str, Any]]] = []
+            if turning_on:
+                if cfg.control_mode == "switch_and_lights" and cfg.has_switch:
+                    switch = self.hass.states.get(cfg.light_switch)
+                    if switch is not None and switch.state == "off":
+                        calls.append(
+                            ("homeassistant", "turn_on", {"entity_id": cfg.light_switch})
+                        )
+                if decision.brightness_pct is not None and self.state.light_is_dimmable:
+                    data["brightness_pct"] = decision.brightness_pct
+                if decision.color_temp_kelvin:
+                    data["color_temp_kelvin"] = decision.color_temp_kelvin
+            if lights := self._lights_needing(cfg.light_entities, turning_on, data, now):
+                calls.append((
+                    "light",
+                    "turn_on" if turning_on else "turn_off",
+                    {"entity_id": lights, **data},
+                ))
+            return calls
+
+        if not cfg.has_switch:
+            return []
+        domain = "homeassistant"
+        service = "turn_on" if turning_on else "turn_off"
+        if cfg.light_switch.startswith("light."):
+            if turning_on and self.state.light_is_dimmable:
+                if cfg.enable_adaptive_brightness and decision.brightness_pct is not None:
+                    data["brightness_pct"] = decision.brightness_pct
+                if decision.color_temp_kelvin:
+                    data["color_temp_kelvin"] = decision.color_temp_kelvin
+                domain = "light"
+            elif not turning_on and decision.transition:
+                domain = "light"
+        if domain == "homeassistant":
+            data = {}
+        if not self._lights_needing((cfg.light_switch,), turning_on, data, now):
+            return []
+        return [(domain, service, {"entity_id": cfg.light_switch, **data})]
+
+    def _lights_needing(self, entity_ids: tuple[str, ...], turning_on: bool,
+                        data: dict[str, Any], now: float) -> list[str]:
+        """The entities not already in the state this command asks for."""
+        target = LightSnapshot(
+            turning_on, data.get("brightness_pct"), data.get("color_temp_kelvin")
+        )
+        needed = self.commands.filter(list(entity_ids), target, now, data.get("transition"))
+        self.telemetry.suppressed_commands += len(entity_ids) - len(needed)
+        return needed
+
+    # ------------------------------------------------------------------
+    # Deadlines
+    # ------------------------------------------------------------------
+
+    @callback
+    def _async_schedule_next(self, now: float) -> None:
+        """Register this room's earliest deadline with the shared scheduler."""
+        deadline = next_deadline(self.config, self.state, now)
+        if (
+            self.config.daytime_control_mode != "always_allow"
+            and self._sunrise_offset_ts is not None
+            and self._sunset_offset_ts is not None
+        ):
+            boundary = next_daytime_boundary(
+                now, self._sunrise_offset_ts, self._sunset_offset_ts
+            )
+            if boundary is not None and (deadline is None or boundary < deadline):
+                deadline = boundary
+
+        if deadline is None:
+            self.scheduler.async_cancel(self.entry.entry_id)
+        else:
+            self.scheduler.async_schedule(
+                self.entry.entry_id, deadline, self._async_deadline_reached
+            )
+
+    @callback
+    def _async_deadline_reached(self, now: float) -> None:
+        # The deadline may be a sun offset boundary
+        self._refresh_daytime(now)
+        self.coalescer.async_add(TRIGGER_TIMER)
+
+    # ------------------------------------------------------------------
+    # Service calls
+    # ------------------------------------------------------------------
+
+    def _new_context(self) -> Context:
+        context = Context()
+        self._own_contexts.append(context.id)
+        return context
+
+    async def _async_call(self, domain: str, service: str, data: dict[str, Any],
+                          context: Context, blocking: bool = False) -> None:
+        try:
+            await self.hass.services.async_call(
+                domain, service, data, blocking=blocking, context=context
+            )
+        except Exception:  # noqa: BLE001 - one bad entity must not stop the engine
+            _LOGGER.exception(
+                "[%s] %s.%s failed", self.config.room_name, domain, service
+            )
+
+    @callback
+    def _write_helper(self, key: str, on: bool) -> None:
+        """Set a wizard input_boolean helper (no-op if it is missing)."""
+        if self._deferred_writes is not None:
+            self._deferred_writes.append(lambda: self._write_helper(key, on))
+            return
+        entity_id = self.config.helper_entity_id("input_boolean", key)
+        current = self.hass.states.get(entity_id)
+        if current is None or (current.state == STATE_ON) == on:
+            return
+        self.hass.async_create_task(
+            self._async_call(
+                "input_boolean",
+                "turn_on" if on else "turn_off",
+                {"entity_id": entity_id},
+                self._new_context(),
+            )
+        )
+
+    @callback
+    def _write_last_action(self, now: float) -> None:
+        if self._deferred_writes is not None:
+            self._deferred_writes.append(lambda: self._write_last_action(now))
+            return
+        entity_id = self.config.helper_entity_id("input_datetime", "last_automation_action")
+        if self.hass.states.get(entity_id) is None:
+            return
+        self.hass.async_create_task(
+            self._async_call(
+                "input_datetime",
+                "set_datetime",
+                {"entity_id": entity_id, "timestamp": now},
+                self._new_context(),
+            )
+        )
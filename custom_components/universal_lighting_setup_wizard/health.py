@@ -0,0 +1,228 @@
+"""Sensor health monitor shared by every room and the house entry.
+
+The blueprint's watchdog checks the room's sensors inside the automation
+run and creates or dismisses a `<room>_sensor_health` notification there,
+so a dead sensor is only noticed when some other trigger happens to run the
+automation, and the check is repeated on every run of every room. Here one
+SensorHealthMonitor watches every configured sensor of every room:
+
+- the last update time of each sensor lives in one dict, fed by the state
+  events the monitor subscribes to;
+- each sensor has at most one pending deadline on the shared RoomScheduler,
+  armed only when it can go stale: UNAVAILABLE_GRACE_SECONDS after it went
+  unavailable / unknown or, for sensors with a maximum age (the outdoor lux
+  sensor, see daytime.STALE_SECONDS), max_age after its last update.
+  Updates inside the window do not touch the heap - the deadline re-checks
+  the sensor when it fires and re-arms for the newer reading;
+- a sensor with a maximum age and a min_value only ages while its last
+  reading is at or above min_value: an outdoor lux sensor legitimately
+  reports the same dark value all night, and Home Assistant does not bump
+  last_updated for identical reports.
+
+Nothing runs while every sensor is healthy. Changes are published per
+owner (SIGNAL_HEALTH_UPDATED, the room's "Sensor Health" binary sensor) and
+house-wide as one repair issue listing every stale sensor.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import partial
+import logging
+from typing import Iterable
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SIGNAL_HEALTH_UPDATED
+from .scheduler import RoomScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long a sensor may stay unavailable / unknown before it counts as stale
+# (the blueprint watchdog's 600 s)
+UNAVAILABLE_GRACE_SECONDS = 600
+ISSUE_STALE_SENSORS = "stale_sensors"
+
+_INVALID_STATES = ("", STATE_UNKNOWN, STATE_UNAVAILABLE)
+
+
+@dataclass(slots=True)
+class _Sensor:
+    """One watched sensor, shared by every owner that watches it."""
+
+    max_age: float | None = None
+    min_value: float | None = None
+    owners: dict[str, None] = field(default_factory=dict)
+    reason: str | None = None
+    deadline: float | None = None
+
+
+@dataclass(slots=True)
+class _Owner:
+    """A room (or the house entry) and the sensors it watches."""
+
+    label: str
+    entity_ids: tuple[str, ...]
+    unsub: CALLBACK_TYPE
+
+
+class SensorHealthMonitor:
+    """Staleness of every configured sensor, detected by deadline."""
+
+    def __init__(self, hass: HomeAssistant, scheduler: RoomScheduler) -> None:
+        """Initialize a monitor that watches nothing yet."""
+        self.hass = hass
+        self.scheduler = scheduler
+        # entity_id -> POSIX time of its last state report
+        self.last_update: dict[str, float] = {}
+        self._sensors: dict[str, _Sensor] = {}
+        self._owners: dict[str, _Owner] = {}
+        # None until the first update, so an issue left from before a restart
+        # is reconciled
+        self._issue_lines: tuple[str, ...] | None = None
+
+    @callback
+    def async_watch(self, owner_id: str, label: str, entity_ids: list[str],
+                    max_age: float | None = None,
+                    min_value: float | None = None) -> CALLBACK_TYPE:
+        """Watch an owner's sensors; returns the callback that stops it."""
+        self.async_unwatch(owner_id)
+        entity_ids = tuple(dict.fromkeys(e for e in entity_ids if e))
+        unsub = async_track_state_change_event(self.hass, entity_ids, self._async_state_changed)
+        self._owners[owner_id] = _Owner(label, entity_ids, unsub)
+        now = dt_util.utcnow().timestamp()
+        for entity_id in entity_ids:
+            if (sensor := self._sensors.get(entity_id)) is None:
+                sensor = self._sensors[entity_id] = _Sensor(max_age, min_value)
+            sensor.owners[owner_id] = None
+            if (state := self.hass.states.get(entity_id)) is not None:
+                self.last_update[entity_id] = state.last_updated.timestamp()
+            self._async_check(entity_id, now, publish=False)
+        self._async_publish({owner_id})
+        return lambda: self.async_unwatch(owner_id)
+
+    @callback
+    def async_unwatch(self, owner_id: str) -> None:
+        """Stop watching an owner's sensors (no-op if it is not watched)."""
+        if (owner := self._owners.pop(owner_id, None)) is None:
+            return
+        owner.unsub()
+        for entity_id in owner.entity_ids:
+            sensor = self._sensors[entity_id]
+            del sensor.owners[owner_id]
+            if not sensor.owners:
+                del self._sensors[entity_id]
+                self.last_update.pop(entity_id, None)
+                self.scheduler.async_cancel(("health", entity_id))
+        self._async_update_issue()
+
+    def stale_sensors(self, owner_id: str) -> dict[str, str]:
+        """The owner's stale sensors and why (unavailable / no_updates)."""
+        owner = self._owners.get(owner_id)
+        if owner is None:
+            return {}
+        return {
+            entity_id: reason
+            for entity_id in owner.entity_ids
+            if (reason := self._sensors[entity_id].reason) is not None
+        }
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        entity_id: str = event.data["entity_id"]
+        if entity_id not in self._sensors:
+            return
+        new_state: State | None = event.data.get("new_state")
+        now = dt_util.utcnow().timestamp()
+        if new_state is not None:
+            self.last_update[entity_id] = new_state.last_updated.timestamp()
+        self._async_check(entity_id, now)
+
+    @callback
+    def _async_deadline(self, entity_id: str, now: float) -> None:
+        if (sensor := self._sensors.get(entity_id)) is None:
+            return
+        sensor.deadline = None
+        self._async_check(entity_id, now)
+
+    @callback
+    def _async_check(self, entity_id: str, now: float, publish: bool = True) -> None:
+        """Re-evaluate one sensor; arm its deadline if it can still go stale."""
+        sensor = self._sensors[entity_id]
+        reason, deadline = self._evaluate(sensor, entity_id, now)
+        if deadline is None:
+            if sensor.deadline is not None:
+                sensor.deadline = None
+                self.scheduler.async_cancel(("health", entity_id))
+        elif sensor.deadline is None or deadline < sensor.deadline:
+            # A later deadline is left to the pending one, which re-checks
+            sensor.deadline = deadline
+            self.scheduler.async_schedule(
+                ("health", entity_id), deadline, partial(self._async_deadline, entity_id)
+            )
+        if reason == sensor.reason:
+            return
+        if reason is not None:
+            _LOGGER.warning("Sensor %s is stale (%s)", entity_id, reason)
+        else:
+            _LOGGER.info("Sensor %s is reporting again", entity_id)
+        sensor.reason = reason
+        if publish:
+            self._async_publish(sensor.owners)
+
+    def _evaluate(self, sensor: _Sensor, entity_id: str,
+                  now: float) -> tuple[str | None, float | None]:
+        """(why it is stale, or None; when it would go stale, or None)."""
+        state = self.hass.states.get(entity_id)
+        if state is None:
+            # Not created yet - usually its integration is still loading
+            return None, None
+        if state.state in _INVALID_STATES:
+            deadline = state.last_changed.timestamp() + UNAVAILABLE_GRACE_SECONDS
+            return ("unavailable", None) if deadline <= now else (None, deadline)
+        if sensor.max_age is None:
+            return None, None
+        if sensor.min_value is not None:
+            try:
+                if float(state.state) < sensor.min_value:
+                    return None, None
+            except ValueError:
+                pass
+        last_update = self.last_update.get(entity_id, state.last_updated.timestamp())
+        deadline = last_update + sensor.max_age
+        return ("no_updates", None) if deadline <= now else (None, deadline)
+
+    @callback
+    def _async_publish(self, owner_ids: Iterable[str]) -> None:
+        for owner_id in owner_ids:
+            async_dispatcher_send(self.hass, f"{SIGNAL_HEALTH_UPDATED}_{owner_id}")
+        self._async_update_issue()
+
+    @callback
+    def _async_update_issue(self) -> None:
+        """One repair issue for the whole house, deleted once all is well."""
+        lines = tuple(
+            f"- {owner.label}: `{entity_id}` ({sensor.reason})"
+            for owner in self._owners.values()
+            for entity_id in owner.entity_ids
+            if (sensor := self._sensors[entity_id]).reason is not None
+        )
+        if lines == self._issue_lines:
+            return
+        self._issue_lines = lines
+        if not lines:
+            ir.async_delete_issue(self.hass, DOMAIN, ISSUE_STALE_SENSORS)
+            return
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            ISSUE_STALE_SENSORS,
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key=ISSUE_STALE_SENSORS,
+            translation_placeholders={"sensors": "\n".join(lines)},
+        )
@@ -0,0 +1,71 @@
+"""Create room helpers through the helper domains' UI storage collections.
+
+The YAML backend writes a package file and then calls `<domain>.reload`,
+which tears down and recreates EVERY helper of that domain - seconds of
+event-loop stall and a burst of `unavailable` states on installs with
+hundreds of helpers. Here each helper is added to its domain's storage
+collection instead (the same path as Settings -> Helpers -> Create): the
+collection sets up just the new entity, no reload is involved, and the cost
+per room stays constant however many helpers exist.
+
+input_boolean / input_datetime / input_text don't expose their collections
+directly; they are reached through the `<domain>/create` websocket command
+the collection registered, which is what the frontend calls.
+"""
+from __future__ import annotations
+
+import inspect
+import logging
+from typing import Any
+
+from homeassistant.components import websocket_api
+from homeassistant.const import CONF_ID, CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import collection
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StorageCollectionUnavailable(Exception):
+    """A helper domain's storage collection could not be found."""
+
+
+def storage_collection(hass: HomeAssistant, domain: str) -> collection.StorageCollection:
+    """Return the UI storage collection behind `<domain>/create`."""
+    handlers = hass.data.get(websocket_api.DOMAIN, {})
+    if (registered := handlers.get(f"{domain}/create")) is not None:
+        owner = getattr(inspect.unwrap(registered[0]), "__self__", None)
+        storage = getattr(owner, "storage_collection", None)
+        if isinstance(storage, collection.StorageCollection):
+            return storage
+    raise StorageCollectionUnavailable(domain)
+
+
+async def async_create_helpers(
+    hass: HomeAssistant, helpers_config: dict[str, dict[str, dict[str, Any]]]
+) -> list[str]:
+    """Create the helpers in `helpers_config` (domain -> object_id -> config).
+
+    Helpers that already exist (an orphan from a failed run, or a YAML helper
+    with the same id) are reused, like the YAML backend does. Returns the
+    entity ids that were created.
+    """
+    created = []
+    for domain, helpers in helpers_config.items():
+        storage = storage_collection(hass, domain)
+        for object_id, config in helpers.items():
+            entity_id = f"{domain}.{object_id}"
+            if object_id in storage.data or hass.states.get(entity_id) is not None:
+                continue
+            # The collection derives the item id (and so the entity id) from
+            # the name's slug, which needn't match the blueprint's sanitized
+            # room name for non-ASCII names - create under the object id,
+            # then give the helper its display name.
+            item = await storage.async_create_item({**config, CONF_NAME: object_id})
+            if item[CONF_ID] != object_id:
+                await storage.async_delete_item(item[CONF_ID])
+                raise ValueError(f"{entity_id} is taken by another helper")
+            await storage.async_update_item(object_id, config)
+            created.append(entity_id)
+    _LOGGER.debug("Created storage helpers: %s", ", ".join(created) or "none")
+    return created
@@ -0,0 +1,127 @@
+"""Fixed-size illuminance ring buffer with the blueprint's spike/drop filter.
+
+The blueprint keeps its averaging history as a comma-separated string in
+`input_text.<room>_illuminance_history`: every run re-parses it, every lux
+change re-serializes it with a service call (a state write and a recorder row),
+and the helper's 255-character max_length caps the window at a handful of
+samples. IlluminanceWindow holds the same history as floats in a preallocated
+ring, so adding a sample and reading the mean are O(1) whatever the window.
+
+With the default window of 5 it reproduces the blueprint exactly:
+- sharp drop (lights just went off) - reset to the new reading, trust it
+- sharp spike (flash/headlights) - report the previous average; the sample
+  is still stored, like the blueprint's history update does
+- otherwise - mean of the last `size` samples including the new one
+
+Blueprint rooms created by the wizard read the room's Filtered Illuminance
+sensor (its `filtered_illuminance_sensor` input) instead of the helper.
+
+Deliberately free of Home Assistant imports (see decision.py).
+"""
+from __future__ import annotations
+
+from typing import Hashable, Iterable
+
+DEFAULT_WINDOW = 5
+MIN_WINDOW = 2
+MAX_WINDOW = 600
+
+
+def filtered_illuminance_entity_id(sanitized_room_name: str) -> str:
+    """Entity id of a room's "Filtered Illuminance" sensor."""
+    return f"sensor.{sanitized_room_name}_filtered_illuminance"
+
+
+class IlluminanceWindow:
+    """Ring buffer of the last `size` illuminance samples plus a running sum."""
+
+    __slots__ = ("size", "value", "last_key", "_buf", "_start", "_count", "_sum", "_appends")
+
+    def __init__(self, size: int = DEFAULT_WINDOW) -> None:
+        """Initialize an empty window."""
+        self.size = max(MIN_WINDOW, min(MAX_WINDOW, int(size)))
+        # Filtered illuminance as of the last update() (None until the first)
+        self.value: float | None = None
+        # Identity of the last sample folded in (see update())
+        self.last_key: Hashable | None = None
+        self._buf = [0.0] * self.size
+        self._start = 0
+        self._count = 0
+        self._sum = 0.0
+        self._appends = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def mean(self) -> float | None:
+        """Average of the stored samples (None when empty)."""
+        return self._sum / self._count if self._count else None
+
+    @property
+    def samples(self) -> list[float]:
+        """Stored samples, oldest first (O(size) - for persistence only)."""
+        buf, size = self._buf, self.size
+        return [buf[(self._start + i) % size] for i in range(self._count)]
+
+    def clear(self) -> None:
+        self._start = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def append(self, sample: float) -> None:
+        """Store one sample, evicting the oldest once the window is full."""
+        sample = round(sample, 2)
+        size = self.size
+        if self._count < size:
+            self._buf[(self._start + self._count) % size] = sample
+            self._count += 1
+            self._sum += sample
+        else:
+            self._sum += sample - self._buf[self._start]
+            self._buf[self._start] = sample
+            self._start = (self._start + 1) % size
+        self._appends += 1
+        if self._appends >= size:
+            # Re-add from scratch once per lap so float error cannot accumulate
+            self._appends = 0
+            self._sum = sum(self._buf[(self._start + i) % size] for i in range(self._count))
+
+    def update(self, raw: float, dark_threshold: float, bright_threshold: float,
+               key: Hashable | None = None) -> bool:
+        """Fold in a new reading and recompute `value`.
+
+        `key` identifies the reading (the source state's last_updated) so the
+        sensor entity and the engine can both feed the same window from their
+        own listeners: only the first call for a given key does anything.
+        Returns whether the sample was folded in.
+        """
+        if key is not None and key == self.last_key:
+            return False
+        self.last_key = key
+        last_avg = self.mean
+        if last_avg is None:
+            self.append(raw)
+            self.value = round(raw, 2)
+            return True
+        change_ratio = raw / last_avg if last_avg > 0 else 1
+        if change_ratio < 0.3 and last_avg > max(dark_threshold, 10):
+            # Major drop - lights just went off - trust it immediately
+            self.clear()
+            self.append(raw)
+            self.value = round(raw, 2)
+        elif change_ratio > 5 and raw > max(bright_threshold * 3, 200):
+            # Major spike - flash/lightning - reject this sample
+            self.append(raw)
+            self.value = round(last_avg, 2)
+        else:
+            self.append(raw)
+            self.value = round(self._sum / self._count, 2)
+        return True
+
+    def restore(self, samples: Iterable[float], value: float | None) -> None:
+        """Reload persisted samples (keeping the newest if the window shrank)."""
+        self.clear()
+        for sample in list(samples)[-self.size:]:
+            self.append(float(sample))
+        self.value = value if self._count else None
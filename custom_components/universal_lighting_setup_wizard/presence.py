@@ -0,0 +1,125 @@
+"""House-wide "someone home" aggregate shared by every block_when_away room.
+
+With daytime control set to block_when_away the blueprint works out
+`someone_home` by expanding the room's device trackers on every run, and
+its debug summary expands them again for the names. Rooms usually point at
+the same family phones, so every 5 s the same O(trackers) scan is repeated
+once per room. Here one HomePresence keeps the answer instead:
+
+- rooms watching the same trackers share one _Group, keyed by the tracker
+  set; a room joining an existing group reuses its cached state and scans
+  nothing;
+- each group subscribes to its trackers' state events and keeps the set of
+  trackers currently home, updated in O(1) per tracker change;
+- someone_home() is a set-emptiness check, so rooms (the native engine, the
+  room's "Someone Home" binary sensor and through it the blueprint) read it
+  in O(1) whatever the number of trackers.
+
+Changes are published per owner (SIGNAL_HOME_PRESENCE_UPDATED suffixed with
+the entry_id) whenever the set of home trackers changes.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import partial
+import logging
+from typing import Iterable
+
+from homeassistant.const import STATE_HOME
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import SIGNAL_HOME_PRESENCE_UPDATED
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def someone_home_entity_id(sanitized_room_name: str) -> str:
+    """Entity id of a room's "Someone Home" binary sensor."""
+    return f"binary_sensor.{sanitized_room_name}_someone_home"
+
+
+@dataclass(slots=True)
+class _Group:
+    """One distinct tracker set, shared by every owner watching exactly it."""
+
+    trackers: frozenset[str]
+    home: set[str] = field(default_factory=set)
+    owners: dict[str, None] = field(default_factory=dict)
+    unsub: CALLBACK_TYPE | None = None
+
+
+class HomePresence:
+    """Which watched device trackers are home, kept per tracker set."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an aggregate that watches nothing yet."""
+        self.hass = hass
+        self._groups: dict[frozenset[str], _Group] = {}
+        # owner_id -> the tracker set (group key) it watches
+        self._owners: dict[str, frozenset[str]] = {}
+
+    @callback
+    def async_watch(self, owner_id: str, trackers: Iterable[str]) -> CALLBACK_TYPE:
+        """Watch an owner's trackers; returns the callback that stops it."""
+        self.async_unwatch(owner_id)
+        key = frozenset(t for t in trackers if t)
+        if (group := self._groups.get(key)) is None:
+            group = self._groups[key] = _Group(key)
+            group.home.update(t for t in key if self._is_home(self.hass.states.get(t)))
+            if key:
+                group.unsub = async_track_state_change_event(
+                    self.hass, sorted(key), partial(self._async_tracker_changed, group)
+                )
+        group.owners[owner_id] = None
+        self._owners[owner_id] = key
+        return lambda: self.async_unwatch(owner_id)
+
+    @callback
+    def async_unwatch(self, owner_id: str) -> None:
+        """Stop watching an owner's trackers (no-op if it is not watched)."""
+        if (key := self._owners.pop(owner_id, None)) is None:
+            return
+        group = self._groups[key]
+        del group.owners[owner_id]
+        if not group.owners:
+            if group.unsub is not None:
+                group.unsub()
+            del self._groups[key]
+
+    def is_watched(self, owner_id: str) -> bool:
+        return owner_id in self._owners
+
+    def someone_home(self, owner_id: str) -> bool:
+        """Whether any of the owner's trackers is home (True if it has none)."""
+        if (key := self._owners.get(owner_id)) is None or not key:
+            return True
+        return bool(self._groups[key].home)
+
+    def home_names(self, owner_id: str) -> list[str]:
+        """Friendly names of the owner's trackers that are home, sorted."""
+        if (key := self._owners.get(owner_id)) is None:
+            return []
+        states = self.hass.states
+        return sorted(
+            s.name if (s := states.get(t)) is not None else t
+            for t in self._groups[key].home
+        )
+
+    @staticmethod
+    def _is_home(state: State | None) -> bool:
+        return state is not None and state.state == STATE_HOME
+
+    @callback
+    def _async_tracker_changed(self, group: _Group, event: Event) -> None:
+        entity_id: str = event.data["entity_id"]
+        is_home = self._is_home(event.data.get("new_state"))
+        if (entity_id in group.home) == is_home:
+            return
+        if is_home:
+            group.home.add(entity_id)
+        else:
+            group.home.discard(entity_id)
+        for owner_id in list(group.owners):
+            async_dispatcher_send(self.hass, f"{SIGNAL_HOME_PRESENCE_UPDATED}_{owner_id}")
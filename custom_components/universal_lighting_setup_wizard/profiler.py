@@ -0,0 +1,269 @@
+"""Opt-in per-variable render profiler for the wizard's blueprint automations.
+
+The blueprint's `variables:` block has ~160 templates and is rendered in
+full at the start of every run; the Template Render Time sensor only shows
+their sum. While a room's "Template Profiling" switch is on, the room's
+automation entity gets its ScriptVariables swapped for a _ProfiledVariables
+that renders the same variables in the same order - with the same results -
+but times each one. Per variable only a call count, the total and the
+maximum are kept, so the store is bounded by the number of variables
+whatever the run count. Turning the switch off puts the original object
+back; the numbers stay for the room's diagnostics until profiling restarts.
+
+Reloading automations replaces the entities, so profiled automations are
+re-wrapped on every `automation_reloaded` event.
+
+This depends on Home Assistant internals: the automation entity's private
+`_variables` attribute and ScriptVariables' `_has_template` cache (both as
+of 2024.1). They are checked before every swap. If a release renames them,
+turning profiling on fails with ProfilingUnsupported, and profiling that
+was already running stops with a Repairs issue, instead of the automation
+failing partway through a run.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any
+
+from homeassistant.components.automation import EVENT_AUTOMATION_RELOADED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er, issue_registry as ir, template
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.script_variables import ScriptVariables
+
+from .const import DOMAIN, SIGNAL_PROFILING_STOPPED
+
+_LOGGER = logging.getLogger(__name__)
+
+AUTOMATION_DOMAIN = "automation"
+# Variables tracked per automation (the blueprint has ~160)
+MAX_VARIABLES = 512
+ISSUE_PROFILING_UNSUPPORTED = "template_profiling_unsupported"
+# The Home Assistant internals swapped / reused here (see the module docstring)
+ENTITY_VARIABLES_ATTR = "_variables"
+HAS_TEMPLATE_ATTR = "_has_template"
+
+
+class ProfilingUnsupported(HomeAssistantError):
+    """This Home Assistant release lacks the internals the profiler relies on."""
+
+
+def _unsupported_reason(entity: Any) -> str | None:
+    """Why the entity's variables cannot be profiled here, or None if they can."""
+    if not hasattr(entity, ENTITY_VARIABLES_ATTR):
+        return f"automation entities have no {ENTITY_VARIABLES_ATTR} attribute"
+    variables = getattr(entity, ENTITY_VARIABLES_ATTR)
+    if isinstance(variables, ScriptVariables) and not hasattr(variables, HAS_TEMPLATE_ATTR):
+        return f"ScriptVariables has no {HAS_TEMPLATE_ATTR} attribute"
+    return None
+
+
+@dataclass(slots=True)
+class VariableStats:
+    """Render cost of one variable across runs."""
+
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def add(self, ms: float) -> None:
+        self.calls += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+
+@dataclass
+class AutomationProfile:
+    """Everything recorded for one automation since profiling started."""
+
+    automation_id: str
+    runs: int = 0
+    total_ms: float = 0.0
+    variables: dict[str, VariableStats] = field(default_factory=dict)
+    dropped_variables: int = 0
+
+    def record(self, name: str, ms: float) -> None:
+        if (stats := self.variables.get(name)) is None:
+            if len(self.variables) >= MAX_VARIABLES:
+                self.dropped_variables += 1
+                return
+            stats = self.variables[name] = VariableStats()
+        stats.add(ms)
+
+    def report(self) -> dict[str, Any]:
+        """Variables by total render time, most expensive first."""
+        total = self.total_ms or 1.0
+        return {
+            "runs": self.runs,
+            "mean_block_ms": round(self.total_ms / self.runs, 3) if self.runs else None,
+            "dropped_variables": self.dropped_variables,
+            "variables": [
+                {
+                    "name": name,
+                    "calls": stats.calls,
+                    "total_ms": round(stats.total_ms, 3),
+                    "mean_ms": round(stats.total_ms / stats.calls, 4),
+                    "max_ms": round(stats.max_ms, 3),
+                    "share_pct": round(100 * stats.total_ms / total, 1),
+                }
+                for name, stats in sorted(
+                    self.variables.items(), key=lambda item: item[1].total_ms, reverse=True
+                )
+            ],
+        }
+
+
+class _ProfiledVariables(ScriptVariables):
+    """An automation's variables, rendered one at a time under a stopwatch."""
+
+    def __init__(self, wrapped: ScriptVariables, profile: AutomationProfile) -> None:
+        super().__init__(wrapped.variables)
+        self.wrapped = wrapped
+        self.profile = profile
+
+    @callback
+    def async_render(
+        self,
+        hass: HomeAssistant,
+        run_variables: Mapping[str, Any] | None,
+        *,
+        render_as_defaults: bool = True,
+        limited: bool = False,
+    ) -> dict[str, Any]:
+        """ScriptVariables.async_render, timing each variable."""
+        if self._has_template is None:
+            self._has_template = template.is_complex(self.variables)
+            template.attach(hass, self.variables)
+        if not self._has_template:
+            return self.wrapped.async_render(
+                hass, run_variables, render_as_defaults=render_as_defaults, limited=limited
+            )
+
+        profile = self.profile
+        perf_counter = time.perf_counter
+        rendered_variables = {} if run_variables is None else dict(run_variables)
+        block_started = perf_counter()
+        for key, value in self.variables.items():
+            if render_as_defaults and key in rendered_variables:
+                continue
+            started = perf_counter()
+            rendered_variables[key] = template.render_complex(
+                value, rendered_variables, limited
+            )
+            profile.record(key, (perf_counter() - started) * 1000)
+        profile.runs += 1
+        profile.total_ms += (perf_counter() - block_started) * 1000
+        return rendered_variables
+
+
+class TemplateProfiler:
+    """Wraps and unwraps the variables of profiled blueprint automations."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize a profiler that profiles nothing yet."""
+        self.hass = hass
+        self.profiles: dict[str, AutomationProfile] = {}
+        self._active: set[str] = set()
+        self._unsub_reload: CALLBACK_TYPE | None = None
+
+    def is_active(self, automation_id: str) -> bool:
+        return automation_id in self._active
+
+    @callback
+    def async_start(self, automation_id: str) -> None:
+        """Start profiling an automation (by unique id) from a clean slate.
+
+        Raises ProfilingUnsupported if this Home Assistant release lacks the
+        internals the profiler relies on.
+        """
+        if (entity := self._automation_entity(automation_id)) is not None and (
+            reason := _unsupported_reason(entity)
+        ) is not None:
+            raise ProfilingUnsupported(
+                f"Template profiling does not support this Home Assistant version: {reason}"
+            )
+        ir.async_delete_issue(self.hass, DOMAIN, ISSUE_PROFILING_UNSUPPORTED)
+        self.profiles[automation_id] = AutomationProfile(automation_id)
+        self._active.add(automation_id)
+        self._async_wrap(automation_id)
+        if self._unsub_reload is None:
+            self._unsub_reload = self.hass.bus.async_listen(
+                EVENT_AUTOMATION_RELOADED, self._async_reloaded
+            )
+
+    @callback
+    def async_stop(self, automation_id: str) -> None:
+        """Stop profiling; the recorded numbers are kept for diagnostics."""
+        if automation_id not in self._active:
+            return
+        self._active.discard(automation_id)
+        if (entity := self._automation_entity(automation_id)) is not None:
+            variables = getattr(entity, ENTITY_VARIABLES_ATTR, None)
+            if isinstance(variables, _ProfiledVariables):
+                setattr(entity, ENTITY_VARIABLES_ATTR, variables.wrapped)
+        if not self._active and self._unsub_reload is not None:
+            self._unsub_reload()
+            self._unsub_reload = None
+
+    def report(self, automation_id: str) -> dict[str, Any] | None:
+        """The sorted per-variable report, or None if never profiled."""
+        if (profile := self.profiles.get(automation_id)) is None:
+            return None
+        return {"active": self.is_active(automation_id), **profile.report()}
+
+    def _automation_entity(self, automation_id: str) -> Any:
+        entity_id = er.async_get(self.hass).async_get_entity_id(
+            AUTOMATION_DOMAIN, AUTOMATION_DOMAIN, automation_id
+        )
+        component = self.hass.data.get(AUTOMATION_DOMAIN)
+        if entity_id is None or component is None:
+            return None
+        return component.get_entity(entity_id)
+
+    @callback
+    def _async_wrap(self, automation_id: str) -> None:
+        entity = self._automation_entity(automation_id)
+        variables = getattr(entity, ENTITY_VARIABLES_ATTR, None)
+        if isinstance(variables, _ProfiledVariables):
+            variables.profile = self.profiles[automation_id]
+        elif isinstance(variables, ScriptVariables):
+            setattr(
+                entity,
+                ENTITY_VARIABLES_ATTR,
+                _ProfiledVariables(variables, self.profiles[automation_id]),
+            )
+        else:
+            _LOGGER.warning(
+                "Automation %s not found or has no variables; profiling starts "
+                "once it is (re)loaded", automation_id
+            )
+
+    @callback
+    def _async_reloaded(self, _event: Event) -> None:
+        for automation_id in list(self._active):
+            entity = self._automation_entity(automation_id)
+            if entity is not None and (reason := _unsupported_reason(entity)) is not None:
+                self._async_unsupported(automation_id, reason)
+            else:
+                self._async_wrap(automation_id)
+
+    @callback
+    def _async_unsupported(self, automation_id: str, reason: str) -> None:
+        """Stop profiling an automation the running release cannot profile."""
+        _LOGGER.error("Stopped template profiling of %s: %s", automation_id, reason)
+        self.async_stop(automation_id)
+        async_dispatcher_send(self.hass, f"{SIGNAL_PROFILING_STOPPED}_{automation_id}")
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            ISSUE_PROFILING_UNSUPPORTED,
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key=ISSUE_PROFILING_UNSUPPORTED,
+            translation_placeholders={"automation_id": automation_id, "reason": reason},
+        )
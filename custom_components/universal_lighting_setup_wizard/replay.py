@@ -0,0 +1,562 @@
+"""Offline replay of a room's lighting decisions over recorder history.
+
+Tuning dark/bright thresholds, vacancy timeouts or the outdoor-lux band on a
+live system means waiting days per attempt. This module takes a recorder
+export of the room's entities - the history panel's CSV download or the
+recorder's SQLite database - and replays the blueprint's decision logic over
+the whole timeline at once:
+
+- every entity is forward-filled onto a fixed time grid (default 5 s, the
+  blueprint's periodic_check cadence) with np.searchsorted
+- presence, darkness, bed, daytime gate and away blocking become boolean
+  arrays; "would turn on" / "would turn off" are array expressions
+- the lights' on/off state is a set/reset latch solved with two cumulative
+  maxima, so no Python loop runs per grid step
+
+The only sequential pass is the illuminance spike/drop filter, which runs
+once per (thresholds, window) combination over the lux samples and is
+cached, so a sweep over vacancy or daytime settings never repeats it.
+
+Scope: automatic behaviour only. Manual overrides are not re-derived (the
+export has no service-call contexts); if the room's manual_override helper
+is in the export, automatic control is simply held while it was on. Indoor
+lux is replayed as recorded, so it includes whatever the real lights did.
+
+Needs NumPy, which the integration itself does not. Usage, from the
+repository root:
+
+    python -m custom_components.universal_lighting_setup_wizard.replay \\
+        history.csv --entries /config/.storage/core.config_entries --room office \\
+        --sweep dark_threshold=20,30,40 --sweep vacancy_timeout_multiplier=3,5,8
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+from dataclasses import dataclass, fields, replace
+from datetime import date, datetime, time, timedelta, tzinfo
+import itertools
+import json
+import sqlite3
+from typing import Any, Iterable, Mapping, Sequence
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .daytime import DAYTIME_SOURCE_LUX, DAYTIME_SOURCE_SUN, DaytimeParams
+from .decision import (
+    BED_INVALID_GRACE_SECONDS,
+    FALLBACK_SUNRISE_HOUR,
+    FALLBACK_SUNSET_HOUR,
+    RoomConfig,
+)
+from .illuminance import IlluminanceWindow
+
+SUN_ENTITY = "sun.sun"
+# Blueprint periodic_check cadence
+DEFAULT_STEP_SECONDS = 5.0
+# An on or off stretch shorter than this counts as a flap
+DEFAULT_FLAP_SECONDS = 120.0
+_INVALID_STATES = ("", "unknown", "unavailable")
+
+
+@dataclass(slots=True)
+class ReplayResult:
+    """Outcome of one replay."""
+
+    params: dict[str, Any]
+    intervals: list[tuple[float, float]]
+    on_minutes: float
+    turn_ons: int
+    flaps: int
+
+    def summary(self) -> str:
+        settings = " ".join(f"{k}={v}" for k, v in self.params.items())
+        return (
+            f"{settings or 'baseline'}: on {self.on_minutes:.0f} min, "
+            f"{self.turn_ons} turn-ons, {self.flaps} flaps"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+class Timeline:
+    """State changes per entity as sorted (timestamps, states) arrays.
+
+    Consecutive rows with the same state (attribute-only updates) are
+    dropped, so every stored row is a real state change.
+    """
+
+    def __init__(self, rows: Iterable[tuple[str, str, float]]) -> None:
+        """Build from (entity_id, state, POSIX timestamp) rows in any order."""
+        grouped: dict[str, list[tuple[float, str]]] = {}
+        for entity_id, state, ts in rows:
+            grouped.setdefault(entity_id, []).append((ts, state))
+        self.events: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        start, end = np.inf, -np.inf
+        for entity_id, changes in grouped.items():
+            changes.sort(key=lambda change: change[0])
+            kept = [changes[0]]
+            for change in changes[1:]:
+                if change[1] != kept[-1][1]:
+                    kept.append(change)
+            ts = np.fromiter((c[0] for c in kept), dtype=np.float64, count=len(kept))
+            states = np.array([c[1] for c in kept], dtype=object)
+            self.events[entity_id] = (ts, states)
+            start, end = min(start, ts[0]), max(end, ts[-1])
+        if not self.events:
+            raise ValueError("Export contains no rows for the room's entities")
+        self.start = float(start)
+        self.end = float(end)
+
+    @classmethod
+    def from_csv(cls, path: str, entities: Iterable[str] | None = None) -> Timeline:
+        """History-panel CSV: entity_id, state, last_changed (ISO 8601)."""
+        wanted = set(entities) if entities is not None else None
+        rows = []
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            time_column = "last_changed" if "last_changed" in (reader.fieldnames or ()) else "last_updated"
+            for row in reader:
+                entity_id = row["entity_id"]
+                if wanted is not None and entity_id not in wanted:
+                    continue
+                stamp = datetime.fromisoformat(row[time_column].replace("Z", "+00:00"))
+                rows.append((entity_id, row["state"], stamp.timestamp()))
+        return cls(rows)
+
+    @classmethod
+    def from_sqlite(cls, path: str, entities: Iterable[str]) -> Timeline:
+        """Recorder database (schema with states_meta, HA 2023.4+)."""
+        entities = list(entities)
+        marks = ",".join("?" * len(entities))
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            rows = connection.execute(
+                "SELECT m.entity_id, s.state, s.last_updated_ts FROM states s "
+                "JOIN states_meta m ON s.metadata_id = m.metadata_id "
+                f"WHERE m.entity_id IN ({marks}) AND s.last_updated_ts IS NOT NULL",
+                entities,
+            ).fetchall()
+        finally:
+            connection.close()
+        return cls((entity_id, state or "", ts) for entity_id, state, ts in rows)
+
+    @classmethod
+    def load(cls, path: str, entities: Iterable[str]) -> Timeline:
+        if path.endswith((".db", ".sqlite", ".sqlite3")):
+            return cls.from_sqlite(path, entities)
+        return cls.from_csv(path, entities)
+
+
+def room_entities(config: RoomConfig, daytime: DaytimeParams) -> list[str]:
+    """Every entity a replay of this room reads."""
+    entities = [
+        config.presence_pir_sensor,
+        config.presence_mmwave_sensor,
+        config.illuminance_sensor,
+        config.light_switch,
+        *config.light_entities,
+        config.bed_occupied_helper,
+        config.sensor_off_latency_entity,
+        *config.presence_trackers,
+        config.helper_entity_id("input_boolean", "manual_override"),
+        SUN_ENTITY,
+        daytime.outdoor_lux_sensor,
+    ]
+    return list(dict.fromkeys(e for e in entities if e))
+
+
+# ---------------------------------------------------------------------------
+# Array helpers
+# ---------------------------------------------------------------------------
+
+def _latch(set_: np.ndarray, reset: np.ndarray, initial: bool) -> np.ndarray:
+    """Set/reset flip-flop over time: on after a set until the next reset."""
+    idx = np.arange(len(set_), dtype=np.int32)
+    last_set = np.maximum.accumulate(np.where(set_, idx, -1))
+    last_reset = np.maximum.accumulate(np.where(reset, idx, -1))
+    on = last_set > last_reset
+    if initial:
+        on |= (last_set < 0) & (last_reset < 0)
+    return on
+
+
+def _runs(on: np.ndarray, t: np.ndarray, end: float) -> tuple[np.ndarray, np.ndarray]:
+    """Start/end times of each stretch where `on` holds."""
+    edges = np.diff(on.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    bounds = np.append(t, end)
+    return bounds[starts], bounds[stops]
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+class Replayer:
+    """Replays one room over a Timeline; reuse it for sweeps."""
+
+    def __init__(self, timeline: Timeline, step: float = DEFAULT_STEP_SECONDS,
+                 flap_seconds: float = DEFAULT_FLAP_SECONDS,
+                 tz: tzinfo | None = None) -> None:
+        """Lay the fixed time grid over the timeline."""
+        self.timeline = timeline
+        self.flap_seconds = flap_seconds
+        self.tz = tz
+        self.t = np.arange(timeline.start, timeline.end, step, dtype=np.float64)
+        if len(self.t) < 2:
+            raise ValueError("Export spans less than two replay steps")
+        # Everything below depends on the export, not on the settings being
+        # swept, so each is computed once per key and reused by every run
+        self._index_cache: dict[str, np.ndarray] = {}
+        self._signal_cache: dict[tuple, np.ndarray] = {}
+        self._lux_cache: dict[tuple, np.ndarray] = {}
+        self._daytime_cache: dict[tuple, np.ndarray] = {}
+        self._presence_cache: dict[tuple, tuple[np.ndarray, np.ndarray]] = {}
+
+    # -- forward-filled signals --
+
+    def _index(self, entity_id: str) -> np.ndarray:
+        """Per grid step: index of the entity's latest change (-1 = none yet)."""
+        if (cached := self._index_cache.get(entity_id)) is None:
+            ts, _ = self.timeline.events[entity_id]
+            cached = np.searchsorted(ts, self.t, side="right") - 1
+            self._index_cache[entity_id] = cached
+        return cached
+
+    def _fill(self, key: tuple, entity_id: str | None, values_of: Any,
+              default: Any) -> np.ndarray:
+        if (cached := self._signal_cache.get(key)) is not None:
+            return cached
+        if not entity_id or entity_id not in self.timeline.events:
+            cached = np.full(len(self.t), default)
+        else:
+            values = np.append(values_of(self.timeline.events[entity_id][1]), default)
+            # index -1 picks the appended default
+            cached = values[self._index(entity_id)]
+        self._signal_cache[key] = cached
+        return cached
+
+    def _is(self, entity_id: str | None, state: str) -> np.ndarray:
+        return self._fill(
+            (entity_id, state), entity_id, lambda states: (states == state).astype(bool), False
+        )
+
+    def _numeric(self, entity_id: str | None) -> np.ndarray:
+        def _parse(states: np.ndarray) -> np.ndarray:
+            out = np.full(len(states), np.nan)
+            for i, state in enumerate(states):
+                try:
+                    out[i] = float(state)
+                except (TypeError, ValueError):
+                    pass
+            return out
+        return self._fill((entity_id, float), entity_id, _parse, np.nan)
+
+    def _changed_at(self, entity_id: str) -> np.ndarray:
+        ts, _ = self.timeline.events[entity_id]
+        return np.append(ts, 0.0)[self._index(entity_id)]
+
+    # -- derived signals --
+
+    def _illuminance(self, config: RoomConfig) -> np.ndarray:
+        """Effective illuminance per step (blueprint: illuminance / illuminance_raw).
+
+        The spike/drop filter is sequential by nature, so it runs once over
+        the lux samples with the engine's own IlluminanceWindow and the result
+        is forward-filled; cached per filter setting.
+        """
+        key = (
+            config.illuminance_sensor,
+            config.enable_illuminance_averaging,
+            config.illuminance_window,
+            config.dark_threshold,
+            config.bright_threshold,
+        )
+        if (cached := self._lux_cache.get(key)) is not None:
+            return cached
+        sensor = config.illuminance_sensor
+        if not sensor or sensor not in self.timeline.events:
+            result = np.full(len(self.t), float(config.bright_threshold))
+        else:
+            _, states = self.timeline.events[sensor]
+            window = IlluminanceWindow(config.illuminance_window)
+            values = np.empty(len(states))
+            for i, state in enumerate(states):
+                try:
+                    raw = None if state in _INVALID_STATES else float(state)
+                except ValueError:
+                    raw = None
+                if raw is None:
+                    # Offline: last average, then bright_threshold (suppresses auto-ON)
+                    mean = window.mean
+                    values[i] = round(mean, 2) if mean is not None else config.bright_threshold
+                elif config.enable_illuminance_averaging:
+                    window.update(raw, config.dark_threshold, config.bright_threshold)
+                    values[i] = window.value
+                else:
+                    values[i] = round(raw, 2)
+            result = np.append(values, float(config.bright_threshold))[self._index(sensor)]
+        self._lux_cache[key] = result
+        return result
+
+    def _sun_window(self, config: RoomConfig) -> np.ndarray:
+        """Offset sunrise/sunset window (blueprint: is_daytime_verified)."""
+        rises, sets = self._sun_events()
+        rise_off = config.sunrise_offset_minutes * 60
+        set_off = config.sunset_offset_minutes * 60
+        # Pair each sunrise with the first sunset after it
+        pair = np.searchsorted(sets, rises, side="right")
+        ok = pair < len(sets)
+        starts = rises[ok] + rise_off
+        ends = sets[pair[ok]] + set_off
+        keep = starts < ends
+        starts, ends = starts[keep], ends[keep]
+        if not len(starts):
+            return np.zeros(len(self.t), dtype=bool)
+        idx = np.searchsorted(starts, self.t, side="right") - 1
+        return (idx >= 0) & (self.t < ends[np.maximum(idx, 0)])
+
+    def _sun_events(self) -> tuple[np.ndarray, np.ndarray]:
+        """Sunrise/sunset times from sun.sun, or the fixed fallback hours."""
+        if SUN_ENTITY in self.timeline.events:
+            ts, states = self.timeline.events[SUN_ENTITY]
+            return ts[states == "above_horizon"], ts[states == "below_horizon"]
+        tz = self.tz or datetime.now().astimezone().tzinfo
+        first = datetime.fromtimestamp(self.timeline.start, tz).date() - timedelta(days=1)
+        last = datetime.fromtimestamp(self.timeline.end, tz).date() + timedelta(days=1)
+        days = [first + timedelta(days=n) for n in range((last - first).days + 1)]
+
+        def _at(day: date, hour: int) -> float:
+            return datetime.combine(day, time(hour), tz).timestamp()
+
+        return (
+            np.array([_at(d, FALLBACK_SUNRISE_HOUR) for d in days]),
+            np.array([_at(d, FALLBACK_SUNSET_HOUR) for d in days]),
+        )
+
+    def _daytime(self, config: RoomConfig, daytime: DaytimeParams) -> np.ndarray:
+        """Final daytime flag (blueprint: is_daytime_final)."""
+        key = (config.sunrise_offset_minutes, config.sunset_offset_minutes, daytime)
+        if (cached := self._daytime_cache.get(key)) is None:
+            cached = self._daytime_cache[key] = self._compute_daytime(config, daytime)
+        return cached
+
+    def _compute_daytime(self, config: RoomConfig, daytime: DaytimeParams) -> np.ndarray:
+        sun = self._sun_window(config)
+        if daytime.daytime_source == DAYTIME_SOURCE_SUN or not daytime.outdoor_lux_sensor:
+            return sun
+        lux = self._numeric(daytime.outdoor_lux_sensor)
+        valid = ~np.isnan(lux) & (lux >= 0)
+        dark = valid & (lux < daytime.outdoor_dark_below_lux)
+        bright = valid & (lux >= daytime.outdoor_bright_eff)
+        # The per-room outdoor_dark latch only moves on valid crossings
+        idx = np.arange(len(lux))
+        last_dark = np.maximum.accumulate(np.where(dark, idx, -1))
+        last_bright = np.maximum.accumulate(np.where(bright, idx, -1))
+        latch_known = (last_dark >= 0) | (last_bright >= 0)
+        latch_day = np.where(latch_known, last_bright > last_dark, sun)
+        in_band = np.where(dark, False, np.where(bright, True, latch_day))
+        if daytime.daytime_source == DAYTIME_SOURCE_LUX:
+            # Dead sensor holds the latch; sun only if it never latched
+            return np.where(valid, in_band, latch_day)
+        return np.where(valid, in_band, sun)
+
+    def _presence(self, config: RoomConfig) -> tuple[np.ndarray, np.ndarray]:
+        """someone_present and seconds since the room went vacant, per step."""
+        key = (config.presence_pir_sensor, config.mmwave_sensor)
+        if (cached := self._presence_cache.get(key)) is None:
+            t = self.t
+            n = len(t)
+            present = (
+                self._is(config.presence_pir_sensor, "on") | self._is(config.mmwave_sensor, "on")
+            )
+            idx = np.arange(n, dtype=np.int32)
+            last_present = np.maximum.accumulate(np.where(present, idx, -1))
+            vacant_since = np.where(
+                last_present >= 0, t[np.minimum(last_present + 1, n - 1)], t[0]
+            )
+            cached = (present, np.where(present, 0.0, t - vacant_since))
+            self._presence_cache[key] = cached
+        return cached
+
+    # -- the decision --
+
+    def run(self, config: RoomConfig, daytime: DaytimeParams | None = None,
+            params: Mapping[str, Any] | None = None) -> ReplayResult:
+        """Replay the room with one set of settings."""
+        daytime = daytime or DaytimeParams()
+        t = self.t
+        n = len(t)
+
+        present, vacant_seconds = self._presence(config)
+
+        if config.sensor_off_latency_entity in self.timeline.events:
+            latency = self._numeric(config.sensor_off_latency_entity)
+            latency = np.where(latency > 0, latency, config.fixed_latency_seconds)
+        else:
+            latency = config.fixed_latency_seconds
+        timeout = np.maximum(
+            np.ceil(np.asarray(latency) * config.effective_vacancy_multiplier / 60), 1
+        ) * 60
+
+        is_dark = self._illuminance(config) < config.dark_threshold
+
+        mode = config.daytime_control_mode
+        is_daytime = (
+            self._daytime(config, daytime) if mode != "always_allow" else np.zeros(n, dtype=bool)
+        )
+        if mode == "always_block":
+            prevent = is_daytime
+        elif mode == "block_when_away" and config.presence_trackers:
+            someone_home = np.zeros(n, dtype=bool)
+            for tracker in config.presence_trackers:
+                someone_home |= self._is(tracker, "home")
+            prevent = is_daytime & ~someone_home
+        else:
+            prevent = np.zeros(n, dtype=bool)
+        no_daytime_lights = is_daytime if mode == "always_block" else np.zeros(n, dtype=bool)
+
+        bed_blocks = np.zeros(n, dtype=bool)
+        bed_ok = np.zeros(n, dtype=bool)
+        bed = config.bed_occupied_helper
+        if bed and not config.bed_ignored and bed in self.timeline.events:
+            bed_on = self._is(bed, "on")
+            bed_off = self._is(bed, "off") | (self._index(bed) < 0)
+            age = t - self._changed_at(bed)
+            bed_invalid = ~bed_on & ~bed_off
+            bed_blocks = (
+                bed_on
+                | (bed_invalid & (age < BED_INVALID_GRACE_SECONDS))
+                | (bed_off & (age < config.bed_exit_delay_seconds))
+            )
+            if config.turn_off_when_bed_occupied:
+                bed_ok = bed_on & (age >= config.bed_entry_delay_seconds)
+
+        hold = self._is(config.helper_entity_id("input_boolean", "manual_override"), "on")
+        if not config.thresholds_valid:
+            hold = np.ones(n, dtype=bool)
+
+        turn_on = present & is_dark & ~prevent & ~bed_blocks & ~hold
+        turn_off = ((vacant_seconds >= timeout) | bed_ok | no_daytime_lights) & ~hold
+        lights_on = _latch(turn_on, turn_off, self._initially_on(config))
+        return self._result(lights_on, dict(params or {}))
+
+    def _initially_on(self, config: RoomConfig) -> bool:
+        entities = (
+            (config.light_switch,) if config.control_mode == "switch_only" or not config.has_lights
+            else config.light_entities
+        )
+        for entity_id in entities:
+            if entity_id and entity_id in self.timeline.events:
+                if self.timeline.events[entity_id][1][0] == "on":
+                    return True
+        return False
+
+    def _result(self, lights_on: np.ndarray, params: dict[str, Any]) -> ReplayResult:
+        end = self.timeline.end
+        starts, stops = _runs(lights_on, self.t, end)
+        on_seconds = float(np.sum(stops - starts))
+        short_on = int(np.sum((stops - starts) < self.flap_seconds))
+        short_off = int(np.sum((starts[1:] - stops[:-1]) < self.flap_seconds))
+        return ReplayResult(
+            params=params,
+            intervals=list(zip(starts.tolist(), stops.tolist())),
+            on_minutes=on_seconds / 60,
+            turn_ons=int(len(starts) - (1 if lights_on[0] else 0)),
+            flaps=short_on + short_off,
+        )
+
+    def sweep(self, config: RoomConfig, daytime: DaytimeParams | None = None,
+              **grid: Sequence[Any]) -> list[ReplayResult]:
+        """Replay every combination of the given settings.
+
+        Keys are RoomConfig or DaytimeParams field names, e.g.
+        sweep(config, dark_threshold=[20, 30, 40], outdoor_dark_below_lux=[2000, 3000]).
+        """
+        daytime = daytime or DaytimeParams()
+        room_fields = {f.name for f in fields(RoomConfig)}
+        daytime_fields = {f.name for f in fields(DaytimeParams)}
+        unknown = set(grid) - room_fields - daytime_fields
+        if unknown:
+            raise ValueError(f"Unknown sweep settings: {', '.join(sorted(unknown))}")
+        results = []
+        for combo in itertools.product(*grid.values()):
+            params = dict(zip(grid, combo))
+            results.append(
+                self.run(
+                    replace(config, **{k: v for k, v in params.items() if k in room_fields}),
+                    replace(daytime, **{k: v for k, v in params.items() if k in daytime_fields}),
+                    params,
+                )
+            )
+        return results
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+def _entry_data(entries_path: str, room: str) -> dict[str, Any]:
+    """The wizard's config entry data for `room` from core.config_entries."""
+    with open(entries_path, encoding="utf-8") as f:
+        entries = json.load(f)["data"]["entries"]
+    for entry in entries:
+        data = entry.get("data", {})
+        if entry.get("domain") == "universal_lighting_setup_wizard" and room in (
+            data.get("sanitized_room_name"), data.get("room_name")
+        ):
+            return data
+    raise SystemExit(f"No Universal Lighting entry for room {room!r} in {entries_path}")
+
+
+def _parse_sweep(spec: str, config: RoomConfig, daytime: DaytimeParams) -> tuple[str, list[Any]]:
+    name, _, values = spec.partition("=")
+    current = getattr(config, name, getattr(daytime, name, None))
+    kind = type(current) if isinstance(current, (int, float)) and not isinstance(current, bool) else float
+    return name, [kind(v) for v in values.split(",") if v]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("export", help="history CSV or recorder SQLite database")
+    parser.add_argument("--entries", required=True, help=".storage/core.config_entries")
+    parser.add_argument("--room", required=True, help="room name or sanitized room name")
+    parser.add_argument("--outdoor-lux-sensor")
+    parser.add_argument("--daytime-source", default=DaytimeParams.daytime_source)
+    parser.add_argument("--step", type=float, default=DEFAULT_STEP_SECONDS)
+    parser.add_argument("--flap-seconds", type=float, default=DEFAULT_FLAP_SECONDS)
+    parser.add_argument("--tz", help="time zone for the fallback sun window (no sun.sun in export)")
+    parser.add_argument("--sweep", action="append", default=[], metavar="SETTING=V1,V2,...")
+    parser.add_argument("--intervals", action="store_true", help="print the baseline on intervals")
+    args = parser.parse_args(argv)
+
+    config = RoomConfig.from_entry_data(_entry_data(args.entries, args.room))
+    daytime = DaytimeParams(
+        daytime_source=args.daytime_source, outdoor_lux_sensor=args.outdoor_lux_sensor
+    )
+    grid = dict(_parse_sweep(spec, config, daytime) for spec in args.sweep)
+    timeline = Timeline.load(args.export, room_entities(config, daytime))
+    replayer = Replayer(
+        timeline, args.step, args.flap_seconds, ZoneInfo(args.tz) if args.tz else None
+    )
+
+    baseline = replayer.run(config, daytime)
+    days = (timeline.end - timeline.start) / 86400
+    print(f"{config.room_name}: {days:.1f} days, {len(replayer.t)} steps")
+    print(baseline.summary())
+    if args.intervals:
+        for start, stop in baseline.intervals:
+            print(f"  {datetime.fromtimestamp(start)} -> {datetime.fromtimestamp(stop)}")
+    if grid:
+        results = replayer.sweep(config, daytime, **grid)
+        for result in sorted(results, key=lambda r: (r.flaps, r.on_minutes)):
+            print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Times the blueprint automation runs of every wizard room.
+
+One observer is shared by all blueprint rooms (hass.data[DATA_RUN_OBSERVER]);
+it needs nothing from the blueprint itself, only the events Home Assistant
+already fires, tied together by context:
+
+- the triggering state change has context C; the automation run's context
+  has parent_id == C, and `automation_triggered` is fired with the run's
+  context once the `variables:` block and the conditions are done - so
+  state change -> automation_triggered is the template render time;
+- the run's service calls carry the run's context - the first light /
+  switch call gives the trigger-to-command latency;
+- the automation entity's state (`current` attribute) drops to 0 when the
+  run ends, written with the run's context - automation_triggered -> that
+  write is the run time. Under `mode: restart` the cancelled run's write
+  carries the NEW run's context, so a run still open when the next one
+  starts was cut off.
+
+With the blueprint's enable_decision_trace on, each run also fires one
+`universal_lighting_decision` event with the run's context; it is turned
+into a DecisionRecord of the room's DecisionTrace, its latency measured
+from the triggering state change.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import logging
+
+from homeassistant.const import EVENT_CALL_SERVICE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .decision_trace import TRACE_INPUTS, DecisionRecord, DecisionTrace
+from .telemetry import RoomTelemetry
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_AUTOMATION_TRIGGERED = "automation_triggered"
+EVENT_DECISION = "universal_lighting_decision"
+ATTR_CURRENT = "current"
+LIGHT_COMMAND_DOMAINS = ("light", "switch", "homeassistant")
+# Entity.async_set_context() only applies to writes within 5 s; a run that
+# ends later is written with a fresh context
+_CONTEXT_RECENT_SECONDS = 5
+# Trigger state changes remembered per room while their run starts
+_RECENT_TRIGGERS = 16
+
+
+@dataclass
+class _Run:
+    context_id: str
+    triggered_at: float
+    origin_at: float
+    commanded: bool = False
+
+
+@dataclass
+class _Room:
+    automation_id: str
+    trigger_entities: list[str]
+    telemetry: RoomTelemetry
+    trace: DecisionTrace | None = None
+    entity_id: str | None = None
+    open_run: _Run | None = None
+    recent_triggers: OrderedDict[str, float] = field(default_factory=OrderedDict)
+    unsubs: list[CALLBACK_TYPE] = field(default_factory=list)
+
+
+class BlueprintRunObserver:
+    """Feeds each blueprint room's RoomTelemetry from bus events."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._rooms: dict[str, _Room] = {}  # automation unique id -> room
+        self._by_entity: dict[str, _Room] = {}  # automation entity id -> room
+        self._runs: dict[str, tuple[_Room, _Run]] = {}  # run context id -> open run
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_add_room(self, automation_id: str, trigger_entities: list[str],
+                       telemetry: RoomTelemetry,
+                       trace: DecisionTrace | None = None) -> CALLBACK_TYPE:
+        """Start observing one room's automation; returns the remove callback."""
+        room = _Room(automation_id, trigger_entities, telemetry, trace)
+        self._rooms[automation_id] = room
+        if trigger_entities:
+            room.unsubs.append(
+                async_track_state_change_event(
+                    self.hass, trigger_entities, self._async_trigger_state_changed(room)
+                )
+            )
+        if entity_id := er.async_get(self.hass).async_get_entity_id(
+            "automation", "automation", automation_id
+        ):
+            self._async_bind_entity(room, entity_id)
+        if not self._unsubs:
+            self._unsubs = [
+                self.hass.bus.async_listen(EVENT_AUTOMATION_TRIGGERED, self._async_triggered),
+                self.hass.bus.async_listen(EVENT_CALL_SERVICE, self._async_service_called),
+                self.hass.bus.async_listen(EVENT_DECISION, self._async_decision),
+            ]
+
+        @callback
+        def _async_remove() -> None:
+            while room.unsubs:
+                room.unsubs.pop()()
+            self._rooms.pop(automation_id, None)
+            if room.entity_id is not None:
+                self._by_entity.pop(room.entity_id, None)
+            if room.open_run is not None:
+                self._runs.pop(room.open_run.context_id, None)
+            if not self._rooms:
+                while self._unsubs:
+                    self._unsubs.pop()()
+
+        return _async_remove
+
+    @callback
+    def _async_bind_entity(self, room: _Room, entity_id: str) -> None:
+        room.entity_id = entity_id
+        self._by_entity[entity_id] = room
+        room.unsubs.append(
+            async_track_state_change_event(
+                self.hass, [entity_id], self._async_automation_state_changed(room)
+            )
+        )
+
+    def _async_trigger_state_changed(self, room: _Room):
+        @callback
+        def _async_changed(event: Event) -> None:
+            recent = room.recent_triggers
+            recent[event.context.id] = event.time_fired.timestamp()
+            if len(recent) > _RECENT_TRIGGERS:
+                recent.popitem(last=False)
+
+        return _async_changed
+
+    @callback
+    def _async_triggered(self, event: Event) -> None:
+        entity_id = event.data.get("entity_id")
+        if (room := self._by_entity.get(entity_id)) is None:
+            # Not bound yet (automation created after the room was added)?
+            entry = er.async_get(self.hass).async_get(entity_id) if entity_id else None
+            if entry is None or (room := self._rooms.get(entry.unique_id)) is None:
+                return
+            self._async_bind_entity(room, entity_id)
+
+        telemetry = room.telemetry
+        now = event.time_fired.timestamp()
+        if room.open_run is not None:
+            telemetry.restarted_runs += 1
+            self._runs.pop(room.open_run.context_id, None)
+        telemetry.runs += 1
+
+        origin = None
+        if event.context.parent_id is not None:
+            origin = room.recent_triggers.pop(event.context.parent_id, None)
+        if origin is not None:
+            telemetry.template_render.add((now - origin) * 1000)
+        run = _Run(event.context.id, now, origin if origin is not None else now)
+        room.open_run = run
+        self._runs[run.context_id] = (room, run)
+
+    @callback
+    def _async_service_called(self, event: Event) -> None:
+        if (found := self._runs.get(event.context.id)) is None:
+            return
+        room, run = found
+        if run.commanded or event.data.get("domain") not in LIGHT_COMMAND_DOMAINS:
+            return
+        run.commanded = True
+        room.telemetry.command_latency.add(
+            (event.time_fired.timestamp() - run.origin_at) * 1000
+        )
+
+    @callback
+    def _async_decision(self, event: Event) -> None:
+        if (found := self._runs.get(event.context.id)) is None:
+            return
+        room, run = found
+        if room.trace is None:
+            return
+        data = event.data
+        now = event.time_fired.timestamp()
+        room.trace.record(DecisionRecord(
+            now,
+            str(data.get("trigger")),
+            str(data.get("reason")),
+            str(data.get("action")),
+            (now - run.origin_at) * 1000,
+            {key: data.get(key) for key in TRACE_INPUTS},
+        ))
+
+    def _async_automation_state_changed(self, room: _Room):
+        @callback
+        def _async_changed(event: Event) -> None:
+            run = room.open_run
+            new_state = event.data.get("new_state")
+            if run is None or new_state is None or new_state.attributes.get(ATTR_CURRENT):
+                return
+            now = event.time_fired.timestamp()
+            if (
+                new_state.context.id != run.context_id
+                and now - run.triggered_at < _CONTEXT_RECENT_SECONDS
+            ):
+                return  # a newer run's restart cancelling this one
+            room.telemetry.decision_latency.add((now - run.triggered_at) * 1000)
+            room.open_run = None
+            self._runs.pop(run.context_id, None)
+
+        return _async_changed
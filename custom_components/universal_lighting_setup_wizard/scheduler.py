@@ -0,0 +1,173 @@
+"""Shared deadline scheduler for all native-engine rooms.
+
+One heap and ONE Home Assistant timer serve every room in the house. Each
+room keeps at most one pending deadline (its next bed delay, vacancy timeout,
+override expiry or sun boundary); rescheduling simply supersedes the old
+entry, which is dropped lazily when it reaches the top of the heap.
+
+Deadlines are rounded UP to a fixed tick so rooms whose deadlines land in
+the same tick - everyone leaving the house at once - are fired together in
+a single event-loop wakeup, however many rooms there are.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import heapq
+import itertools
+import logging
+import math
+from typing import Callable, Hashable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Resolution of the shared timer. Every blueprint deadline is whole seconds
+# (or minutes), so a quarter second of batching is invisible to users.
+TICK_SECONDS = 0.25
+# Rebuild the heap once superseded entries outnumber live ones by this much
+_COMPACT_SLACK = 64
+
+DeadlineCallback = Callable[[float], None]
+
+
+@dataclass(order=True, slots=True)
+class _Entry:
+    when: float
+    seq: int
+    key: Hashable = field(compare=False)
+    action: DeadlineCallback | None = field(compare=False)
+
+
+class DeadlineQueue:
+    """Heap of one-shot deadlines keyed by owner, without any I/O.
+
+    schedule() and cancel() are O(log n) / O(1); superseded entries are
+    discarded lazily by pop_due().
+    """
+
+    def __init__(self, tick: float = TICK_SECONDS) -> None:
+        """Initialize an empty queue."""
+        self.tick = tick
+        self._heap: list[_Entry] = []
+        self._live: dict[Hashable, _Entry] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def quantize(self, when: float) -> float:
+        """Round a deadline up to the next tick boundary."""
+        return math.ceil(when / self.tick) * self.tick
+
+    def schedule(self, key: Hashable, when: float, action: DeadlineCallback) -> None:
+        """(Re)schedule key's deadline, superseding any earlier one."""
+        when = self.quantize(when)
+        current = self._live.get(key)
+        if current is not None:
+            if current.when == when:
+                current.action = action
+                return
+            current.action = None
+        entry = _Entry(when, next(self._seq), key, action)
+        self._live[key] = entry
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._live) + _COMPACT_SLACK:
+            self._heap = list(self._live.values())
+            heapq.heapify(self._heap)
+
+    def cancel(self, key: Hashable) -> None:
+        """Drop key's pending deadline, if any."""
+        current = self._live.pop(key, None)
+        if current is not None:
+            current.action = None
+
+    @property
+    def next_deadline(self) -> float | None:
+        """The earliest live deadline (discarding superseded heap entries)."""
+        heap = self._heap
+        while heap and heap[0].action is None:
+            heapq.heappop(heap)
+        return heap[0].when if heap else None
+
+    def pop_due(self, now: float) -> list[tuple[Hashable, DeadlineCallback]]:
+        """Remove and return every deadline due at or before now."""
+        due: list[tuple[Hashable, DeadlineCallback]] = []
+        heap = self._heap
+        while heap and heap[0].when <= now:
+            entry = heapq.heappop(heap)
+            if entry.action is None:
+                continue
+            del self._live[entry.key]
+            due.append((entry.key, entry.action))
+            entry.action = None
+        return due
+
+
+class RoomScheduler:
+    """Drives a DeadlineQueue from a single Home Assistant timer."""
+
+    def __init__(self, hass: HomeAssistant, tick: float = TICK_SECONDS) -> None:
+        """Initialize the scheduler (no timer is armed until needed)."""
+        self.hass = hass
+        self.queue = DeadlineQueue(tick)
+        self._unsub_timer: Callable[[], None] | None = None
+        self._timer_at: float | None = None
+        self.wakeups = 0
+
+    @callback
+    def async_schedule(self, key: Hashable, when: float, action: DeadlineCallback) -> None:
+        """Fire action(now) at (or one tick after) POSIX time `when`."""
+        self.queue.schedule(key, when, action)
+        self._async_rearm()
+
+    @callback
+    def async_cancel(self, key: Hashable) -> None:
+        """Cancel key's pending deadline, if any."""
+        self.queue.cancel(key)
+        self._async_rearm()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the shared timer (pending deadlines are dropped)."""
+        self._cancel_timer()
+        self.queue = DeadlineQueue(self.queue.tick)
+
+    @callback
+    def _async_rearm(self) -> None:
+        head = self.queue.next_deadline
+        if head == self._timer_at:
+            return
+        self._cancel_timer()
+        if head is None:
+            return
+        self._timer_at = head
+        self._unsub_timer = async_track_point_in_utc_time(
+            self.hass, self._async_tick, dt_util.utc_from_timestamp(head)
+        )
+
+    @callback
+    def _async_tick(self, now_dt: datetime) -> None:
+        """Fire every room whose deadline fell in this tick - one wakeup."""
+        self._unsub_timer = None
+        self._timer_at = None
+        self.wakeups += 1
+        now = max(now_dt.timestamp(), dt_util.utcnow().timestamp())
+        due = self.queue.pop_due(now + self.queue.tick / 2)
+        if len(due) > 1:
+            _LOGGER.debug("Scheduler tick fired %d rooms together", len(due))
+        for key, action in due:
+            try:
+                action(now)
+            except Exception:  # noqa: BLE001 - one room must not starve the rest
+                _LOGGER.exception("Deadline callback for %s failed", key)
+        self._async_rearm()
+
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+            self._timer_at = None
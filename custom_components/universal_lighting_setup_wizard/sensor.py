@@ -0,0 +1,425 @@
+"""Sensor platform for Universal Smart Lighting Setup Wizard.
+
+One "Filtered Illuminance" sensor per room with illuminance averaging on.
+It owns the room's IlluminanceWindow (shared with the native engine through
+hass.data) and persists the samples with RestoreEntity, replacing the
+blueprint's comma-separated input_text history: no re-parsing, no
+input_text.set_value per lux change, and no 255-character cap on the window.
+
+Plus diagnostic telemetry sensors per room (run count, decision and
+trigger-to-command latency; for blueprint rooms restarted runs and template
+render time, for native rooms coalesced triggers and suppressed commands),
+read from the room's RoomTelemetry. They are polled once a minute rather
+than pushed per run, so busy rooms don't turn every decision into a
+recorder row.
+
+And a "Lighting Summary" sensor per room: the long-term record of the
+helpers the wizard keeps out of the recorder (automatic actions, occupied
+and auto-on time), written at most every five minutes.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import time
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    LIGHT_LUX,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    EntityCategory,
+    UnitOfTime,
+)
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
+
+from .const import (
+    CONF_ENGINE,
+    DATA_TELEMETRY,
+    DATA_WINDOWS,
+    ENGINE_BLUEPRINT,
+    ENGINE_NATIVE,
+)
+from .decision import RoomConfig
+from .illuminance import IlluminanceWindow, filtered_illuminance_entity_id
+from .telemetry import LatencyHistogram, RoomTelemetry
+
+ATTR_AVERAGE = "average"
+ATTR_SAMPLE_COUNT = "sample_count"
+ATTR_WINDOW_SIZE = "window_size"
+ATTR_OCCUPIED = "occupied"
+ATTR_LIGHTS_AUTO_ON = "lights_auto_on"
+ATTR_OCCUPIED_HOURS = "occupied_hours"
+ATTR_AUTO_ON_HOURS = "auto_on_hours"
+ATTR_LAST_ACTION = "last_action"
+
+# Only the telemetry sensors poll
+SCAN_INTERVAL = timedelta(seconds=60)
+# The summary sensor's state is written at most this often
+SUMMARY_INTERVAL = timedelta(minutes=5)
+
+
+@dataclass(frozen=True, kw_only=True)
+class TelemetrySensorEntityDescription(SensorEntityDescription):
+    """A RoomTelemetry counter or histogram published as a sensor."""
+
+    value_fn: Callable[[RoomTelemetry], float | int | None]
+    histogram_fn: Callable[[RoomTelemetry], LatencyHistogram] | None = None
+    engines: tuple[str, ...] = (ENGINE_BLUEPRINT, ENGINE_NATIVE)
+
+
+def _latency(key: str, name: str, histogram_fn: Callable[[RoomTelemetry], LatencyHistogram],
+             engines: tuple[str, ...] = (ENGINE_BLUEPRINT, ENGINE_NATIVE),
+             ) -> TelemetrySensorEntityDescription:
+    """A latency sensor: state is the p95, the full summary is in attributes."""
+    return TelemetrySensorEntityDescription(
+        key=key,
+        name=name,
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=2,
+        value_fn=lambda telemetry: histogram_fn(telemetry).percentile(0.95),
+        histogram_fn=histogram_fn,
+        engines=engines,
+    )
+
+
+TELEMETRY_SENSORS: tuple[TelemetrySensorEntityDescription, ...] = (
+    TelemetrySensorEntityDescription(
+        key="runs",
+        name="Runs",
+        icon="mdi:counter",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda telemetry: telemetry.runs,
+    ),
+    TelemetrySensorEntityDescription(
+        key="restarted_runs",
+        name="Restarted Runs",
+        icon="mdi:restart-alert",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda telemetry: telemetry.restarted_runs,
+        engines=(ENGINE_BLUEPRINT,),
+    ),
+    TelemetrySensorEntityDescription(
+        key="coalesced_triggers",
+        name="Coalesced Triggers",
+        icon="mdi:call-merge",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda telemetry: telemetry.coalesced_triggers,
+        engines=(ENGINE_NATIVE,),
+    ),
+    TelemetrySensorEntityDescription(
+        key="suppressed_commands",
+        name="Suppressed Commands",
+        icon="mdi:lightbulb-off-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda telemetry: telemetry.suppressed_commands,
+        engines=(ENGINE_NATIVE,),
+    ),
+    _latency("decision_latency", "Decision Latency", lambda t: t.decision_latency),
+    _latency("command_latency", "Command Latency", lambda t: t.command_latency),
+    _latency(
+        "template_render_time", "Template Render Time", lambda t: t.template_render,
+        engines=(ENGINE_BLUEPRINT,),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Add the room's telemetry, summary and filtered illuminance sensors."""
+    config = RoomConfig.from_entry_data(entry.data)
+    telemetry = hass.data[DATA_TELEMETRY][entry.entry_id]
+    engine = entry.data.get(CONF_ENGINE, ENGINE_BLUEPRINT)
+    entities: list[SensorEntity] = [
+        TelemetrySensor(entry, config, telemetry, description)
+        for description in TELEMETRY_SENSORS
+        if engine in description.engines
+    ]
+    entities.append(RoomSummarySensor(entry, config))
+    if config.illuminance_sensor and config.enable_illuminance_averaging:
+        window = hass.data[DATA_WINDOWS][entry.entry_id]
+        entities.append(FilteredIlluminanceSensor(entry, config, window))
+    async_add_entities(entities)
+
+
+class TelemetrySensor(SensorEntity):
+    """One of a room's performance numbers (diagnostic)."""
+
+    entity_description: TelemetrySensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unrecorded_attributes = frozenset({"count", "p50", "p95", "p99", "mean", "max"})
+
+    def __init__(self, entry: ConfigEntry, config: RoomConfig, telemetry: RoomTelemetry,
+                 description: TelemetrySensorEntityDescription) -> None:
+        """Initialize the sensor for one room."""
+        self.entity_description = description
+        self._telemetry = telemetry
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_name = f"{config.room_name} {description.name}"
+
+    @property
+    def native_value(self) -> float | int | None:
+        return self.entity_description.value_fn(self._telemetry)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if (histogram_fn := self.entity_description.histogram_fn) is None:
+            return None
+        return histogram_fn(self._telemetry).as_dict()
+
+
+@dataclass
+class IlluminanceExtraStoredData(ExtraStoredData):
+    """The ring buffer contents, persisted across restarts."""
+
+    samples: list[float]
+    value: float | None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"samples": self.samples, "value": self.value}
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> IlluminanceExtraStoredData | None:
+        try:
+            samples = [float(v) for v in restored["samples"]]
+            value = restored.get("value")
+            return cls(samples, None if value is None else float(value))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+class FilteredIlluminanceSensor(RestoreEntity, SensorEntity):
+    """Spike/drop-filtered running mean of the room's illuminance sensor."""
+
+    _attr_should_poll = False
+    _attr_icon = "mdi:brightness-6"
+    _attr_device_class = SensorDeviceClass.ILLUMINANCE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = LIGHT_LUX
+    _unrecorded_attributes = frozenset({ATTR_AVERAGE, ATTR_SAMPLE_COUNT, ATTR_WINDOW_SIZE})
+
+    def __init__(self, entry: ConfigEntry, config: RoomConfig,
+                 window: IlluminanceWindow) -> None:
+        """Initialize the sensor for one room."""
+        self._config = config
+        self._window = window
+        self._source_valid = False
+        self._attr_unique_id = f"{entry.entry_id}_filtered_illuminance"
+        self._attr_name = f"{config.room_name} Filtered Illuminance"
+        # The room's automation was written with this entity id
+        self.entity_id = filtered_illuminance_entity_id(config.sanitized_room_name)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the samples, then follow the source sensor."""
+        await super().async_added_to_hass()
+        if (extra := await self.async_get_last_extra_data()) is not None and (
+            restored := IlluminanceExtraStoredData.from_dict(extra.as_dict())
+        ) is not None:
+            self._window.restore(restored.samples, restored.value)
+
+        source = self._config.illuminance_sensor
+        self._update_from(self.hass.states.get(source))
+        self.async_on_remove(
+            async_track_state_change_event(self.hass, [source], self._async_source_changed)
+        )
+
+    @callback
+    def _async_source_changed(self, event: Event) -> None:
+        old_state: State | None = event.data.get("old_state")
+        new_state: State | None = event.data.get("new_state")
+        if old_state is not None and new_state is not None and old_state.state == new_state.state:
+            return
+        self._update_from(new_state)
+        self.async_write_ha_state()
+
+    def _update_from(self, state: State | None) -> None:
+        raw = None
+        if state is not None and state.state not in ("", STATE_UNKNOWN, STATE_UNAVAILABLE):
+            try:
+                raw = float(state.state)
+            except ValueError:
+                pass
+        self._source_valid = raw is not None
+        if raw is not None:
+            # No-op if the native engine already folded in this very reading
+            self._window.update(
+                raw,
+                self._config.dark_threshold,
+                self._config.bright_threshold,
+                key=state.last_updated,
+            )
+
+    @property
+    def available(self) -> bool:
+        return self._source_valid
+
+    @property
+    def native_value(self) -> float | None:
+        return self._window.value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        mean = self._window.mean
+        return {
+            ATTR_AVERAGE: None if mean is None else round(mean, 2),
+            ATTR_SAMPLE_COUNT: len(self._window),
+            ATTR_WINDOW_SIZE: self._window.size,
+        }
+
+    @property
+    def extra_restore_state_data(self) -> IlluminanceExtraStoredData:
+        return IlluminanceExtraStoredData(self._window.samples, self._window.value)
+
+
+@dataclass
+class SummaryExtraStoredData(ExtraStoredData):
+    """The summary's running totals, persisted across restarts."""
+
+    automatic_actions: int
+    occupied_seconds: float
+    auto_on_seconds: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "automatic_actions": self.automatic_actions,
+            "occupied_seconds": self.occupied_seconds,
+            "auto_on_seconds": self.auto_on_seconds,
+        }
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> SummaryExtraStoredData | None:
+        try:
+            return cls(
+                int(restored["automatic_actions"]),
+                float(restored["occupied_seconds"]),
+                float(restored["auto_on_seconds"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+class RoomSummarySensor(RestoreEntity, SensorEntity):
+    """Coarse long-term activity of a room, in place of its busy helpers.
+
+    The state counts automatic light actions (TOTAL_INCREASING, so long-term
+    statistics give actions per hour); occupied and auto-on time accumulate
+    in the attributes. It follows the room's helpers as they change but
+    writes its own state at most once per SUMMARY_INTERVAL.
+    """
+
+    _attr_should_poll = False
+    _attr_icon = "mdi:chart-timeline-variant"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, entry: ConfigEntry, config: RoomConfig) -> None:
+        """Initialize the sensor for one room."""
+        self._occupancy = config.helper_entity_id("input_boolean", "occupancy_state")
+        self._auto_on = config.helper_entity_id("input_boolean", "light_auto_on")
+        self._last_action = config.helper_entity_id("input_datetime", "last_automation_action")
+        self._totals = SummaryExtraStoredData(0, 0.0, 0.0)
+        # When the occupancy / auto-on helper turned on (None while off)
+        self._since: dict[str, float | None] = {self._occupancy: None, self._auto_on: None}
+        self._attr_unique_id = f"{entry.entry_id}_summary"
+        self._attr_name = f"{config.room_name} Lighting Summary"
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the totals, then follow the helpers."""
+        await super().async_added_to_hass()
+        if (extra := await self.async_get_last_extra_data()) is not None and (
+            restored := SummaryExtraStoredData.from_dict(extra.as_dict())
+        ) is not None:
+            self._totals = restored
+
+        now = time.time()
+        for entity_id in self._since:
+            if (state := self.hass.states.get(entity_id)) is not None and state.state == STATE_ON:
+                self._since[entity_id] = now
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [self._occupancy, self._auto_on, self._last_action],
+                self._async_helper_changed,
+            )
+        )
+        self.async_on_remove(
+            async_track_time_interval(self.hass, self._async_write_summary, SUMMARY_INTERVAL)
+        )
+
+    @callback
+    def _async_helper_changed(self, event: Event) -> None:
+        """Fold a helper change into the totals (no state write)."""
+        entity_id: str = event.data["entity_id"]
+        old_state: State | None = event.data.get("old_state")
+        new_state: State | None = event.data.get("new_state")
+        if old_state is None or new_state is None or old_state.state == new_state.state:
+            return
+        if entity_id == self._last_action:
+            self._totals.automatic_actions += 1
+            return
+        now = time.time()
+        since = self._since[entity_id]
+        if new_state.state == STATE_ON:
+            if since is None:
+                self._since[entity_id] = now
+        elif since is not None:
+            self._since[entity_id] = None
+            if entity_id == self._occupancy:
+                self._totals.occupied_seconds += now - since
+            else:
+                self._totals.auto_on_seconds += now - since
+
+    @callback
+    def _async_write_summary(self, _now: datetime) -> None:
+        # Home Assistant skips the write when nothing changed
+        self.async_write_ha_state()
+
+    def _running(self, entity_id: str, now: float) -> float:
+        since = self._since[entity_id]
+        return 0.0 if since is None else now - since
+
+    @property
+    def native_value(self) -> int:
+        return self._totals.automatic_actions
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        now = time.time()
+        occupied = self._totals.occupied_seconds + self._running(self._occupancy, now)
+        auto_on = self._totals.auto_on_seconds + self._running(self._auto_on, now)
+        last_action = self.hass.states.get(self._last_action)
+        return {
+            ATTR_OCCUPIED: self._since[self._occupancy] is not None,
+            ATTR_LIGHTS_AUTO_ON: self._since[self._auto_on] is not None,
+            ATTR_OCCUPIED_HOURS: round(occupied / 3600, 2),
+            ATTR_AUTO_ON_HOURS: round(auto_on / 3600, 2),
+            ATTR_LAST_ACTION: last_action.state if last_action is not None else None,
+        }
+
+    @property
+    def extra_restore_state_data(self) -> SummaryExtraStoredData:
+        # Time already running is banked, so a restart doesn't lose it
+        now = time.time()
+        return SummaryExtraStoredData(
+            self._totals.automatic_actions,
+            self._totals.occupied_seconds + self._running(self._occupancy, now),
+            self._totals.auto_on_seconds + self._running(self._auto_on, now),
+        )
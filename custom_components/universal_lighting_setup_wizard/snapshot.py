@@ -0,0 +1,141 @@
+"""Warm-start snapshots of the native engine's room state.
+
+At boot every sensor starts out unavailable and reports its real state a
+few seconds later, in no particular order. A room that decides on each of
+those transitions sees "nobody here, no lux reading" first and real values
+later, and can switch lights it should have left alone. Each native room
+therefore keeps a compact RoomSnapshot - presence, vacancy start and the
+last valid illuminance reading - in one shared Store file, written every
+SNAPSHOT_INTERVAL and at shutdown. On setup the engine bridges sensors that
+have not reported yet with the snapshot (see RoomEngine.async_start) and
+holds its decisions until they do.
+
+The override / auto-on / last-action helpers, the illuminance averaging
+window (filtered illuminance sensor) and the outdoor-dark latch (Outdoor
+Daytime sensor) are restored by Home Assistant itself and are not repeated
+here.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.room_snapshots"
+STORAGE_VERSION = 1
+SNAPSHOT_INTERVAL = timedelta(minutes=5)
+# Seconds a saved snapshot stays usable (older ones describe another situation)
+MAX_SNAPSHOT_AGE = 3600
+# Batches the writes of several rooms stopping at once
+SAVE_DELAY = 10
+
+
+@dataclass(slots=True)
+class RoomSnapshot:
+    """The runtime state of one room worth carrying across a restart."""
+
+    saved_at: float
+    pir_on: bool
+    mmwave_on: bool
+    vacant_since: float | None
+    illuminance_raw: float | None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> RoomSnapshot | None:
+        try:
+            vacant_since = restored.get("vacant_since")
+            illuminance_raw = restored.get("illuminance_raw")
+            return cls(
+                float(restored["saved_at"]),
+                bool(restored["pir_on"]),
+                bool(restored["mmwave_on"]),
+                None if vacant_since is None else float(vacant_since),
+                None if illuminance_raw is None else float(illuminance_raw),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+class RoomSnapshotStore:
+    """Every native room's snapshot, in one Store file."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty store; async_load() reads the saved snapshots."""
+        self.hass = hass
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        # Snapshots of rooms that are not running (yet): loaded or last taken
+        self._saved: dict[str, dict[str, Any]] = {}
+        # entry_id -> takes the running room's snapshot
+        self._providers: dict[str, Callable[[], RoomSnapshot]] = {}
+        self._unsub_interval: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        """Read the saved snapshots and start the periodic save."""
+        if (data := await self._store.async_load()) is not None:
+            self._saved = data
+        self._unsub_interval = async_track_time_interval(
+            self.hass, self._async_interval, SNAPSHOT_INTERVAL
+        )
+
+    def restore(self, entry_id: str, now: float) -> RoomSnapshot | None:
+        """The room's saved snapshot, unless there is none or it is too old."""
+        if (saved := self._saved.get(entry_id)) is None:
+            return None
+        snapshot = RoomSnapshot.from_dict(saved)
+        if snapshot is None or now - snapshot.saved_at > MAX_SNAPSHOT_AGE:
+            return None
+        return snapshot
+
+    @callback
+    def async_add(self, entry_id: str, provider: Callable[[], RoomSnapshot]) -> CALLBACK_TYPE:
+        """Save a running room's snapshot from now on; returns the callback that stops it."""
+        self._providers[entry_id] = provider
+
+        @callback
+        def _async_remove() -> None:
+            # Keep the room's last state for the next setup (reloads included)
+            if self._providers.pop(entry_id, None) is provider:
+                self._saved[entry_id] = provider().as_dict()
+                self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+        return _async_remove
+
+    @callback
+    def async_forget(self, entry_id: str) -> None:
+        """Drop a removed room's snapshot."""
+        self._providers.pop(entry_id, None)
+        if self._saved.pop(entry_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop the periodic save and write the snapshots now."""
+        if self._unsub_interval is not None:
+            self._unsub_interval()
+            self._unsub_interval = None
+        self._store.async_delay_save(self._data_to_save, 0)
+
+    @callback
+    def _async_interval(self, _now: datetime) -> None:
+        if self._providers:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        return {
+            **self._saved,
+            **{entry_id: provider().as_dict() for entry_id, provider in self._providers.items()},
+        }
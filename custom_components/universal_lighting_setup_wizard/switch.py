@@ -0,0 +1,86 @@
+"""Switch platform for Universal Smart Lighting Setup Wizard.
+
+Blueprint rooms get a "Template Profiling" configuration switch: while it is
+on, the shared TemplateProfiler times every variable of the room's
+automation (see profiler.py) and the room's diagnostics carry the sorted
+report. It always starts off - profiling is a troubleshooting aid, not
+something to leave running across restarts.
+
+Profiling swaps private Home Assistant internals (see profiler.py). On a
+release that no longer has them, turning the switch on fails with an error,
+and a switch that is already on turns itself off with a Repairs issue.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import CONF_ENGINE, DATA_PROFILER, ENGINE_BLUEPRINT, SIGNAL_PROFILING_STOPPED
+from .decision import RoomConfig
+from .profiler import TemplateProfiler
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Add the profiling switch of a blueprint room (native rooms render no templates)."""
+    automation_id = entry.data.get("automation_id")
+    if entry.data.get(CONF_ENGINE, ENGINE_BLUEPRINT) != ENGINE_BLUEPRINT or not automation_id:
+        return
+    async_add_entities([
+        TemplateProfilingSwitch(
+            entry, RoomConfig.from_entry_data(entry.data), automation_id,
+            hass.data[DATA_PROFILER],
+        )
+    ])
+
+
+class TemplateProfilingSwitch(SwitchEntity):
+    """Times each variable of the room's blueprint automation while on.
+
+    Relies on Home Assistant internals (the automation entity's `_variables`);
+    turning it on raises ProfilingUnsupported where they are missing.
+    """
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.CONFIG
+    _attr_icon = "mdi:timer-cog-outline"
+
+    def __init__(self, entry: ConfigEntry, config: RoomConfig, automation_id: str,
+                 profiler: TemplateProfiler) -> None:
+        """Initialize from the room's settings and the shared profiler."""
+        self._automation_id = automation_id
+        self._profiler = profiler
+        self._attr_unique_id = f"{entry.entry_id}_template_profiling"
+        self._attr_name = f"{config.room_name} Template Profiling"
+
+    async def async_added_to_hass(self) -> None:
+        """Follow profiling that stops without the switch (see profiler.py)."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, f"{SIGNAL_PROFILING_STOPPED}_{self._automation_id}",
+                self.async_write_ha_state,
+            )
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Put the automation's own variables back."""
+        self._profiler.async_stop(self._automation_id)
+
+    @property
+    def is_on(self) -> bool:
+        return self._profiler.is_active(self._automation_id)
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        self._profiler.async_start(self._automation_id)
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        self._profiler.async_stop(self._automation_id)
+        self.async_write_ha_state()
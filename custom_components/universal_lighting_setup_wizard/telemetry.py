@@ -0,0 +1,129 @@
+"""Per-room performance telemetry, aggregated in bounded histograms.
+
+The blueprint only reports its "Execution Time" inside the debug summary it
+writes with system_log.write - lost unless debug logs are on and someone
+reads the log. Each room instead keeps a RoomTelemetry in memory: counters
+plus fixed-size, log-bucketed latency histograms. Recording a sample is one
+log10 and a list increment, memory never grows however long HA runs, and
+p50/p95/p99 are read off the bucket counts (within ~6% - 20 buckets per
+decade). The diagnostic sensors in sensor.py publish them.
+
+Pure Python, no Home Assistant imports.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from itertools import accumulate
+import math
+from typing import Any
+
+BUCKETS_PER_DECADE = 20
+MIN_MS = 0.001  # 1 µs - native decisions take tens of µs
+MAX_MS = 100_000.0  # 100 s
+_BUCKETS = round(math.log10(MAX_MS / MIN_MS)) * BUCKETS_PER_DECADE
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (milliseconds) with a fixed memory footprint.
+
+    Bucket 0 holds samples <= MIN_MS, the last bucket samples >= MAX_MS;
+    bucket i in between covers [MIN_MS * 10**((i-1)/B), MIN_MS * 10**(i/B)).
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (_BUCKETS + 2)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float) -> None:
+        """Record one sample."""
+        if ms <= MIN_MS:
+            index = 0
+        elif ms >= MAX_MS:
+            index = _BUCKETS + 1
+        else:
+            index = 1 + int(math.log10(ms / MIN_MS) * BUCKETS_PER_DECADE)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, q: float) -> float | None:
+        """Estimated q-quantile (0 < q <= 1), None while empty.
+
+        The bucket's geometric midpoint, capped at the largest sample seen.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        # First bucket whose cumulative count reaches the rank
+        index = bisect_left(list(accumulate(self.counts)), rank)
+        if index == 0:
+            return min(MIN_MS, self.max)
+        if index == _BUCKETS + 1:
+            return self.max
+        return min(MIN_MS * 10 ** ((index - 0.5) / BUCKETS_PER_DECADE), self.max)
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """count / p50 / p95 / p99 / mean / max, rounded for display."""
+        def _round(value: float | None) -> float | None:
+            return None if value is None else round(value, 3)
+
+        return {
+            "count": self.count,
+            "p50": _round(self.percentile(0.50)),
+            "p95": _round(self.percentile(0.95)),
+            "p99": _round(self.percentile(0.99)),
+            "mean": _round(self.mean),
+            "max": _round(self.max if self.count else None),
+        }
+
+
+@dataclass
+class RoomTelemetry:
+    """Everything measured for one room since Home Assistant started.
+
+    decision_latency: native engine - derived refresh + evaluate();
+        blueprint - the automation's action run (its "Execution Time").
+    command_latency: triggering state change -> light/switch service call.
+    template_render: blueprint only - triggering state change -> automation
+        started, i.e. rendering the `variables:` block and the template
+        conditions.
+    restarted_runs: blueprint only - runs cut off by `mode: restart`.
+    coalesced_triggers: native only - triggers merged into another trigger's
+        decision by the coalescing window (runs saved).
+    suppressed_commands: native only - lights left out of a command because
+        they already were in (or within the deltas of) the target state.
+    fast_path_runs: native only - presence turn-ons sent on the fast path
+        (straight from the state change, helper writes after the command).
+    """
+
+    runs: int = 0
+    restarted_runs: int = 0
+    coalesced_triggers: int = 0
+    suppressed_commands: int = 0
+    fast_path_runs: int = 0
+    decision_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    command_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    template_render: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "restarted_runs": self.restarted_runs,
+            "coalesced_triggers": self.coalesced_triggers,
+            "suppressed_commands": self.suppressed_commands,
+            "fast_path_runs": self.fast_path_runs,
+            "decision_latency": self.decision_latency.as_dict(),
+            "command_latency": self.command_latency.as_dict(),
+            "template_render": self.template_render.as_dict(),
+        }
@@ -0,0 +1,50 @@
+"""Websocket commands for Universal Smart Lighting Setup Wizard.
+
+`universal_lighting_setup_wizard/trace/subscribe` (entry_id) streams a
+room's decision trace (decision_trace.py): one event with the buffered
+records, then one per new record until the subscription is closed.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_TRACES, DOMAIN
+from .decision_trace import DecisionRecord
+
+
+@callback
+def async_register_commands(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe_trace)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/trace/subscribe",
+        vol.Required("entry_id"): str,
+    }
+)
+@websocket_api.require_admin
+@callback
+def websocket_subscribe_trace(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Subscribe to a room's decision records."""
+    if (trace := hass.data.get(DATA_TRACES, {}).get(msg["entry_id"])) is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Room not found")
+        return
+
+    @callback
+    def _async_forward(record: DecisionRecord) -> None:
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"records": [record.as_dict()]})
+        )
+
+    connection.subscriptions[msg["id"]] = trace.listen(_async_forward)
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"records": trace.as_list()}))
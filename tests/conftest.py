@@ -0,0 +1,25 @@
+"""Fixtures for the whole-house simulation (tests/simulation.py)."""
+from __future__ import annotations
+
+import asyncio
+from typing import Callable
+
+import pytest
+
+from tests.simulation import Counters, simulate
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "slow: simulations that take seconds of CPU (deselect with -m 'not slow')"
+    )
+
+
+@pytest.fixture(scope="session")
+def run_house() -> Callable[..., Counters]:
+    """Play the scripted evening in a fresh house; what benchmarks/bench_simulation.py times."""
+
+    def run(rooms: int, engine: str = "native") -> Counters:
+        return asyncio.run(simulate(rooms, engine))
+
+    return run
@@ -0,0 +1,385 @@
+"""Deterministic whole-house simulation on a frozen clock.
+
+Boots an in-process Home Assistant core with N rooms set up the way the
+wizard sets them up - the YAML helpers plus either a native-engine config
+entry of this integration, the blueprint automation block from
+config_flow._automation_config() or the same automation compiled per room -
+and replays one scripted sensor timeline per room: PIR, mmWave, indoor lux,
+bed and wall switch presses, staggered so rooms interleave.
+
+The clock is frozen: simulated time only moves when the script advances it,
+and every timer that falls due on the way (coalescing and batching windows,
+bed delays, vacancy timeouts, the blueprint's delays and time triggers)
+fires in order at its simulated time. Two runs therefore issue the same
+commands at the same simulated instants; only the CPU timings vary.
+
+Shared by the tests (tests/conftest.py) and benchmarks/bench_simulation.py.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+from datetime import datetime, time as dt_time, timedelta, timezone
+import heapq
+import os
+import tempfile
+import time
+import types
+from typing import Any, Iterator
+from unittest import mock
+
+from homeassistant import config_entries, core as ha_core, loader
+from homeassistant.const import EVENT_CALL_SERVICE
+from homeassistant.core import Context, HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    event as event_helper,
+    issue_registry as ir,
+    restore_state,
+    template,
+)
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util, yaml as yaml_util
+
+from custom_components.universal_lighting_setup_wizard.config_flow import (
+    BLUEPRINT_PATH,
+    _automation_config,
+    _helpers_config,
+)
+from custom_components.universal_lighting_setup_wizard.compiler import (
+    compile_automation,
+)
+from custom_components.universal_lighting_setup_wizard.const import DOMAIN
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# One room's evening, in simulated seconds from the room's start
+TIMELINE: tuple[tuple[float, str, str], ...] = (
+    (0, "lux", "6"),
+    (5, "pir", "on"),             # walks into the dark room
+    (7, "mmwave", "on"),
+    (40, "pir", "off"),
+    (90, "lux", "9"),
+    (150, "lux", "7"),
+    (200, "switch", "off"),       # wall switch: manual off -> override
+    (230, "switch", "on"),        # ... and back on
+    (300, "bed", "on"),           # goes to bed
+    (330, "pir", "on"),
+    (335, "pir", "off"),
+    (900, "bed", "off"),          # gets up
+    (905, "pir", "on"),
+    (920, "pir", "off"),
+    (960, "mmwave", "off"),       # leaves; vacancy timeout from here
+    (1400, "lux", "5"),
+    (2400, "pir", "on"),          # comes back once the override expired
+    (2402, "mmwave", "on"),
+    (2430, "pir", "off"),
+    (2500, "mmwave", "off"),
+)
+# The walk-ins into the dark room, which must turn the lights on
+WALK_INS = (5, 2400)
+STAGGER_SECONDS = 0.37
+WARM_UP_SECONDS = 60
+TAIL_SECONDS = 900
+
+
+def room_data(index: int, engine: str) -> dict[str, Any]:
+    """Wizard data for room `index` (every room has the same sensors)."""
+    name = f"room_{index:03d}"
+    return {
+        "room_name": name,
+        "sanitized_room_name": name,
+        "control_mode": "lights_only",
+        "light_entities": [f"light.{name}_ceiling", f"light.{name}_lamp"],
+        "presence_pir_sensor": f"binary_sensor.{name}_pir",
+        "presence_mmwave_sensor": f"binary_sensor.{name}_mmwave",
+        "illuminance_sensor": f"sensor.{name}_lux",
+        "fixed_latency_seconds": 30,
+        "vacancy_timeout_multiplier": 2,
+        "override_timeout_hours": 0.5,
+        "enable_bed_sensor": True,
+        "bed_occupied_helper": f"binary_sensor.{name}_bed",
+        "enable_update_check": False,
+        "engine": engine,
+        "automation_id": f"universal_lighting_{name}",
+    }
+
+
+def _entity(room: dict[str, Any], role: str) -> str:
+    return {
+        "pir": room["presence_pir_sensor"],
+        "mmwave": room["presence_mmwave_sensor"],
+        "lux": room["illuminance_sensor"],
+        "bed": room["bed_occupied_helper"],
+        "switch": room["light_entities"][0],
+    }[role]
+
+
+class FrozenClock:
+    """Simulated time for the event loop, dt_util and the event helpers."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.monotonic = loop.time()
+        # The evening starts at 19:00 UTC tomorrow: the same time of day and
+        # the same whole-second and whole-minute alignment (time patterns,
+        # second-resolution deadlines) on every run, and never behind the
+        # states and timers created before the clock froze
+        tomorrow = datetime.now(timezone.utc).date() + timedelta(days=1)
+        evening = datetime.combine(tomorrow, dt_time(19), timezone.utc)
+        self._epoch = evening.timestamp() - self.monotonic
+        self._executor_jobs: set[asyncio.Future] = set()
+
+    def time(self) -> float:
+        return self.monotonic
+
+    def timestamp(self) -> float:
+        return self._epoch + self.monotonic
+
+    def utcnow(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp(), timezone.utc)
+
+    def now(self, time_zone: Any = None) -> datetime:
+        return self.utcnow().astimezone(time_zone or dt_util.DEFAULT_TIME_ZONE)
+
+    def run_in_executor(self, executor: Any, func: Any, *args: Any) -> asyncio.Future:
+        """loop.run_in_executor, remembering the job so settle() waits for it."""
+        future = self._run_in_executor(executor, func, *args)
+        self._executor_jobs.add(future)
+        future.add_done_callback(self._executor_jobs.discard)
+        return future
+
+    @contextlib.contextmanager
+    def installed(self) -> Iterator[FrozenClock]:
+        self._run_in_executor = self.loop.run_in_executor
+        with contextlib.ExitStack() as stack:
+            for target, name, value in (
+                (self.loop, "time", self.time),
+                (self.loop, "run_in_executor", self.run_in_executor),
+                (dt_util, "utcnow", self.utcnow),
+                (dt_util, "now", self.now),
+                (event_helper, "time_tracker_utcnow", self.utcnow),
+                (event_helper, "time_tracker_timestamp", self.timestamp),
+                (event_helper, "time", types.SimpleNamespace(time=self.timestamp)),
+                # States written without a context stamp themselves with time.time()
+                (ha_core, "time", types.SimpleNamespace(time=self.timestamp)),
+            ):
+                stack.enter_context(mock.patch.object(target, name, value))
+            yield self
+
+    async def settle(self) -> None:
+        """Run the loop until nothing is ready (timers not due stay pending).
+
+        Executor jobs (store writes, sync listeners) finish in real time, so
+        time stands still until every one of them is back on the loop.
+        """
+        loop: Any = self.loop
+        await asyncio.sleep(0)
+        while loop._ready or self._executor_jobs:
+            if not loop._ready:
+                await asyncio.wait(list(self._executor_jobs))
+            await asyncio.sleep(0)
+
+    def _next_timer(self) -> float | None:
+        """When the loop's earliest live timer is due."""
+        loop: Any = self.loop
+        scheduled = loop._scheduled
+        # Drop cancelled timers from the head of the heap, as _run_once does
+        while scheduled and scheduled[0].cancelled():
+            loop._timer_cancelled_count -= 1
+            heapq.heappop(scheduled)._scheduled = False
+        return scheduled[0].when() if scheduled else None
+
+    async def advance_to(self, monotonic: float) -> None:
+        """Move time forward, firing every timer due on the way in order."""
+        while True:
+            await self.settle()
+            due = self._next_timer()
+            if due is None or due > monotonic:
+                break
+            self.monotonic = max(self.monotonic, due)
+        self.monotonic = max(self.monotonic, monotonic)
+        await self.settle()
+
+
+@dataclass
+class Counters:
+    """What one simulation run did."""
+
+    renders: int = 0
+    light_calls: int = 0
+    helper_writes: int = 0
+    cpu_s: float = 0.0
+    cpu_ms: list[float] = field(default_factory=list)
+    motion_to_on_ms: list[float] = field(default_factory=list)
+    # (simulated seconds since the clock froze, domain, service, entity ids)
+    # for every light and helper service call, in the order they were made
+    commands: list[tuple[float, str, str, tuple[str, ...]]] = field(default_factory=list)
+
+
+async def _make_hass(config_dir: str) -> HomeAssistant:
+    hass = HomeAssistant(config_dir)
+    hass.config.set_time_zone("UTC")
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    entity.async_setup(hass)
+    template.async_setup(hass)
+    await ar.async_load(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    await ir.async_load(hass)
+    await restore_state.async_load(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await hass.async_start()
+    return hass
+
+
+def _write_flat_blueprint(source: str, target: str) -> None:
+    """Copy the blueprint with its input sections flattened.
+
+    Collapsible input sections need Home Assistant 2024.6; flat inputs load
+    on any version, and the automation itself is unchanged.
+    """
+    blueprint = yaml_util.load_yaml(source)
+    inputs: dict[str, Any] = {}
+    for key, value in blueprint["blueprint"]["input"].items():
+        if isinstance(value, dict) and "input" in value:
+            inputs.update(value["input"])
+        else:
+            inputs[key] = value
+    blueprint["blueprint"]["input"] = inputs
+    with open(target, "w", encoding="utf-8") as f:
+        f.write(yaml_util.dump(blueprint))
+
+
+async def _setup_house(hass: HomeAssistant, rooms: list[dict[str, Any]], engine: str) -> None:
+    """Helpers and sensors for every room, then the engine under test."""
+    helpers: dict[str, dict] = {}
+    for room in rooms:
+        for domain, objects in _helpers_config(room["room_name"], room["sanitized_room_name"]).items():
+            helpers.setdefault(domain, {}).update(objects)
+        for light in room["light_entities"]:
+            hass.states.async_set(light, "off")
+        for role in ("pir", "mmwave", "bed"):
+            hass.states.async_set(_entity(room, role), "off")
+        hass.states.async_set(_entity(room, "lux"), "6")
+    for domain, objects in helpers.items():
+        assert await async_setup_component(hass, domain, {domain: objects})
+    for domain in ("system_log", "persistent_notification"):
+        assert await async_setup_component(hass, domain, {})
+
+    if engine == "blueprint":
+        blueprint = os.path.join(hass.config.config_dir, "blueprints", "automation", BLUEPRINT_PATH)
+        os.makedirs(os.path.dirname(blueprint), exist_ok=True)
+        _write_flat_blueprint(os.path.join(REPO, "Universal-Smart-Light-Automation.yaml"), blueprint)
+        automations = [_automation_config(room) for room in rooms]
+        assert await async_setup_component(hass, "automation", {"automation": automations})
+    elif engine == "compiled":
+        with open(os.path.join(REPO, "Universal-Smart-Light-Automation.yaml"), encoding="utf-8") as f:
+            source = f.read()
+        automations = [compile_automation(source, _automation_config(room)).config for room in rooms]
+        assert await async_setup_component(hass, "automation", {"automation": automations})
+    else:
+        assert await async_setup_component(hass, DOMAIN, {})
+        for room in rooms:
+            await hass.config_entries.async_add(config_entries.ConfigEntry(
+                version=2, minor_version=1, domain=DOMAIN, title=room["room_name"],
+                data={**room, "setup_notified": True}, source=config_entries.SOURCE_USER,
+            ))
+    await hass.async_block_till_done()
+
+
+def _register_fake_lights(hass: HomeAssistant, clock: FrozenClock,
+                          turned_on: dict[str, list[float]]) -> None:
+    """light.turn_on / turn_off that report the new state right away."""
+
+    async def handle(call: ServiceCall) -> None:
+        entity_ids = call.data.get("entity_id") or []
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        state = "on" if call.service == "turn_on" else "off"
+        for entity_id in entity_ids:
+            if state == "on":
+                turned_on.setdefault(entity_id, []).append(clock.monotonic)
+            hass.states.async_set(entity_id, state, context=call.context)
+
+    for service in ("turn_on", "turn_off"):
+        hass.services.async_register("light", service, handle)
+
+
+async def simulate(rooms_count: int, engine: str) -> Counters:
+    """Play the scripted evening in a house of `rooms_count` rooms."""
+    counters = Counters()
+    # Time pattern triggers fire at a random fraction of a second; pin it
+    with tempfile.TemporaryDirectory() as config_dir, \
+            mock.patch.object(event_helper, "randint", lambda low, high: low):
+        os.symlink(os.path.join(REPO, "custom_components"),
+                   os.path.join(config_dir, "custom_components"))
+        hass = await _make_hass(config_dir)
+        rooms = [room_data(index, engine) for index in range(rooms_count)]
+        turned_on: dict[str, list[float]] = {}
+        walk_ins: list[tuple[str, float]] = []
+        await _setup_house(hass, rooms, engine)
+        # Frozen from here on: nothing set up above is in the clock's future
+        clock = FrozenClock(hass.loop)
+        frozen_at = clock.monotonic
+        _register_fake_lights(hass, clock, turned_on)
+
+        @callback
+        def count_call(event: Any) -> None:
+            domain = event.data["domain"]
+            if domain == "light":
+                counters.light_calls += 1
+            elif domain.startswith("input_"):
+                counters.helper_writes += 1
+            else:
+                return
+            entity_ids = event.data["service_data"].get("entity_id") or ()
+            if isinstance(entity_ids, str):
+                entity_ids = (entity_ids,)
+            counters.commands.append((
+                round(clock.monotonic - frozen_at, 3), domain, event.data["service"],
+                tuple(sorted(entity_ids)),
+            ))
+
+        hass.bus.async_listen(EVENT_CALL_SERVICE, count_call)
+        real_render = template.Template.async_render
+
+        def counting_render(self: template.Template, *args: Any, **kwargs: Any) -> Any:
+            counters.renders += 1
+            return real_render(self, *args, **kwargs)
+
+        events = sorted(
+            (index * STAGGER_SECONDS + offset, index, role, value)
+            for index in range(rooms_count)
+            for offset, role, value in TIMELINE
+        )
+        with clock.installed(), mock.patch.object(template.Template, "async_render", counting_render):
+            # Past the bed exit delay of the initial states
+            start = clock.monotonic + WARM_UP_SECONDS
+            await clock.advance_to(start)
+            began_run = time.perf_counter()
+            for offset, index, role, value in events:
+                await clock.advance_to(start + offset)
+                room = rooms[index]
+                entity_id = _entity(room, role)
+                if role == "pir" and round(offset - index * STAGGER_SECONDS, 6) in WALK_INS:
+                    walk_ins.append((room["light_entities"][0], clock.monotonic))
+                began = time.perf_counter()
+                # A wall switch is a light reporting a change nobody asked for
+                hass.states.async_set(entity_id, value, context=Context())
+                await clock.settle()
+                counters.cpu_ms.append((time.perf_counter() - began) * 1000)
+            await clock.advance_to(start + events[-1][0] + TAIL_SECONDS)
+            counters.cpu_s = time.perf_counter() - began_run
+        for light, fired in walk_ins:
+            lit = [on_at for on_at in turned_on.get(light, ()) if fired <= on_at < fired + 60]
+            if lit:
+                counters.motion_to_on_ms.append((lit[0] - fired) * 1000)
+        await hass.async_stop(force=True)
+    return counters
@@ -0,0 +1,235 @@
+"""Table-driven tests for the native engine's decision logic (decision.py)."""
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from custom_components.universal_lighting_setup_wizard.decision import (
+    ACTION_NONE,
+    ACTION_TURN_OFF,
+    ACTION_TURN_ON,
+    BED_INVALID_GRACE_SECONDS,
+    OVERRIDE_VACANCY_SECONDS,
+    PRIMARY_SETTLE_SECONDS,
+    RoomConfig,
+    RoomState,
+    classify_manual_change,
+    evaluate,
+    next_deadline,
+)
+
+NOW = 1_800_000_000.0
+LOCAL_HOUR = 20
+HOUR = 3600
+# Set just past the default 3 h override timeout
+EXPIRED = NOW - 3 * HOUR - 1
+
+ROOM = RoomConfig(
+    room_name="Office",
+    sanitized_room_name="office",
+    control_mode="lights_only",
+    light_entities=("light.office",),
+    presence_pir_sensor="binary_sensor.office_pir",
+    illuminance_sensor="sensor.office_lux",
+)
+BED_ROOM = replace(ROOM, bed_occupied_helper="binary_sensor.office_bed")
+GUEST_ROOM = replace(ROOM, enable_guest_mode=True)
+ALWAYS_BLOCK = replace(ROOM, daytime_control_mode="always_block")
+BLOCK_WHEN_AWAY = replace(ROOM, daytime_control_mode="block_when_away",
+                          presence_trackers=("person.a",))
+VACANCY_CLEAR = replace(ROOM, override_behavior="vacancy_clear", vacancy_clear_minutes=5)
+IGNORE_PRESENCE = replace(ROOM, override_respect_presence=False)
+
+# Occupied and dark / bright, or vacant for ten minutes; nothing changed recently
+DARK = {"pir_on": True, "illuminance": 10.0}
+BRIGHT = {"pir_on": True, "illuminance": 500.0}
+VACANT = {"vacant_since": NOW - 10 * 60, "illuminance": 10.0}
+
+
+@pytest.mark.parametrize(
+    ("config", "state", "action", "reason"),
+    [
+        pytest.param(ROOM, RoomState(**DARK),
+                     ACTION_TURN_ON, "dark_and_occupied", id="dark-occupied"),
+        pytest.param(ROOM, RoomState(**BRIGHT),
+                     ACTION_NONE, "no_change", id="bright-occupied"),
+        pytest.param(ROOM, RoomState(**VACANT, lights_on=True),
+                     ACTION_TURN_OFF, "room_vacant", id="vacancy-timeout"),
+        pytest.param(ROOM, RoomState(vacant_since=NOW - 30, illuminance=10.0, lights_on=True),
+                     ACTION_NONE, "no_change", id="inside-vacancy-timeout"),
+        pytest.param(ROOM, RoomState(**DARK, primary_changed_at=NOW - 1),
+                     ACTION_NONE, "primary_recently_changed", id="primary-settling"),
+        # Inverted thresholds: nothing is decided at all
+        pytest.param(replace(ROOM, dark_threshold=200, bright_threshold=30), RoomState(**DARK),
+                     ACTION_NONE, "inverted_thresholds", id="inverted-thresholds"),
+        pytest.param(replace(ROOM, dark_threshold=50, bright_threshold=50),
+                     RoomState(**VACANT, lights_on=True),
+                     ACTION_NONE, "inverted_thresholds", id="equal-thresholds"),
+        # Bed entry delay: lights stay on until the bed has been occupied long enough
+        pytest.param(BED_ROOM,
+                     RoomState(**DARK, lights_on=True, bed_state="on", bed_changed_at=NOW - 5),
+                     ACTION_NONE, "no_change", id="bed-entry-delay-pending"),
+        pytest.param(BED_ROOM,
+                     RoomState(**DARK, lights_on=True, bed_state="on", bed_changed_at=NOW - 15),
+                     ACTION_TURN_OFF, "bed_occupied", id="bed-entry-delay-elapsed"),
+        pytest.param(replace(BED_ROOM, turn_off_when_bed_occupied=False),
+                     RoomState(**DARK, lights_on=True, bed_state="on", bed_changed_at=NOW - 60),
+                     ACTION_NONE, "no_change", id="bed-keeps-lights-on"),
+        # Bed exit delay and dropout grace block auto-on
+        pytest.param(BED_ROOM, RoomState(**DARK, bed_state="off", bed_changed_at=NOW - 5),
+                     ACTION_NONE, "no_change", id="bed-exit-delay-pending"),
+        pytest.param(BED_ROOM, RoomState(**DARK, bed_state="off", bed_changed_at=NOW - 15),
+                     ACTION_TURN_ON, "dark_and_occupied", id="bed-exit-delay-elapsed"),
+        pytest.param(BED_ROOM,
+                     RoomState(**DARK, bed_state=None,
+                               bed_changed_at=NOW - BED_INVALID_GRACE_SECONDS + 1),
+                     ACTION_NONE, "no_change", id="bed-dropout-grace"),
+        pytest.param(replace(BED_ROOM, enable_guest_mode=True),
+                     RoomState(**DARK, bed_state="on", bed_changed_at=NOW - 60),
+                     ACTION_TURN_ON, "dark_and_occupied", id="bed-ignored-for-guests"),
+        # Daytime gate
+        pytest.param(ALWAYS_BLOCK, RoomState(**DARK, is_daytime=True),
+                     ACTION_NONE, "auto_on_prevented", id="daytime-always-block"),
+        pytest.param(ALWAYS_BLOCK, RoomState(**DARK, is_daytime=False),
+                     ACTION_TURN_ON, "dark_and_occupied", id="night-always-block"),
+        pytest.param(ALWAYS_BLOCK, RoomState(**DARK, is_daytime=True, lights_on=True),
+                     ACTION_TURN_OFF, "daytime_energy_saving", id="daytime-energy-saving"),
+        pytest.param(BLOCK_WHEN_AWAY, RoomState(**DARK, is_daytime=True, someone_home=False),
+                     ACTION_NONE, "auto_on_prevented", id="daytime-everyone-away"),
+        pytest.param(BLOCK_WHEN_AWAY, RoomState(**DARK, is_daytime=True, someone_home=True),
+                     ACTION_TURN_ON, "dark_and_occupied", id="daytime-someone-home"),
+        pytest.param(replace(BLOCK_WHEN_AWAY, presence_trackers=()),
+                     RoomState(**DARK, is_daytime=True, someone_home=False),
+                     ACTION_TURN_ON, "dark_and_occupied", id="block-when-away-without-trackers"),
+        # Manual override and its expiry
+        pytest.param(ROOM,
+                     RoomState(**DARK, manual_override=True, override_changed_at=NOW - HOUR),
+                     ACTION_NONE, "manual_override", id="override-active"),
+        pytest.param(ROOM, RoomState(**DARK, manual_override=True, override_changed_at=EXPIRED),
+                     ACTION_NONE, "manual_override", id="override-expired-while-present"),
+        pytest.param(IGNORE_PRESENCE,
+                     RoomState(**DARK, manual_override=True, override_changed_at=EXPIRED),
+                     ACTION_TURN_ON, "dark_and_occupied", id="override-expired"),
+        pytest.param(ROOM,
+                     RoomState(**VACANT, lights_on=True, manual_override=True,
+                               override_changed_at=EXPIRED),
+                     ACTION_TURN_OFF, "room_vacant", id="override-expired-while-vacant"),
+        pytest.param(replace(IGNORE_PRESENCE, enable_guest_mode=True),
+                     RoomState(**DARK, manual_override=True, override_changed_at=EXPIRED),
+                     ACTION_NONE, "manual_override", id="override-guest-doubles-timeout"),
+        pytest.param(VACANCY_CLEAR,
+                     RoomState(**VACANT, lights_on=True, manual_override=True,
+                               override_changed_at=NOW - HOUR),
+                     ACTION_TURN_OFF, "room_vacant", id="override-vacancy-clear"),
+    ],
+)
+def test_evaluate(config: RoomConfig, state: RoomState, action: str, reason: str) -> None:
+    decision = evaluate(config, state, NOW, LOCAL_HOUR)
+    assert (decision.action, decision.reason) == (action, reason)
+
+
+@pytest.mark.parametrize(
+    ("config", "state", "cleared"),
+    [
+        pytest.param(IGNORE_PRESENCE,
+                     RoomState(**DARK, manual_override=True, override_changed_at=NOW - 3 * HOUR),
+                     None, id="at-timeout"),
+        pytest.param(IGNORE_PRESENCE,
+                     RoomState(**DARK, manual_override=True, override_changed_at=EXPIRED),
+                     "timeout (3h)", id="past-timeout"),
+        pytest.param(replace(IGNORE_PRESENCE, enable_guest_mode=True),
+                     RoomState(**DARK, manual_override=True,
+                               override_changed_at=NOW - 6 * HOUR - 1),
+                     "timeout (6.0h guest mode)", id="past-guest-timeout"),
+        pytest.param(ROOM,
+                     RoomState(vacant_since=NOW - OVERRIDE_VACANCY_SECONDS, manual_override=True,
+                               override_changed_at=EXPIRED),
+                     "timeout while vacant (3h)", id="past-timeout-vacant"),
+        pytest.param(ROOM,
+                     RoomState(vacant_since=NOW - OVERRIDE_VACANCY_SECONDS + 1,
+                               manual_override=True, override_changed_at=EXPIRED),
+                     None, id="past-timeout-briefly-vacant"),
+        pytest.param(VACANCY_CLEAR,
+                     RoomState(vacant_since=NOW - 10 * 60, manual_override=True,
+                               override_changed_at=NOW - 5 * 60),
+                     "vacancy (10min)", id="vacancy-clear"),
+        pytest.param(VACANCY_CLEAR,
+                     RoomState(vacant_since=NOW - 10 * 60, manual_override=True,
+                               override_changed_at=NOW - 4 * 60),
+                     None, id="vacancy-clear-override-too-new"),
+    ],
+)
+def test_override_expiry(config: RoomConfig, state: RoomState, cleared: str | None) -> None:
+    decision = evaluate(config, state, NOW, LOCAL_HOUR)
+    assert decision.override_clear_reason == cleared
+    assert decision.clear_override is (cleared is not None)
+
+
+@pytest.mark.parametrize(
+    ("config", "state", "deadline"),
+    [
+        pytest.param(ROOM, RoomState(**DARK), None, id="idle"),
+        pytest.param(ROOM, RoomState(**DARK, primary_changed_at=NOW - 1),
+                     NOW - 1 + PRIMARY_SETTLE_SECONDS, id="primary-settle"),
+        pytest.param(BED_ROOM, RoomState(**DARK, bed_state="on", bed_changed_at=NOW - 5),
+                     NOW + 10, id="bed-entry-delay"),
+        pytest.param(BED_ROOM, RoomState(**DARK, bed_state="off", bed_changed_at=NOW - 5),
+                     NOW + 10, id="bed-exit-delay"),
+        pytest.param(BED_ROOM, RoomState(**DARK, bed_state=None, bed_changed_at=NOW - 5),
+                     NOW - 5 + BED_INVALID_GRACE_SECONDS, id="bed-dropout-grace"),
+        pytest.param(ROOM, RoomState(vacant_since=NOW - 30, lights_on=True),
+                     NOW + 30, id="vacancy-timeout"),
+        pytest.param(ROOM, RoomState(vacant_since=NOW - 30), None, id="vacant-lights-off"),
+        pytest.param(ROOM,
+                     RoomState(**DARK, manual_override=True, override_changed_at=NOW - HOUR),
+                     NOW + 2 * HOUR + 1, id="override-expiry"),
+        pytest.param(GUEST_ROOM,
+                     RoomState(**DARK, manual_override=True, override_changed_at=NOW - HOUR),
+                     NOW + 5 * HOUR + 1, id="override-expiry-guest"),
+        pytest.param(ROOM,
+                     RoomState(vacant_since=NOW - 60, manual_override=True,
+                               override_changed_at=NOW - HOUR),
+                     NOW - 60 + OVERRIDE_VACANCY_SECONDS, id="override-sustained-vacancy"),
+        pytest.param(VACANCY_CLEAR,
+                     RoomState(vacant_since=NOW - 4 * 60 - 50, manual_override=True,
+                               override_changed_at=NOW - HOUR),
+                     NOW + 10, id="override-vacancy-clear"),
+    ],
+)
+def test_next_deadline(config: RoomConfig, state: RoomState, deadline: float | None) -> None:
+    assert next_deadline(config, state, NOW) == deadline
+
+
+@pytest.mark.parametrize(
+    ("config", "state", "turned_on", "override"),
+    [
+        # Against what the automation wants: set the override
+        pytest.param(ROOM, RoomState(**BRIGHT), True, True, id="on-in-bright-room"),
+        pytest.param(ROOM, RoomState(**DARK, lights_on=True), False, True, id="off-in-dark-room"),
+        pytest.param(BED_ROOM, RoomState(**DARK, bed_state="on", bed_changed_at=NOW - 60),
+                     True, True, id="on-while-in-bed"),
+        pytest.param(ALWAYS_BLOCK, RoomState(**DARK, is_daytime=True),
+                     True, True, id="on-in-blocked-daytime"),
+        # What the automation would have done anyway: clear it
+        pytest.param(ROOM, RoomState(**DARK), True, False, id="on-in-dark-room"),
+        pytest.param(ROOM, RoomState(**VACANT, lights_on=True), False, False,
+                     id="off-when-vacant"),
+        pytest.param(BED_ROOM,
+                     RoomState(**DARK, lights_on=True, bed_state="on", bed_changed_at=NOW - 60),
+                     False, False, id="off-when-in-bed"),
+        pytest.param(ALWAYS_BLOCK, RoomState(**DARK, is_daytime=True, lights_on=True),
+                     False, False, id="off-in-blocked-daytime"),
+        pytest.param(ROOM, RoomState(**BRIGHT, is_daytime=True, lights_on=True),
+                     False, False, id="off-in-bright-daylight"),
+        # User preference
+        pytest.param(ROOM, RoomState(**BRIGHT, is_daytime=False, lights_on=True),
+                     False, True, id="off-in-bright-room-at-night"),
+        pytest.param(replace(ROOM, dark_threshold=50, bright_threshold=60),
+                     RoomState(pir_on=True, illuminance=55.0, lights_on=True),
+                     False, True, id="off-in-narrow-band"),
+    ],
+)
+def test_classify_manual_change(config: RoomConfig, state: RoomState, turned_on: bool,
+                                override: bool) -> None:
+    assert classify_manual_change(config, state, NOW, turned_on) is override
@@ -0,0 +1,57 @@
+"""Whole-house simulation: determinism, budgets and parity with the blueprint."""
+from __future__ import annotations
+
+from typing import Callable
+
+import pytest
+
+from tests.simulation import WALK_INS, Counters
+
+# Per room, for the scripted evening: on at the walk-in, off at bed entry,
+# on at bed exit, off after the vacancy timeout, on and off once more
+LIGHT_CALLS_PER_ROOM = 6
+# occupancy, auto-on, override and last-action helpers for those decisions
+HELPER_WRITES_PER_ROOM = 18
+# The native engine decides in Python; it renders no templates at all
+RENDERS = 0
+# Interval of the blueprint's time_pattern periodic check
+BLUEPRINT_POLL_SECONDS = 5
+
+
+@pytest.fixture(scope="module", params=[1, 25, pytest.param(200, marks=pytest.mark.slow)])
+def evening(request: pytest.FixtureRequest,
+            run_house: Callable[..., Counters]) -> tuple[int, Counters, Counters]:
+    """Two runs of the same evening in a house of `request.param` rooms."""
+    return request.param, run_house(request.param), run_house(request.param)
+
+
+def test_runs_issue_the_same_commands(evening: tuple[int, Counters, Counters]) -> None:
+    _, first, second = evening
+    assert first.commands
+    assert first.commands == second.commands
+
+
+def test_every_walk_in_is_lit(evening: tuple[int, Counters, Counters]) -> None:
+    rooms, counters, _ = evening
+    assert len(counters.motion_to_on_ms) == rooms * len(WALK_INS)
+
+
+def test_work_stays_within_budget(evening: tuple[int, Counters, Counters]) -> None:
+    rooms, counters, _ = evening
+    assert counters.light_calls <= rooms * LIGHT_CALLS_PER_ROOM
+    assert counters.helper_writes <= rooms * HELPER_WRITES_PER_ROOM
+    assert counters.renders <= RENDERS
+
+
+@pytest.mark.slow
+def test_native_engine_matches_blueprint(run_house: Callable[..., Counters]) -> None:
+    """One room, same timeline: the native engine sends the blueprint's light commands."""
+    native, blueprint = (
+        [command for command in run_house(1, engine).commands if command[1] == "light"]
+        for engine in ("native", "blueprint")
+    )
+    assert native
+    assert [command[1:] for command in native] == [command[1:] for command in blueprint]
+    # The blueprint only notices an elapsed delay on its 5-second periodic check
+    for (native_at, *_), (blueprint_at, *_) in zip(native, blueprint):
+        assert abs(native_at - blueprint_at) <= BLUEPRINT_POLL_SECONDS